@@ -21,9 +21,9 @@ def create_app(argv=None) -> (QApplication, Namespace):
     parser.add_argument('--ld', dest='last_dump', action='store_true', default=False,
                         help='Load variables table from last dump file')
     parser.add_argument('-w', dest='json_file', metavar='json_file',
-                        help='Load a workspace from json file')
+                        help='Load a workspace from json file, or from a .mintz archive with its data')
     parser.add_argument('-e', dest='image_file', metavar='image_file',
-                        help='Load canvas from JSON and save to file (PNG/SVG/PDF...)')
+                        help='Load canvas from the workspace and save to file (PNG/SVG/PDF...)')
     parser.add_argument('--ew', dest='export_width', metavar='export_width',
                         type=int, default=1920, help='Exported image width')
     parser.add_argument('--eh', dest='export_height', metavar='export_height',
@@ -120,6 +120,8 @@ def run_app(q_app: QApplication, args=None):
         main_win.import_json(workspace_file)
 
         if args.image_file:
+            # The data is retrieved in the background, export the canvas once every signal holds its data
+            main_win.finish_build()
             export_to_file(canvas_impl, main_win.canvas, args.image_file, dpi=args.export_dpi,
                            width=args.export_width, height=args.export_height)
             exit(0)
@@ -1,5 +1,10 @@
-from PySide6.QtCore import Qt, QItemSelectionModel
-from PySide6.QtWidgets import QPushButton, QVBoxLayout, QLabel, QDialog, QLineEdit, QHBoxLayout
+import re
+
+from PySide6.QtCore import QItemSelection, QItemSelectionModel
+from PySide6.QtWidgets import QCheckBox, QPushButton, QVBoxLayout, QLabel, QDialog, QLineEdit, QHBoxLayout, \
+    QMessageBox
+
+from mint.models.utils.mtEditJournal import coalesce_cells
 
 
 class FindReplaceDialog(QDialog):
@@ -12,6 +17,7 @@ class FindReplaceDialog(QDialog):
 
         self.replace_label = QLabel("Replace with:")
         self.replace_input = QLineEdit()
+        self.regex_check = QCheckBox("Regular expression")
 
         self.find_button = QPushButton("Find")
         self.find_button.clicked.connect(lambda: self.find_text(find_one=True))
@@ -25,6 +31,7 @@ class FindReplaceDialog(QDialog):
         layout.addWidget(self.find_input)
         layout.addWidget(self.replace_label)
         layout.addWidget(self.replace_input)
+        layout.addWidget(self.regex_check)
 
         button_layout = QVBoxLayout()
         button_layout1 = QHBoxLayout()
@@ -38,53 +45,57 @@ class FindReplaceDialog(QDialog):
         layout.addLayout(button_layout)
         self.setLayout(layout)
         self.current_index = None
+        self.find_input.textChanged.connect(self.reset_current_index)
+        self.regex_check.toggled.connect(self.reset_current_index)
 
         self.table_view = model
 
+    def reset_current_index(self):
+        self.current_index = None
+
     def set_model(self, model):
         self.table_view = model
 
     def find_text(self, find_one):
         text_to_find = self.find_input.text()
-        self.table_view.selectionModel().clearSelection()
+        selection_model = self.table_view.selectionModel()
+        selection_model.clearSelection()
         model = self.table_view.model()
-        if self.current_index is None:
-            self.current_index = 0
+        try:
+            matches = model.find(text_to_find, regex=self.regex_check.isChecked())
+        except re.error as e:
+            box = QMessageBox()
+            box.setIcon(QMessageBox.Icon.Warning)
+            box.setText(f"Invalid regular expression: {e}")
+            box.exec_()
+            return
+        if not matches:
+            self.current_index = None
+            return
+
+        if find_one:
+            if self.current_index is None:
+                self.current_index = 0
+            else:
+                self.current_index = (self.current_index + 1) % len(matches)
+            index = matches[self.current_index]
+            selection_model.select(index, QItemSelectionModel.SelectionFlag.Select)
+            self.table_view.scrollTo(index)
         else:
-            self.current_index += 1
-        nrows = model.rowCount(None)
-        ncols = model.columnCount(None)
-        for ix in range(self.current_index, nrows * ncols + self.current_index):
-            ix = ix % (nrows * ncols)
-            row = ix % nrows
-            col = ix // nrows
-            index = model.index(row, col)
-            item = model.data(index, Qt.ItemDataRole.DisplayRole)
-            if item and text_to_find and text_to_find in item:
-                self.table_view.selectionModel().select(index, QItemSelectionModel.SelectionFlag.Select)
-                self.current_index = ix
-                if find_one:
-                    return
+            # Select the matches with a few rectangles rather than cell by cell
+            selection = QItemSelection()
+            for top, left, bottom, right in coalesce_cells((index.row(), index.column()) for index in matches):
+                selection.select(model.index(top, left), model.index(bottom, right))
+            selection_model.select(selection, QItemSelectionModel.SelectionFlag.Select)
 
     def replace_text(self):
         model = self.table_view.model()
         text_to_find = self.find_input.text()
         text_to_replace = self.replace_input.text()
         all_indexes = self.table_view.selectionModel().selectedIndexes()
-        rows = set()
-        cols = set()
-        for index in all_indexes:
-            row = index.row()
-            rows.add(row)
-            col = index.column()
-            cols.add(col)
-            new_index = model.index(row, col)
-            item_data = model.data(new_index, Qt.ItemDataRole.DisplayRole)
-            if item_data and text_to_find in item_data:
-                with model.activate_fast_mode():
-                    model.setData(new_index, item_data.replace(text_to_find, text_to_replace),
-                                  Qt.ItemDataRole.EditRole)
-
-        model.dataChanged.emit(model.index(min(rows), min(cols)), model.index(max(rows), max(cols)))
+        try:
+            model.replace(all_indexes, text_to_find, text_to_replace, regex=self.regex_check.isChecked())
+        except re.error:
+            pass  # Reported by find_text
 
         self.find_text(find_one=True)
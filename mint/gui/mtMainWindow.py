@@ -6,9 +6,9 @@
 
 import weakref
 from collections import defaultdict
+from functools import partial
 from dataclasses import fields
 from datetime import datetime
-from pathlib import Path
 import json
 import os
 import pkgutil
@@ -16,19 +16,18 @@ import socket
 import typing
 import pandas as pd
 
-from PySide6.QtCore import QCoreApplication, QMargins, QModelIndex, QTimer, Qt, QItemSelectionModel
+from PySide6.QtCore import QCoreApplication, QMargins, QModelIndex, QTimer, Qt, QItemSelectionModel, Signal
 from PySide6.QtGui import QCloseEvent, QIcon, QKeySequence, QPixmap, QAction
 from PySide6.QtWidgets import QApplication, QFileDialog, QHBoxLayout, QLabel, QMessageBox, QProgressBar, QPushButton, \
-    QSplitter, QVBoxLayout, QWidget
+    QSplitter, QStyle, QVBoxLayout, QWidget
 
 from iplotDataAccess.dataAccess import DataAccess
-from iplotDataAccess.dataHandling.exportData.exportData import generateData
 from iplotlib.core.axis import LinearAxis
 from iplotlib.core.canvas import Canvas
 from iplotlib.core.plot import Plot, PlotXY, PlotContour, PlotXYWithSlider
 from iplotlib.core.signal import SignalXY
 from iplotlib.data_access import CanvasStreamer
-from iplotlib.interface.iplotSignalAdapter import ParserHelper
+from iplotlib.interface.iplotSignalAdapter import IplotSignalAdapter, ParserHelper
 from iplotlib.qt.gui.iplotQtMainWindow import IplotQtMainWindow
 
 from mint.gui.mtAbout import MTAbout
@@ -39,8 +38,16 @@ from mint.gui.mtStreamConfigurator import MTStreamConfigurator
 from mint.gui.mtSignalConfigurator import MTSignalConfigurator
 from mint.gui.mtExportConfigurator import MTExportConfigurator
 from mint.models.utils import mtBlueprintParser
+from mint.models.mtSignalsModel import Waypoint
+from mint.tools.axis_info import DATE_THRESHOLD, x_axis_info
+from mint.tools.canvas_reconciler import CanvasReconciler
+from mint.tools.dump_writer import DumpWriter
+from mint.tools.fetch_engine import FetchEngine, FetchJob, data_key, leaf_signals
 from mint.tools.map_tricks import delete_keys_from_dict
+from mint.tools.refresh_scheduler import RefreshScheduler
 from mint.tools.sanity_checks import check_data_range
+from mint.tools.workspace_archive import ARCHIVE_SUFFIX, Snapshot, is_archive, read_archive, write_archive
+from mint.tools.workspace_loader import SCHEMA_VERSION, load_workspace
 
 from iplotLogging import setupLogger as setupLog
 
@@ -48,6 +55,7 @@ logger = setupLog.get_logger(__name__)
 
 
 class MTMainWindow(IplotQtMainWindow):
+    fetchProgressed = Signal()
 
     def __init__(self,
                  canvas: Canvas,
@@ -59,7 +67,8 @@ class MTMainWindow(IplotQtMainWindow):
                  blueprint: dict = mtBlueprintParser.DEFAULT_BLUEPRINT,
                  impl: str = "matplotlib",
                  parent: typing.Optional[QWidget] = None,
-                 flags: Qt.WindowFlags = Qt.WindowFlags()):
+                 flags: Qt.WindowFlags = Qt.WindowFlags(),
+                 fetch_engine: FetchEngine = None):
 
         if data_sources is None:
             data_sources = []
@@ -95,9 +104,19 @@ class MTMainWindow(IplotQtMainWindow):
         console_pxmap.loadFromData(pkgutil.get_data('mint.gui', 'icons/terminal.png'))
         self.console_button.setIcon(QIcon(console_pxmap))
 
+        self.dumpWriter = DumpWriter()
+        # Accesses the data of the builds, a default engine requests it from the data access layer
+        self.fetchEngine = fetch_engine or FetchEngine()
+        self._buildStart = datetime.now()
+        self._buildJob = None  # type: typing.Optional[FetchJob]
+        self._buildDone = None  # type: typing.Optional[typing.Callable[[], None]]
+        self._buildSignal = None  # type: typing.Optional[typing.Callable[[IplotSignalAdapter], None]]
+
+        # Single shot, the next tick is scheduled once the refresh is over
+        self.refreshScheduler = RefreshScheduler()
         self.refreshTimer = QTimer(self)
         self.refreshTimer.setTimerType(Qt.TimerType.CoarseTimer)
-        self.refreshTimer.setSingleShot(False)
+        self.refreshTimer.setSingleShot(True)
         self.refreshTimer.timeout.connect(lambda: self.on_timeout())
         self._memoryMonitor = MTMemoryMonitor(parent=self, pid=QCoreApplication.instance().applicationPid())
         self.sigCfgWidget.setParent(self)
@@ -108,6 +127,9 @@ class MTMainWindow(IplotQtMainWindow):
         self._progressBar.setMaximum(100)
         self._progressBar.hide()
         self._workspaceLabel = QLabel("No workspace loaded")
+        self._refreshLabel = QLabel()
+        self._refreshLabel.hide()
+        self._statusBar.addPermanentWidget(self._refreshLabel)
         self._statusBar.addPermanentWidget(self._progressBar)
         self._statusBar.addPermanentWidget(QLabel('|'))
         self._statusBar.addPermanentWidget(self.console_button)
@@ -178,12 +200,16 @@ class MTMainWindow(IplotQtMainWindow):
         self.streamBtn.setIcon(QIcon(pxmap))
         self.exportBtn = QPushButton("Export")
         self.exportBtn.setIcon(QIcon(pxmap))
+        self.cancelBtn = QPushButton("Cancel")
+        self.cancelBtn.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogCancelButton))
+        self.cancelBtn.hide()
         self.daWidgetButtons = QWidget(self)
         self.daWidgetButtons.setLayout(QHBoxLayout())
         self.daWidgetButtons.layout().setContentsMargins(QMargins())
         self.daWidgetButtons.layout().addWidget(self.streamBtn)
         self.daWidgetButtons.layout().addWidget(self.drawBtn)
         self.daWidgetButtons.layout().addWidget(self.exportBtn)
+        self.daWidgetButtons.layout().addWidget(self.cancelBtn)
 
         self.dataAccessWidget = QWidget(self)
         self.dataAccessWidget.setLayout(QVBoxLayout())
@@ -203,6 +229,9 @@ class MTMainWindow(IplotQtMainWindow):
         self.drawBtn.clicked.connect(self.draw_clicked)
         self.streamBtn.clicked.connect(self.stream_clicked)
         self.exportBtn.clicked.connect(self.export_clicked)
+        self.cancelBtn.clicked.connect(self.cancel_build)
+        # Emitted from the threads of the fetch engine, the results are applied on the main thread
+        self.fetchProgressed.connect(self.on_fetch_progress, Qt.ConnectionType.QueuedConnection)
         self.streamerCfgWidget.streamStarted.connect(self.on_stream_started)
         self.streamerCfgWidget.streamStopped.connect(self.on_stream_stopped)
         self.exportCfgWidget.exportStarted.connect(self.on_export_started)
@@ -270,13 +299,19 @@ class MTMainWindow(IplotQtMainWindow):
 
     def on_export(self):
         file = QFileDialog.getSaveFileName(
-            self, "Save workspaces as ..", dir=self._data_dir, filter='*.json')
+            self, "Save workspaces as ..", dir=self._data_dir,
+            filter=f'*.json;;Workspace with data (*{ARCHIVE_SUFFIX})')
         if file and file[0]:
-            if not file[0].endswith('.json'):
-                file_name = file[0] + '.json'
+            archive = file[0].endswith(ARCHIVE_SUFFIX) or ARCHIVE_SUFFIX in file[1]
+            suffix = ARCHIVE_SUFFIX if archive else '.json'
+            if not file[0].endswith(suffix):
+                file_name = file[0] + suffix
             else:
                 file_name = file[0]
-            self.export_json(file_name)
+            if archive:
+                self.export_archive(file_name)
+            else:
+                self.export_json(file_name)
             self._data_dir = os.path.dirname(file_name)
 
     def on_export_data(self):
@@ -318,7 +353,8 @@ class MTMainWindow(IplotQtMainWindow):
                 'createdAt': datetime.now().isoformat(),
                 'createdBy': os.getlogin(),
                 'createdOnHost': socket.gethostname(),
-                'appVersion': self.appVersion
+                'appVersion': self.appVersion,
+                'schemaVersion': SCHEMA_VERSION
             }
         })
         workspace.update({'data_range': self.dataRangeSelector.export_dict()})
@@ -327,10 +363,12 @@ class MTMainWindow(IplotQtMainWindow):
         self.indicate_ready()
         return workspace
 
-    def import_dict(self, input_dict: dict):
+    def import_dict(self, input_dict: dict, snapshot: Snapshot = None):
+        self.cancel_build()
         # Clear shared parser environment and internal state to prevent memory leaks and ensure a clean rebuild
         ParserHelper.env.clear()
         self.canvasStack.currentWidget()._parser.clear()
+        self.sigCfgWidget.model.clear_built_rows()
         self.indicate_busy('Importing workspace...')
         data_range = input_dict.get('data_range')
         self.dataRangeSelector.import_dict(data_range)
@@ -355,37 +393,25 @@ class MTMainWindow(IplotQtMainWindow):
             self.sigCfgWidget.import_dict(signal_cfg)
 
         path = list(self.sigCfgWidget.build(**da_params))
-        path_len = len(path)
 
-        self.indicate_ready()
         self.sigCfgWidget.set_status_message("Update signals ..")
-        self.sigCfgWidget.begin_build()
-        self.sigCfgWidget.set_progress(0)
 
         # Clear markers table before importing new signals
         self.qtcanvas._marker_window.clear_info()
 
-        # Travel the path and update each signal parameters from workspace and trigger a data access request.
-        for i, waypt in enumerate(path):
-            self.sigCfgWidget.set_status_message(f"Updating {waypt} ..")
-            self.sigCfgWidget.set_progress(int(i * 100 / path_len))
-
+        # Travel the path and construct each signal once. The signals of the plots are constructed from the
+        # parameters of the table, updated with the parameters of the workspace.
+        created = []
+        for waypt in path:
             if (not waypt.stack_num) or (not waypt.col_num and not waypt.row_num):
-                signal = waypt.func(*waypt.args, **waypt.kwargs)
-                self.sigCfgWidget.model.update_signal_data(waypt.idx, signal, True)
-                continue
-
-            # Check if signal name is valid
-            signal_valid = waypt.func(*waypt.args, **waypt.kwargs)
-            self.sigCfgWidget.model.update_signal_data(waypt.idx, signal_valid, True)
-            if signal_valid.status_info.result == 'Fail':
+                created.append((waypt, waypt.create()))
                 continue
 
             plot = self.canvas.plots[waypt.col_num - 1][waypt.row_num - 1]  # type: Plot
             plot.parent = weakref.ref(self.canvas)
             old_signal = plot.signals[waypt.stack_num][waypt.signal_stack_id]
 
-            params = dict()
+            params = {key: value for key, value in waypt.kwargs.items() if key != 'signal_class'}
             for f in fields(old_signal):
                 if f.name == 'children':  # Don't copy children.
                     continue
@@ -393,61 +419,84 @@ class MTMainWindow(IplotQtMainWindow):
                     params.update({f.name: getattr(old_signal, f.name)})
 
             # Propagate uid from row to signal for workspace without it
-            if 'uid' not in params or params['uid'] is None:
+            if params.get('uid') is None:
                 params['uid'] = waypt.kwargs['uid']
 
             new_signal = waypt.func(*waypt.args, signal_class=waypt.kwargs.get('signal_class'), **params)
             new_signal.parent = weakref.ref(plot)
-
-            self.sigCfgWidget.model.update_signal_data(waypt.idx, new_signal, True)
+            # Held by the waypoint of the row, the next draw reuses it with its data while the row is unchanged
+            waypt.signal = new_signal
+            waypt.access = (new_signal.ts_start, new_signal.ts_end, new_signal.pulse_nb)
 
             # Replace signal
             plot.signals[waypt.stack_num][waypt.signal_stack_id] = new_signal
+            created.append((waypt, new_signal))
 
             # Add markers in the markers table when importing, only if the signal is SignalXY and has markers
             if isinstance(new_signal, SignalXY) and new_signal.markers_list:
                 self.qtcanvas._marker_window.import_table(new_signal)
 
-        self.sigCfgWidget.set_progress(99)
+        # The signals of the snapshot take their data from it, only the others access the data sources
+        if snapshot is not None:
+            restored = snapshot.restore(leaf for waypt, signal in created for leaf in leaf_signals(signal))
+            logger.info(f"{len(restored)} of the {len(snapshot)} signal(s) of the snapshot were restored")
+            # The next draw accesses the data sources again for the rows that hold data of the snapshot
+            restored = {id(leaf) for leaf in restored}
+            self.sigCfgWidget.model.clear_built_rows(
+                signal.uid for waypt, signal in created if any(id(leaf) in restored for leaf in leaf_signals(signal)))
+
+        # Every signal is fetched once, side by side. The canvas is drawn right away, the requests being submitted,
+        # and each signal is painted as its data arrives.
+        job = self.fetch_data(created)
+        self.indicate_busy('Drawing...')
+        self.canvasStack.currentWidget().set_canvas(self.canvas)
+        self.canvasStack.refreshLinks()
+
+        plotted = {id(signal) for waypt, signal in created if waypt.stack_num and (waypt.col_num or waypt.row_num)}
+
+        def paint(signal: IplotSignalAdapter):
+            if id(signal) in plotted:
+                self.canvasStack.currentWidget()._parser.process_ipl_signal(signal)
+
+        self.start_fetch(job, partial(self.complete_import, created, snapshot), on_signal=paint)
+
+    def complete_import(self, created: typing.List[typing.Tuple[Waypoint, IplotSignalAdapter]],
+                        snapshot: Snapshot = None):
+        """Updates the table with the imported signals and draws the canvas with all their data."""
+        for waypt, signal in created:
+            self.sigCfgWidget.model.update_signal_data(waypt.idx, signal, True)
 
         self.sigCfgWidget.model.dataChanged.emit(self.sigCfgWidget.model.index(0, 0),
                                                  self.sigCfgWidget.model.index(
                                                      self.sigCfgWidget.model.rowCount(QModelIndex()) - 1,
                                                      self.sigCfgWidget.model.columnCount(QModelIndex()) - 1))
 
-        self.sigCfgWidget.set_progress(100)
-
         self.indicate_busy('Drawing...')
         self.canvasStack.currentWidget().set_canvas(self.canvas)
         self.canvasStack.refreshLinks()
         # Compute statistics when importing workspace
-        if path:
+        if created:
             self.canvasStack.currentWidget().stats(self.canvas)
         self.drop_history()  # clean zoom history
         self.indicate_ready()
         self.sigCfgWidget.resize_views_to_contents()
+        if snapshot is not None:
+            self.statusBar().showMessage(f"Drawn from the data of {os.path.basename(snapshot.file_path)}, "
+                                         f"draw again to refresh it.")
 
     def import_json(self, file_path: str):
         self.statusBar().showMessage(f"Importing {file_path} ..")
         try:
             logger.info(f"Loading workspace: {file_path}")
-            with open(file_path, mode='r') as f:
-                payload = f.read()
-                payload = payload.replace("data_access.dataAccessSignal.DataAccessSignal",
-                                          "interface.iplotSignalAdapter.IplotSignalAdapter")
-                replacements = {'varname': 'name',
-                                'datasource': 'data_source',
-                                'pulsenb': 'pulse_nb',
-                                'time_model': 'data_range'
-                                }
-                for old, new in replacements.items():
-                    payload = payload.replace(old, new)
-                self.import_dict(json.loads(payload, object_hook=lambda d: {int(k) if k.lstrip('-').isdigit() else k: v
-                                                                            for k, v in d.items()}))
-                logger.info(f"Finished loading workspace {file_path}")
-                # Update the workspace label in the status bar after successful import
-                self._workspaceLabel.setText(os.path.basename(file_path))
-                self._workspaceLabel.setToolTip(file_path)
+            if is_archive(file_path):
+                self.import_dict(*read_archive(file_path))
+            else:
+                with open(file_path, mode='r') as f:
+                    self.import_dict(load_workspace(f.read()))
+            logger.info(f"Finished loading workspace {file_path}")
+            # Update the workspace label in the status bar after successful import
+            self._workspaceLabel.setText(os.path.basename(file_path))
+            self._workspaceLabel.setToolTip(file_path)
         except Exception as e:
             box = QMessageBox()
             box.setIcon(QMessageBox.Icon.Critical)
@@ -487,17 +536,48 @@ class MTMainWindow(IplotQtMainWindow):
             self.indicate_ready()
             return
 
+    def export_archive(self, file_path: str):
+        """Saves the workspace with the data of its signals, it is drawn from this data when imported."""
+        self.statusBar().showMessage(f"Exporting {file_path} ..")
+        try:
+            signals = [leaf for col in self.canvas.plots for plot in col if plot
+                       for stack in plot.signals.values() for signal in stack for leaf in leaf_signals(signal)]
+            count = write_archive(file_path, self.export_dict(), signals)
+            logger.info(f"Finished exporting workspace {file_path} with the data of {count} signal(s)")
+        except Exception as e:
+            box = QMessageBox()
+            box.setIcon(QMessageBox.Icon.Critical)
+            box.setText(f"Error {str(e)}: cannot export workspace to file: {file_path}")
+            logger.exception(e)
+            box.exec_()
+            self.indicate_ready()
+            return
+
     def start_auto_refresh(self):
         if self.canvas.auto_refresh:
             logger.info(F"Scheduling canvas refresh in {self.canvas.auto_refresh} seconds")
-            self.refreshTimer.start(self.canvas.auto_refresh * 1000)
+            self.refreshScheduler.start(self.canvas.auto_refresh)
+            self.schedule_refresh()
             self.dataRangeSelector.refreshActivate.emit()
 
     def stop_auto_refresh(self):
         self.dataRangeSelector.refreshDeactivate.emit()
+        self.refreshScheduler.stop()
+        self._refreshLabel.hide()
         if self.refreshTimer is not None:
             self.refreshTimer.stop()
 
+    def schedule_refresh(self):
+        """Starts the timer of the next tick and shows when the refresh can not keep up"""
+        if not self.refreshScheduler.active:
+            return
+        self.refreshTimer.start(int(self.refreshScheduler.delay() * 1000))
+        report = self.refreshScheduler.report()
+        self._refreshLabel.setText(report)
+        self._refreshLabel.setVisible(bool(report))
+        if report:
+            logger.warning(report)
+
     def draw_clicked(self, no_build: bool = False):
         """This function creates and draws the canvas getting data from variables table and time/pulse widget"""
 
@@ -505,15 +585,15 @@ class MTMainWindow(IplotQtMainWindow):
             return
 
         if not no_build:
-            # Dumps are done before canvas processing
-            dump_dir = os.path.expanduser("~/.local/1Dtool/dumps/")
-            Path(dump_dir).mkdir(parents=True, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_name = f"signals_table_{os.getpid()}_{timestamp}.scsv"
-            self.sigCfgWidget.export_scsv(os.path.join(dump_dir, file_name))
+            # Dumps are done before canvas processing, the snapshot is written in the background
+            self.dumpWriter.submit(self.sigCfgWidget.model.snapshot())
 
-            self.build()
+            self.build(on_built=self.draw_canvas)
+        else:
+            self.draw_canvas()
 
+    def draw_canvas(self):
+        """Shows the canvas once it is built"""
         self.indicate_busy("Drawing...")
         self.stop_auto_refresh()
 
@@ -567,6 +647,9 @@ class MTMainWindow(IplotQtMainWindow):
         self.streamBtn.setText("Stream")
 
     def on_export_started(self, data: dict):
+        # The export of the data goes through the UDA client, it is only needed here
+        from iplotDataAccess.dataHandling.exportData.exportData import generateData
+
         self.exportCfgWidget.hide()
         logger.warning(f"Export will be performed using the global time settings. Custom time and processing columns "
                        f"will not be applied")
@@ -615,15 +698,32 @@ class MTMainWindow(IplotQtMainWindow):
         self.indicate_ready()
 
     def closeEvent(self, event: QCloseEvent) -> None:
+        # Do not lose the last dump
+        self.dumpWriter.flush()
+        self.cancel_build()
+        self.fetchEngine.shutdown()
         QApplication.closeAllWindows()
         super().closeEvent(event)
 
-    def build(self, stream=False):
-        # Clear shared parser environment and internal state to prevent memory leaks and ensure a clean rebuild
+    def is_building(self) -> bool:
+        return self._buildJob is not None
+
+    def build(self, stream=False, on_built: typing.Callable[[], None] = None, delta=False):
+        """
+        Create the signals of the table, retrieve their data in the background and build the canvas once every row
+        holds its data. The canvas is not touched until then, `on_built` is called right after it is built.
+        A streamed build does not access the data sources, it completes right away.
+        With `delta`, the signals keep the data of the signals on the canvas and only fetch what is missing, this is
+        how the auto refresh of the relative time mode slides its window.
+        """
+        self.cancel_build()
+        previous = self.previous_data() if delta and not stream else None
+        # Clear shared parser environment to prevent memory leaks and ensure a clean rebuild
         ParserHelper.env.clear()
-        self.canvasStack.currentWidget()._parser.clear()
 
-        self.canvas.streaming = stream
+        if stream or self.canvas.streaming:
+            # Streamed signals do not access the data sources, they are not reused by or from other builds
+            self.sigCfgWidget.model.clear_built_rows()
         stream_window = self.streamerCfgWidget.time_window() * 1000000000
 
         x_axis_date = (self.dataRangeSelector.is_x_axis_date() and not stream) or stream
@@ -638,30 +738,114 @@ class MTMainWindow(IplotQtMainWindow):
         else:
             ts, te = self.dataRangeSelector.get_time_range()
 
-        self.canvas.auto_refresh = refresh_interval
-
         da_params = dict(ts_start=ts, ts_end=te, pulse_nb=pulse_number)
-        plan = dict()
-
-        # Get signals in order to preserve markers
-        previous_signals = {sig.uid: sig for sig in self.canvasStack.currentWidget().get_signals(self.canvas)}
 
+        # 1. Create the signals in dependency order
+        created = []
         for waypt in self.sigCfgWidget.build(**da_params):
             if not waypt.func and not waypt.args:
                 continue
 
+            signal = waypt.create()
+            if waypt.stack_num and (waypt.col_num or waypt.row_num):
+                if not signal.label:
+                    continue
+                signal.data_access_enabled = False if stream else True
+                signal.hi_precision_data = True if stream else False
+            created.append((waypt, signal))
+
+        # 2. Fetch the data of every row from the pool, level after level of the dependency graph.
+        # The canvas is built once the last level is applied, see on_fetch_progress.
+        view = dict(x_axis_date=x_axis_date, x_axis_follow=x_axis_follow, x_axis_window=x_axis_window)
+        complete = partial(self.complete_build, created, stream, ts, te, refresh_interval, view, on_built)
+        job = None if stream else self.fetch_data(created, previous)
+        self.start_fetch(job, complete)
+
+    def start_fetch(self, job: typing.Optional[FetchJob], complete: typing.Callable[[], None],
+                    on_signal: typing.Callable[[IplotSignalAdapter], None] = None):
+        """
+        Waits for the job in the background, `on_signal` is called as the data of each signal is applied and
+        `complete` once the job is finished. Without a job, or when it is already finished, `complete` is called now.
+        """
+        if job is None or job.apply(on_signal):
+            complete()
+            return
+
+        self._buildJob, self._buildDone, self._buildSignal = job, complete, on_signal
+        self._buildStart = datetime.now()
+        self.drawBtn.setEnabled(False)
+        self.streamBtn.setEnabled(False)
+        self.cancelBtn.show()
+        self.indicate_busy('Retrieving data...')
+        self._progressBar.setMaximum(job.total)
+        self._progressBar.setValue(job.applied)
+
+    def on_fetch_progress(self):
+        job = self._buildJob
+        if job is None:
+            return
+        job.apply(self._buildSignal)
+        self._progressBar.setValue(job.applied)
+        self.statusBar().showMessage(f"Retrieving data... {job.applied}/{job.total}")
+        if not job.finished:
+            return
+
+        logger.info(f"Fetched {job.total} signal(s) in {(datetime.now() - self._buildStart).total_seconds():.3f}s")
+        complete = self._buildDone
+        self.end_build()
+        try:
+            complete()
+        except Exception:
+            self.abort_refresh()
+            self.indicate_ready()
+            raise
+
+    def finish_build(self):
+        """Waits for the build that is retrieving data and completes it, e.g. before exporting the canvas."""
+        while self._buildJob is not None:
+            self._buildJob.wait(0.05)
+            self.on_fetch_progress()
+
+    def cancel_build(self):
+        """Cancels the build that is retrieving data, the canvas and the table are left as they were."""
+        if self._buildJob is None:
+            return
+        self._buildJob.cancel()
+        self.end_build()
+        self.abort_refresh()
+        self.indicate_ready()
+        self.statusBar().showMessage('Build cancelled.')
+
+    def abort_refresh(self):
+        """The refresh in flight, if any, did not complete. The next tick is scheduled all the same."""
+        if self.refreshScheduler.in_flight:
+            self.refreshScheduler.end(completed=False)
+            self.schedule_refresh()
+
+    def end_build(self):
+        self._buildJob = self._buildDone = self._buildSignal = None
+        self.drawBtn.setEnabled(True)
+        self.streamBtn.setEnabled(True)
+        self.cancelBtn.hide()
+
+    def complete_build(self, created: typing.List[typing.Tuple[Waypoint, IplotSignalAdapter]], stream: bool,
+                       ts, te, refresh_interval: int, view: dict, on_built: typing.Callable[[], None] = None):
+        """Updates the table with the created signals and builds the canvas from them."""
+        self.canvasStack.currentWidget()._parser.clear()
+        self.canvas.streaming = stream
+        self.canvas.auto_refresh = refresh_interval
+        plan = dict()
+
+        # Get signals in order to preserve markers
+        previous_signals = {sig.uid: sig for sig in self.canvasStack.currentWidget().get_signals(self.canvas)}
+
+        # 3. Update the table and plan the canvas
+        for waypt, signal in created:
             if not waypt.stack_num or (not waypt.col_num and not waypt.row_num):
-                signal = waypt.func(*waypt.args, **waypt.kwargs)
                 if not stream:
                     self.sigCfgWidget.model.update_signal_data(waypt.idx, signal, True)
                 continue
 
-            signal = waypt.func(*waypt.args, **waypt.kwargs)
-            if not signal.label:
-                continue
-
-            signal.data_access_enabled = False if self.canvas.streaming else True
-            signal.hi_precision_data = True if self.canvas.streaming else False
             if not stream:
                 self.sigCfgWidget.model.update_signal_data(waypt.idx, signal, True)
             else:
@@ -719,18 +903,38 @@ class MTMainWindow(IplotQtMainWindow):
                 if isinstance(plot, PlotXYWithSlider):
                     plot.clean_slider()
 
-        # Keep copy of previous canvas to be able to restore preferences
-        old_canvas = self.canvas.to_dict()
-
-        self.build_canvas(self.canvas, plan, x_axis_date, x_axis_follow, x_axis_window)
-
-        self.indicate_busy('Applying preferences...')
-        # Merge with previous preferences
-        self.canvas.merge(old_canvas)
+        # The plots of the previous canvas are patched in place, they keep their preferences
+        self.build_canvas(self.canvas, plan, **view)
 
         logger.info("Built canvas")
         logger.debug(f"{self.canvas}")
         self.indicate_ready()
+        if on_built is not None:
+            on_built()
+
+    def previous_data(self) -> typing.Dict[tuple, IplotSignalAdapter]:
+        """The signals on the canvas, and the signals they are computed from, by data key."""
+        signals = self.canvasStack.currentWidget().get_signals(self.canvas)
+        return {data_key(leaf): leaf for signal in signals for leaf in leaf_signals(signal)}
+
+    def fetch_data(self, created: typing.List[typing.Tuple[Waypoint, IplotSignalAdapter]],
+                   previous: typing.Dict[tuple, IplotSignalAdapter] = None) -> typing.Optional[FetchJob]:
+        """
+        Submit the data access of the created signals to the fetch engine. The rows of a level of the dependency graph
+        of the build are fetched side by side, the results are applied on the main thread by on_fetch_progress.
+        """
+        model = self.sigCfgWidget.model
+        rows = defaultdict(list)
+        for waypt, signal in created:
+            if model.row_queries_data(waypt.idx) and not model.holds_data(signal):
+                rows[waypt.idx].append(signal)
+        if not rows:
+            return None
+
+        schedule = self.sigCfgWidget.schedule
+        levels = schedule.levels() if schedule is not None else [list(rows)]
+        return self.fetchEngine.submit([[signal for idx in level for signal in rows.get(idx, ())] for level in levels],
+                                       notify=self.fetchProgressed.emit, previous=previous)
 
     def build_canvas(self, canvas: Canvas, plan: dict, x_axis_date=False, x_axis_follow=False, x_axis_window=None):
         if not plan.keys():
@@ -743,6 +947,7 @@ class MTMainWindow(IplotQtMainWindow):
                 max_col = max(max_col, col + plot[1] - 1)
                 max_row = max(max_row, row + plot[0] - 1)
 
+        reconciler = CanvasReconciler(canvas.plots)
         canvas.cols = max_col
         canvas.rows = max_row
         canvas.plots = [[] for _ in range(canvas.cols)]
@@ -768,18 +973,15 @@ class MTMainWindow(IplotQtMainWindow):
 
                 if not canvas.streaming:
                     signal_x_is_date = False
-                    for stack, signals in rows[row][2].items():
-                        for signal in signals:
-                            try:
-                                x_data = signal.get_data()[0]
-                                if x_axis_transformed:
-                                    if len(x_data) > 0:
-                                        signal_x_is_date |= bool(min(x_data) > (1 << 53))
-                                else:
-                                    if rows[row][3][0] is not None:
-                                        signal_x_is_date |= bool(rows[row][3][0] > (1 << 53))
-                            except (IndexError, ValueError) as _:
-                                signal_x_is_date = False
+                    if x_axis_transformed:
+                        # The x range of the processed data is recorded when the data is retrieved
+                        for signals in rows[row][2].values():
+                            for signal in signals:
+                                is_date = x_axis_info(signal).is_date
+                                if is_date is not None:
+                                    signal_x_is_date |= is_date
+                    elif rows[row][3][0] is not None:
+                        signal_x_is_date = bool(rows[row][3][0] > DATE_THRESHOLD)
                 else:
                     signal_x_is_date = True
 
@@ -796,12 +998,10 @@ class MTMainWindow(IplotQtMainWindow):
                     x_axis.begin = rows[row][3][0]
                     x_axis.end = rows[row][3][1]
 
-                plot = self.plot_classes[plot_types[0]](axes=[x_axis, y_axes], row_span=rows[row][0],
-                                                        col_span=rows[row][1])
-                for stack, signals in rows[row][2].items():
-                    for signal in signals:
-                        if signal.stream_valid:
-                            plot.add_signal(signal, stack=stack)
+                stacks = {stack: [signal for signal in signals if signal.stream_valid]
+                          for stack, signals in rows[row][2].items()}
+                plot = reconciler.plot(self.plot_classes[plot_types[0]], colnum, row, x_axis, y_axes,
+                                       row_span=rows[row][0], col_span=rows[row][1], stacks=stacks)
 
                 # In case of streaming, when the plot does not contain any signals that can be streamed, the plot
                 # is not added to the Canvas and None is added instead.
@@ -810,8 +1010,23 @@ class MTMainWindow(IplotQtMainWindow):
 
                 self.canvas.add_plot(plot, col=colnum - 1)
 
+        logger.debug(f"Kept {reconciler.kept} plot(s) of the previous canvas")
+
     def on_timeout(self):
-        self.build()
+        if self.is_building() or not self.refreshScheduler.begin():
+            logger.info("Postponed the canvas refresh, a build is still retrieving data")
+            self.refreshScheduler.postpone()
+            self.schedule_refresh()
+            return
+        # The build completes right away when no data is missing, its failures must not stop the auto refresh
+        try:
+            self.build(on_built=self.refresh_canvas, delta=True)
+        except Exception:
+            self.abort_refresh()
+            self.indicate_ready()
+            raise
+
+    def refresh_canvas(self):
         self.indicate_busy("Drawing...")
 
         self.canvasStack.currentWidget().unfocus_plot()
@@ -822,6 +1037,8 @@ class MTMainWindow(IplotQtMainWindow):
         self.canvasStack.currentWidget().stats(self.canvas)
 
         self.indicate_ready()
+        self.refreshScheduler.end()
+        self.schedule_refresh()
 
     def on_drop_plot(self, drop_info):
         dragged_item = drop_info.dragged_item
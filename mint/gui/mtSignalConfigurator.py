@@ -7,8 +7,6 @@
 from collections import defaultdict
 import json
 import os
-from enum import Enum
-from pathlib import Path
 
 import pandas as pd
 import numpy as np
@@ -21,9 +19,7 @@ from PySide6.QtGui import QContextMenuEvent, QShortcut, QKeySequence, QPalette,
 from PySide6.QtWidgets import QFileDialog, QMainWindow, QMenu, QMessageBox, QProgressBar, QPushButton, QStyle, \
     QTabWidget, QTableView, QVBoxLayout, QWidget, QDialog, QTextEdit, QDialogButtonBox
 
-from iplotProcessing.common import InvalidExpression
 from iplotlib.interface.iplotSignalAdapter import Result, StatusInfo
-from iplotProcessing.tools.parsers import Parser
 
 from iplotWidgets.variableBrowser.variableBrowser import VariableBrowser
 from iplotWidgets.pulseBrowser.pulseBrowser import PulseBrowser
@@ -36,6 +32,8 @@ from mint.gui.views.mtDataSourcesDelegate import MTPlotTypeDelegate
 from mint.models import MTSignalsModel
 from mint.models.mtSignalsModel import Waypoint
 from mint.models.utils import mtBlueprintParser as mtBp
+from mint.models.utils.mtBuildScheduler import MTBuildScheduler
+from mint.tools.dump_writer import default_dump_dir, latest_dump
 from mint.tools.table_parser import is_non_empty_string
 
 from iplotLogging import setupLogger
@@ -125,55 +123,6 @@ NEAT_VIEW = {
 }
 
 
-class RowAliasType(Enum):
-    Simple = 'SIMPLE'
-    Mixed = 'MIXED'
-
-
-def _row_predicate(row: pd.Series, aliases: list, blueprint: dict) -> typing.Tuple[RowAliasType, str, Parser, set]:
-    name = row[mtBp.get_column_name(blueprint, 'Variable')]
-    alias = row[mtBp.get_column_name(blueprint, 'Alias')]
-    depends_on = set()
-
-    is_simple = True
-    p = Parser()
-    for dim in ['x', 'y', 'z']:
-        expression = row[mtBp.get_column_name(blueprint, dim)]
-        if expression == '':
-            continue
-        try:
-            p.set_expression(expression)
-            # Check if the expression only uses the row's alias or 'self'
-            expr = all([var == alias or var == 'self' for var in list(p.var_map.keys())])
-            is_simple &= expr
-            if not expr:
-                result_dependencies = p.get_var_expression(expression)
-                for res in result_dependencies:
-                    depends_on.add(res)
-
-        except InvalidExpression:
-            pass
-
-    # Check for variable column
-    try:
-        p.set_expression(name)
-    except InvalidExpression:
-        p.set_expression("")
-
-    # True: name does not consist of any pre-defined aliases
-    if p.is_valid:
-        is_simple &= all([var not in aliases for var in list(p.var_map.keys())])
-        if not is_simple:
-            result_dependencies = p.get_var_expression(name)
-            for res in result_dependencies:
-                depends_on.add(res)
-
-    if is_simple:
-        return RowAliasType.Simple, name, p, depends_on
-    else:
-        return RowAliasType.Mixed, name, p, depends_on
-
-
 class MTSignalConfigurator(QWidget):
     progressChanged = Signal(float)
     statusChanged = Signal(str)
@@ -223,6 +172,8 @@ class MTSignalConfigurator(QWidget):
             widget.view().setItemDelegateForColumn(14, self._pt_delegate)
             widget.view().setSortingEnabled(True)
 
+        # Only the current view is resized, the others are resized when they are shown.
+        self._stale_views = set()
         self._tabs.currentChanged.connect(self.on_current_view_changed)
         # Set menu for configure columns button.
         self._toolbar.configureColsBtn.setMenu(self._signal_item_widgets[0].header_menu())
@@ -251,7 +202,7 @@ class MTSignalConfigurator(QWidget):
         self.model.insertRows(0, 1, QModelIndex())
         self._find_replace_dialog = None
 
-        self._processed = set()  # Set used to store the different rows processed
+        self._schedule = None  # type: typing.Optional[MTBuildScheduler]
 
         self.invalid_stacks = []  # Used to verify the stacks
 
@@ -259,10 +210,19 @@ class MTSignalConfigurator(QWidget):
         shortcut.activated.connect(self.copy_contents_to_clipboard)
         shortcut2 = QShortcut(QKeySequence("Ctrl+V"), self)
         shortcut2.activated.connect(self.paste_contents_from_clipboard)
+        shortcut3 = QShortcut(QKeySequence.StandardKey.Undo, self)
+        shortcut3.activated.connect(self._model.undo)
+        shortcut4 = QShortcut(QKeySequence.StandardKey.Redo, self)
+        shortcut4.activated.connect(self._model.redo)
 
     def on_current_view_changed(self, index: int):
         current_view = self.item_widgets[index]
         self._toolbar.configureColsBtn.setMenu(current_view.header_menu())
+        if current_view in self._stale_views:
+            self._stale_views.discard(current_view)
+            view = current_view.view()
+            if isinstance(view, QTableView):
+                view.resizeColumnsToContents()
 
     def on_parse_button_pressed(self):
         logger.debug('Build order:')
@@ -281,19 +241,22 @@ class MTSignalConfigurator(QWidget):
     def item_widgets(self) -> typing.List[MTSignalItemView]:
         return self._signal_item_widgets
 
+    def _mark_other_views_stale(self) -> MTSignalItemView:
+        current = self._tabs.currentWidget()
+        self._stale_views.update(widget for widget in self.item_widgets if widget is not current)
+        return current
+
     def resize_view_to_columns(self, top_left: QModelIndex, bottom_right: QModelIndex):
         columns = range(top_left.column(), bottom_right.column() + 1)
-        for widget in self.item_widgets:
-            view = widget.view()
-            if isinstance(view, QTableView):
-                for col in columns:
-                    view.resizeColumnToContents(col)
+        view = self._mark_other_views_stale().view()
+        if isinstance(view, QTableView):
+            for col in columns:
+                view.resizeColumnToContents(col)
 
     def resize_views_to_contents(self):
-        for widget in self.item_widgets:
-            view = widget.view()
-            if isinstance(view, QTableView):
-                view.resizeColumnsToContents()
+        view = self._mark_other_views_stale().view()
+        if isinstance(view, QTableView):
+            view.resizeColumnsToContents()
 
     def on_export(self):
         file = QFileDialog.getSaveFileName(self, "Save SCSV", filter='*.scsv', dir=self._scsv_dir)
@@ -334,18 +297,19 @@ class MTSignalConfigurator(QWidget):
         if not len(selected_ids):
             return
 
-        for idx in selected_ids:
-            new_idx = self._model.index(idx.row(), 7)
-            cur_pulses = self._model.data(new_idx, Qt.ItemDataRole.DisplayRole)
-            pulse_set = set(cur_pulses.replace(" ", "").split(",")) if cur_pulses else set()
-            # Check that the pulse is not already added
-            for pulse in pulses:
-                pulse_set.add(pulse)
+        with self._model.transaction():
+            for idx in selected_ids:
+                new_idx = self._model.index(idx.row(), 7)
+                cur_pulses = self._model.data(new_idx, Qt.ItemDataRole.DisplayRole)
+                pulse_set = set(cur_pulses.replace(" ", "").split(",")) if cur_pulses else set()
+                # Check that the pulse is not already added
+                for pulse in pulses:
+                    pulse_set.add(pulse)
 
-            final_text = ", ".join(pulse_set)
+                final_text = ", ".join(pulse_set)
 
-            # Add the pulse in the corresponding cells
-            self.set_bulk_contents(final_text, [new_idx])
+                # Add the pulse in the corresponding cells
+                self.set_bulk_contents(final_text, [new_idx])
 
     def insert_empty_rows(self, above: bool):
         current_tab_id = self._tabs.currentIndex()
@@ -368,21 +332,12 @@ class MTSignalConfigurator(QWidget):
         for idx in self._signal_item_widgets[current_tab_id].view().selectionModel().selectedIndexes():
             selected_rows.add(idx.row())
 
-        for row in sorted(selected_rows, reverse=True):
-            self._model.removeRow(row)
+        self._model.remove_row_ranges(self._model.ranges_from_rows(selected_rows))
 
     def set_bulk_contents(self, text: str, indices: typing.List[QModelIndex]):
         self.busy.emit()
-        left = 1 << 32
-        right = 0
-        top = 1 << 32
-        bottom = 0
-        with self._model.activate_fast_mode():
+        with self._model.activate_fast_mode(journal=True):
             for idx in indices:
-                left = min(left, idx.column())
-                right = max(right, idx.column())
-                top = min(top, idx.row())
-                bottom = max(bottom, idx.row())
                 self._model.setData(idx, text, Qt.ItemDataRole.EditRole)
         self.ready.emit()
 
@@ -431,24 +386,14 @@ class MTSignalConfigurator(QWidget):
             show_popup_msg("Can't paste data", f"Copied data {copy_rows}x{copy_cols} and "
                                                f"selection cells {total_rows}x{total_columns} are not proportional")
             return
-        left = 1 << 32
-        right = 0
-        top = 1 << 32
-        bottom = 0
-
-        for col in range(min(columns), max(columns) + 1, copy_cols):
-            for row in range(min(rows), max(rows) + 1, copy_rows):
-                for i, line in enumerate(data):
-                    for j, value in enumerate(line):
-                        idx = self._model.createIndex(row + i, col + j)
-                        left = min(left, idx.column())
-                        right = max(right, idx.column())
-                        top = min(top, idx.row())
-                        bottom = max(bottom, idx.row())
-                        with self._model.activate_fast_mode():
+        with self._model.activate_fast_mode(journal=True):
+            for col in range(min(columns), max(columns) + 1, copy_cols):
+                for row in range(min(rows), max(rows) + 1, copy_rows):
+                    for i, line in enumerate(data):
+                        for j, value in enumerate(line):
+                            idx = self._model.createIndex(row + i, col + j)
                             self._model.setData(idx, value, Qt.ItemDataRole.EditRole)
 
-        self._model.dataChanged.emit(self._model.index(top, left), self._model.index(bottom, right))
         self.ready.emit()
 
     def copy_contents_to_clipboard(self):
@@ -602,21 +547,11 @@ class MTSignalConfigurator(QWidget):
             self.ready.emit()
 
     def import_last_dump(self) -> None:
-        path = os.environ.get('IPLOT_DUMP_PATH') or f"{Path.home()}/.local/1Dtool"
-        path += "/dumps"
-        files = os.listdir(path)
-
-        # Filter only files, not directories
-        files = [file for file in files if os.path.isfile(os.path.join(path, file))]
-        if not files:
+        file_path = latest_dump(default_dump_dir())
+        if file_path is None:
             return
-        # Get the most recently modified file
-        most_recent_file = max(files, key=lambda file: os.path.getmtime(os.path.join(path, file)))
-
-        # Get the full path of the most recent file
-        full_path_most_recent_file = os.path.join(path, most_recent_file)
 
-        self.import_scsv(full_path_most_recent_file)
+        self.import_scsv(file_path)
 
     def append_scsv(self, file_path):
         try:
@@ -649,15 +584,15 @@ class MTSignalConfigurator(QWidget):
     def import_dict(self, input_dict: dict):
         # 1. view options.
         view_options = input_dict.get('view_options') or NEAT_VIEW
+        blueprint = self._model.compiled_blueprint
         for view in self._signal_item_widgets:
             key = view.windowTitle()
             options = view_options.get(key) or NEAT_VIEW.get(key)
             for k, v in options.copy().items():
-                if k not in mtBp.get_column_names(self._model.blueprint):
+                if k not in blueprint.column_names:
                     options.pop(k)
-                    col_name = mtBp.get_column_name(self._model.blueprint, k)
-                    if col_name:
-                        options.update({col_name: v})
+                    if k in blueprint:
+                        options.update({blueprint.column_name(k): v})
             view.import_dict(options)
         self._tabs.currentWidget().show()
         QCoreApplication.processEvents()
@@ -684,101 +619,105 @@ class MTSignalConfigurator(QWidget):
         QCoreApplication.instance().processEvents()
 
         # Load defaults from keyword args
-        for key in mtBp.get_keys_with_override(self._model.blueprint):
-            v = self._model.blueprint.get(key)
-            code_name = v.get('code_name')
-            v.update({'default': kwargs.get(code_name) if not isinstance(kwargs.get(code_name), np.int64) else int(
-                kwargs.get(code_name))})
+        blueprint = self._model.compiled_blueprint
+        for key in blueprint.override_keys:
+            value = kwargs.get(blueprint.field(key).code_name)
+            blueprint.set_default(key, value if not isinstance(value, np.int64) else int(value))
         # Initialize pre-requisites
-        df = self._model.get_dataframe()
-        aliases = df.loc[:, mtBp.get_column_name(self._model.blueprint, 'Alias')].tolist()
-        duplicates = set([a for a in aliases if aliases.count(a) > 1 and a != ''])
+        df = self._model.get_storage_dataframe()
+        variables = df.loc[:, blueprint.column_name('Variable')].tolist()
+        registry = self._model.alias_registry
+        duplicates = registry.duplicates()
 
         # Stack and PlotType
         self.check_stack_table(df)
 
+        def view_row(row: int) -> int:
+            """Row number seen in the table, the rows may be sorted."""
+            return self._model.storage_index(row, 0).row() + 1
+
         error_msgs = []
-        graph = defaultdict(list)
+        scheduler = MTBuildScheduler()
         status_col_idx = self.model.columnCount(QModelIndex()) - 1
         with self._model.activate_fast_mode():
-            for idx, row in df.iterrows():
+            for idx in range(len(df.index)):
                 logger.debug(f"Row: {idx}")
-                model_idx = self.model.createIndex(idx, status_col_idx)
-                row_type, name, p, depends_on = _row_predicate(row, aliases, self._model.blueprint)
+                model_idx = self.model.storage_index(idx, status_col_idx)
+                row_id = self._model.row_id(idx)
+                depends_on = sorted(registry.references(row_id))
 
                 for var_name in depends_on:
                     if var_name in duplicates:
                         sinfo = StatusInfo()
                         sinfo.result = Result.INVALID
-                        conflict_row_ids = []
-                        for alias_idx, alias in enumerate(aliases):
-                            if var_name == alias:
-                                conflict_row_ids.append(alias_idx + 1)
-                        sinfo.msg = f"Conflicted row: {idx + 1}, '{var_name}' is defined in row (s): {conflict_row_ids}"
+                        conflict_row_ids = [view_row(alias_idx) for alias_idx in self._model.alias_rows(var_name)]
+                        sinfo.msg = f"Conflicted row: {view_row(idx)}, '{var_name}' is defined in row (s): " \
+                                    f"{conflict_row_ids}"
                         error_msgs.append(sinfo.msg)
                         self.model.setData(model_idx, str(sinfo), Qt.ItemDataRole.DisplayRole)
-                        if idx in graph:
-                            graph.pop(idx)
                 else:
-                    if row_type == RowAliasType.Simple:
-                        graph[idx].clear()
+                    if registry.is_simple(row_id):
+                        scheduler.add_row(idx)
                         continue
 
                     logger.debug(f"Is a mixed alias")
                     for k in depends_on:
-                        try:
-                            alias_idx = aliases.index(k)
-                            if alias_idx == idx:
-                                sinfo = StatusInfo()
-                                sinfo.result = Result.INVALID
-                                sinfo.msg = f"Conflicted row: {idx + 1} , '{aliases[idx]}' short circuit in '{name}'"
-                                error_msgs.append(sinfo.msg)
-                                self.model.setData(model_idx, str(sinfo), Qt.ItemDataRole.DisplayRole)
-                                break
-                            elif idx not in graph[alias_idx]:
-                                graph[idx].append(aliases.index(k))
-                            else:
-                                sinfo = StatusInfo()
-                                sinfo.result = Result.INVALID
-                                sinfo.msg = f"Conflicted row: {idx + 1} , circular dependency with alias '{k}'"
-                                error_msgs.append(sinfo.msg)
-                                self.model.setData(model_idx, str(sinfo), Qt.ItemDataRole.DisplayRole)
-                                break
-                        except ValueError:
+                        alias_rows = self._model.alias_rows(k)
+                        if not alias_rows:
                             continue
+                        alias_idx = alias_rows[0]
+                        if alias_idx == idx:
+                            sinfo = StatusInfo()
+                            sinfo.result = Result.INVALID
+                            sinfo.msg = f"Conflicted row: {view_row(idx)} , '{registry.alias(row_id)}' short " \
+                                        f"circuit in '{variables[idx]}'"
+                            error_msgs.append(sinfo.msg)
+                            self.model.setData(model_idx, str(sinfo), Qt.ItemDataRole.DisplayRole)
+                            break
+                        scheduler.add_edge(idx, alias_idx)
+
+            # Every row of a cycle is reported, with the alias that closes the cycle for that row
+            for cycle in scheduler.cycles():
+                cycle_rows = [view_row(idx) for idx in cycle]
+                for idx in cycle:
+                    alias = next(registry.alias(self._model.row_id(dependency))
+                                 for dependency in scheduler.dependencies(idx) if dependency in cycle)
+                    sinfo = StatusInfo()
+                    sinfo.result = Result.INVALID
+                    sinfo.msg = f"Conflicted row: {view_row(idx)} , circular dependency with alias '{alias}' " \
+                                f"between the rows {cycle_rows}"
+                    error_msgs.append(sinfo.msg)
+                    self.model.setData(self.model.storage_index(idx, status_col_idx), str(sinfo),
+                                       Qt.ItemDataRole.DisplayRole)
 
         if error_msgs:
             error_msg = '\n----\n'.join(error_msgs)
             self._abort_build(error_msg)
             return
+        self._schedule = scheduler
 
-        # Traverse the graph's edges.
+        # Checks of the cells that do not depend on the data sources, for all rows at once, and the pulses of the
+        # table with one pass per data source.
+        self._model.validate_table(self.invalid_stacks, range(len(df.index)))
+        self._model.resolve_pulses(range(len(df.index)))
+
+        # Rows are created after the rows they depend on, unchanged rows reuse the signals of the previous build
         with self._model.init_create_signals():
-            num_keys = len(graph.keys())
-            for i, k in enumerate(graph.keys()):
-                self.set_status_message(f"Creating signals | row: {k}")
-                self.set_progress(int(i * 100 / num_keys))
-                yield from self._traverse(graph, k)
+            order = scheduler.order()
+            for i, idx in enumerate(order):
+                self.set_status_message(f"Creating signals | row: {idx}")
+                self.set_progress(int(i * 100 / len(order)))
+                yield from self._model.create_signals(idx, self.invalid_stacks, scheduler.dependencies(idx))
 
         self._model.layoutChanged.emit()
-        self._model.aliases = []
-        self._processed.clear()
         self.set_progress(100)
         self.ready.emit()
         self.end_build()
 
-    def _traverse(self, graph: typing.DefaultDict[int, typing.List[int]], row_idx: int) -> \
-            typing.Iterator[Waypoint]:
-
-        for idx in graph[row_idx]:
-            if idx in self._processed:
-                continue
-            else:
-                yield from self._traverse(graph, idx)
-        else:
-            if row_idx not in self._processed:
-                self._processed.add(row_idx)
-                yield from self._model.create_signals(row_idx, self.invalid_stacks)
+    @property
+    def schedule(self) -> typing.Optional[MTBuildScheduler]:
+        """Dependency graph of the rows of the last build. See `MTBuildScheduler.levels` for independent rows."""
+        return self._schedule
 
     def check_stack_table(self, df):
         # Filter dataframe and extract valid values for 'Stack' and 'Plot Type' columns
@@ -5,8 +5,9 @@
 
 from collections import defaultdict
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
+import numpy as np
 import pandas as pd
 import typing
 import re
@@ -15,12 +16,19 @@ import uuid
 from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
 from PySide6.QtGui import QBrush, QColor
 
-from iplotProcessing.common import InvalidExpression
 from iplotlib.core import SignalXY, SignalContour
-from iplotlib.interface.iplotSignalAdapter import IplotSignalAdapter, Result, ParserHelper
+from iplotlib.interface.iplotSignalAdapter import IplotSignalAdapter, ParserHelper, Result
 from iplotProcessing.tools import Parser
 
 from mint.models.utils import mtBlueprintParser as mtBP
+from mint.models.utils.mtAliasRegistry import MTAliasRegistry
+from mint.models.utils.mtColumnStore import MTColumnStore, MTTableSnapshot
+from mint.models.utils.mtEditJournal import MTEditJournal, MTEditTransaction, coalesce_cells
+from mint.models.utils.mtExpressionCache import expression_cache
+from mint.models.utils.mtPulseResolver import MTPulseResolver, split_pulse
+from mint.models.utils.mtTextIndex import MTTextIndex
+from mint.models.utils.mtTableValidator import MAX_SPAN, MTTableValidator
+from mint.models.utils.mtValidationState import MTRowValidation, MTValidationState
 from mint.tools.table_parser import get_value
 
 from iplotDataAccess.appDataAccess import AppDataAccess
@@ -44,10 +52,31 @@ class Waypoint:
     func: typing.Callable = None
     args: list = None
     kwargs: dict = None
+    # Signal constructed by `create` and its access parameters at that time.
+    signal: typing.Any = field(default=None, repr=False, compare=False)
+    access: tuple = field(default=None, repr=False, compare=False)
 
     def __str__(self):
         return f"c:{self.col_num}|r:{self.row_num}|sn:{self.stack_num}|si:{self.signal_stack_id}"
 
+    def create(self):
+        """
+        Construct the signal. A waypoint reused by an incremental build returns the signal of the previous build,
+        along with its data, unless it failed, its range was changed since (a zoom) or one of its children was
+        rebuilt.
+        """
+        signal = self.signal
+        if signal is not None and signal.status_info.result != Result.FAIL and \
+                (signal.ts_start, signal.ts_end, signal.pulse_nb) == self.access and \
+                all(ParserHelper.env.get(child.alias) is child for child in signal.children if child.alias):
+            # The environment of the parser is cleared before every build
+            if signal.alias:
+                ParserHelper.env.update({signal.alias: signal})
+            return signal
+        signal = self.signal = self.func(*self.args, **self.kwargs)
+        self.access = (signal.ts_start, signal.ts_end, signal.pulse_nb)
+        return signal
+
 
 exp_stack = re.compile(r'(\d+)(?:[.](\d+))?(?:[.](\d+))?$')
 
@@ -57,33 +86,78 @@ class MTSignalsModel(QAbstractItemModel):
 
     ROWUID_COLNAME = 'uid'
 
+    # Above this many rectangles, a transaction reports its bounding rectangle instead.
+    MAX_CHANGE_RECTANGLES = 64
+
+    # Tables bigger than this are shown to the views in batches of FETCH_BATCH rows, see `fetchMore`.
+    VIRTUAL_THRESHOLD = 5000
+    FETCH_BATCH = 1000
+
+    # Low-cardinality columns are interned by the column store.
+    INTERNED_KEYS = ['DataSource', 'RowSpan', 'ColSpan', 'Envelope', 'Extremities', 'PlotType']
+    # Columns the alias registry is built from.
+    ALIAS_KEYS = ['Alias', 'Variable', 'x', 'y', 'z']
+
     def __init__(self, blueprint: dict = mtBP.DEFAULT_BLUEPRINT, parent=None):
 
         super().__init__(parent)
         self._white_brush = QBrush(QColor('white'))
         self._red_brush = QBrush(QColor('red'))
         self._orange_brush = QBrush(QColor('orange'))
+        # Indexed by the error code of a cell.
+        self._brushes = (self._white_brush, self._red_brush, self._orange_brush)
 
         self._entity_attribs = None
-        column_names = list(mtBP.get_column_names(blueprint))
-
         self._blueprint = blueprint
+        self._compiled = mtBP.CompiledBlueprint(blueprint)
+        column_names = list(self._compiled.column_names)
 
-        # When true, do not emit `dataChanged` in `setData`. That signal brings `setData` to its knees.
+        # When true, `setData` does not filter values and does not journal edits.
         self._fast_mode = False
-        mtBP.parse_raw_blueprint(self._blueprint)
-
-        self._table = pd.DataFrame(columns=column_names)
-        self._table_fails = pd.DataFrame(columns=column_names)
+        self._transaction = None  # type: typing.Optional[MTEditTransaction]
+        self._journal = MTEditJournal()
+
+        interned = [self._compiled.column_name(k) for k in self.INTERNED_KEYS if k in self._compiled]
+        self._store = MTColumnStore(column_names, interned=interned)
+        self._validation = MTValidationState(self._store)
+        self._validator = MTTableValidator(self._store, self._validation, self._compiled)
+        # True while the signals of a build are created after `validate_table`
+        self._table_validated = False
+        # Number of rows known to the views in virtual mode, None when all the rows are.
+        self._fetched = None  # type: typing.Optional[int]
+        # Sorting is a permutation from view rows to storage rows, the storage order is left untouched.
+        # None when the views show the storage order.
+        self._order = None  # type: typing.Optional[np.ndarray]
+        self._rank = None  # type: typing.Optional[np.ndarray]
+        # Sort keys per column, in storage order.
+        self._sort_keys = dict()  # type: typing.Dict[int, np.ndarray]
+        # Find & Replace index, built on the first search.
+        self._text_index = None  # type: typing.Optional[MTTextIndex]
+        # uid -> storage row, rebuilt on the next lookup after the rows shifted.
+        self._uid_rows = None  # type: typing.Optional[typing.Dict[str, int]]
+        # uid of the signals created for every pulse of a row -> uid of the row
+        self._derived_uids = dict()  # type: typing.Dict[str, str]
+        # row id -> storage row, rebuilt on the next lookup after the rows shifted.
+        self._id_rows = None  # type: typing.Optional[typing.Dict[int, int]]
+        # Aliases and references between rows, built on first use.
+        self._alias_registry = None  # type: typing.Optional[MTAliasRegistry]
+        # Pulses known to exist, or not, in the data sources.
+        self._pulses = MTPulseResolver()
+        # uid -> key of the row content and of the build parameters, and the waypoints created for it.
+        self._built = dict()  # type: typing.Dict[str, typing.Tuple[int, typing.List[Waypoint]]]
+        self._built_seen = set()  # type: typing.Set[str]
         self._signal_stack_ids = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
 
         self.data_sources = AppDataAccess.da.get_connected_data_source_names()
-        self.aliases = []
 
     @property
     def blueprint(self) -> dict:
         return self._blueprint
 
+    @property
+    def compiled_blueprint(self) -> mtBP.CompiledBlueprint:
+        return self._compiled
+
     def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
         return self.createIndex(row, column)
 
@@ -91,72 +165,196 @@ class MTSignalsModel(QAbstractItemModel):
         return QModelIndex()
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        return self._table.index.size
+        return len(self._store) if self._fetched is None else self._fetched
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return self._fetched is not None and self._fetched < len(self._store)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if not self.canFetchMore(parent):
+            return
+        count = min(self.FETCH_BATCH, len(self._store) - self._fetched)
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def fetch_all(self):
+        """Show all the rows to the views and leave the virtual mode."""
+        if not self.canFetchMore(QModelIndex()):
+            self._fetched = None
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, len(self._store) - 1)
+        self._fetched = None
+        self.endInsertRows()
+
+    @property
+    def is_virtual(self) -> bool:
+        return self._fetched is not None
+
+    def _block_callbacks(self, parent: QModelIndex, insert: bool):
+        """
+        Begin/end callbacks for the column store bulk operations. In virtual mode, blocks are reported only for
+        the rows that the views know of.
+        """
+        pending = [False]
+
+        def begin(row: int, count: int):
+            if self._fetched is not None:
+                if insert:
+                    count = count if row <= self._fetched else 0
+                    self._fetched += count
+                else:
+                    count = max(0, min(count, self._fetched - row))
+                    self._fetched -= count
+            pending[0] = count > 0
+            if not pending[0]:
+                return
+            if insert:
+                self.beginInsertRows(parent, row, row + count - 1)
+            else:
+                self.beginRemoveRows(parent, row, row + count - 1)
+
+        def end():
+            if not pending[0]:
+                return
+            if insert:
+                self.endInsertRows()
+            else:
+                self.endRemoveRows()
+
+        return begin, end
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        return self._table.columns.size
+        return len(self._store.columns)
 
     def data(self, index: QModelIndex, role: int = ...):
         if not index.isValid():
             return None
+        row = index.row() if self._order is None else self._order[index.row()]
         if role == Qt.ItemDataRole.DisplayRole:
-            value = self._table.iat[index.row(), index.column()]
-            column_name = self._table.columns[index.column()]
+            value = self._store.get(row, index.column())
+            column_name = self._store.columns[index.column()]
             if column_name == "Comment" and isinstance(value, str) and len(value) > 40:
                 return value[:40] + "..."
             return value
         if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
-            return self._table.iat[index.row(), index.column()]
+            return self._store.get(row, index.column())
         if role == Qt.ItemDataRole.BackgroundRole:
-            fail_value = self._table_fails.iat[index.row(), index.column()]
-            # Value 0 corresponds to a correct cell.
-            # Value 1 corresponds to a main error.
-            # Value 2 corresponds to a secondary error resulting from a main error.
-            if fail_value == 0:
-                return self._white_brush
-            elif fail_value == 1:
-                return self._red_brush
-            else:
-                return self._orange_brush
-        # tooltip for comment column
+            return self._brushes[self._validation.code(row, index.column())]
+        # tooltip for comment column and invalid cells
         if role == Qt.ItemDataRole.ToolTipRole:
             # get the column name
-            column_name = self._table.columns[index.column()]
+            column_name = self._store.columns[index.column()]
             if column_name == "Comment":
-                return self._table.iat[index.row(), index.column()]
+                return self._store.get(row, index.column())
+            return self._validation.message(row, index.column())
 
         return None
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
         if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
             try:
-                return self._table.columns[section]
+                return self._store.columns[section]
             except IndexError:
                 return "N/A"
 
     @contextmanager
-    def activate_fast_mode(self):
+    def activate_fast_mode(self, journal: bool = False):
+        """Store values as they are, i.e, without filtering them. With `journal`, the edits can be undone."""
+        previous = self._fast_mode
+        with self.transaction(journal=journal):
+            try:
+                self._fast_mode = True
+                yield None
+            finally:
+                self._fast_mode = previous
+
+    @contextmanager
+    def transaction(self, journal: bool = True):
+        """
+        Group edits. The touched cells are reported with as few `dataChanged` rectangles as possible once the
+        outermost transaction exits. With `journal`, the edits are undone/redone as a whole.
+        Nested transactions are part of the outermost one.
+        """
+        if self._transaction is not None:
+            yield self._transaction
+            return
+        self._transaction = MTEditTransaction(journal)
         try:
-            self._fast_mode = True
-            yield None
+            yield self._transaction
         finally:
-            self._fast_mode = False
-            self.layoutChanged.emit()
-
-    def setData(self, index: QModelIndex, value: typing.Any, role: int = ..., is_downsampled: bool = False) -> bool:
-        if not index.isValid():
+            transaction, self._transaction = self._transaction, None
+            self._commit(transaction)
+
+    def _commit(self, transaction: MTEditTransaction):
+        last_row = self.rowCount() - 1
+        rectangles = [(top, left, min(bottom, last_row), right)
+                      for top, left, bottom, right in coalesce_cells(transaction.cells) if top <= last_row]
+        if len(rectangles) > self.MAX_CHANGE_RECTANGLES:
+            rectangles = [(min(r[0] for r in rectangles), min(r[1] for r in rectangles),
+                           max(r[2] for r in rectangles), max(r[3] for r in rectangles))]
+        for top, left, bottom, right in rectangles:
+            self.dataChanged.emit(self.index(top, left), self.index(bottom, right))
+        if transaction.journal:
+            self._journal.push(transaction.changes)
+
+    def can_undo(self) -> bool:
+        return self._journal.can_undo()
+
+    def can_redo(self) -> bool:
+        return self._journal.can_redo()
+
+    def undo(self) -> bool:
+        if not self._journal.can_undo():
             return False
-        row = index.row()
-        column = index.column()
-        col_name = self._table.columns[column]
+        self._apply_changes(self._journal.undo())
+        return True
 
-        if role != Qt.ItemDataRole.EditRole and role != Qt.ItemDataRole.DisplayRole:
+    def redo(self) -> bool:
+        if not self._journal.can_redo():
             return False
+        self._apply_changes(self._journal.redo())
+        return True
 
+    def _apply_changes(self, changes):
+        rows = self._rows_by_id()
+        with self.transaction(journal=False) as transaction:
+            for row_id, column, _, value in changes:
+                row = rows.get(row_id)
+                if row is None:  # The row was removed in the meantime
+                    continue
+                self._store.set(row, column, value)
+                self._cell_changed(row, column, value)
+                transaction.touch(self._to_view(row), column)
+
+    def _to_storage(self, row: int) -> int:
+        """Storage row of a view row."""
+        return row if self._order is None else int(self._order[row])
+
+    def _to_view(self, row: int) -> int:
+        """View row of a storage row."""
+        return row if self._order is None else int(self._to_view_rows(row))
+
+    def _to_view_rows(self, rows):
+        """View rows of an array of storage rows."""
+        if self._order is None:
+            return rows
+        if self._rank is None:
+            self._rank = np.empty_like(self._order)
+            self._rank[self._order] = np.arange(self._order.size)
+        return self._rank[rows]
+
+    def storage_index(self, row: int, column: int) -> QModelIndex:
+        """Model index of a cell given its storage row, i.e, its row in `get_storage_dataframe`."""
+        return self.createIndex(self._to_view(row), column)
+
+    @staticmethod
+    def _normalize(col_name: str, value: typing.Any, filtered: bool) -> typing.Any:
+        """The value of a cell as it is stored. `filtered` replaces the newlines and tabs of an interactive edit."""
         if col_name != 'Comment':
 
             # Filter actual and literal newline/tab on interactive edit
-            if not self._fast_mode and isinstance(value, str):
+            if filtered and isinstance(value, str):
                 # replace real CR/LF and tabs
                 value = value.replace('\r\n', ' ').replace('\r', ' ')
                 value = value.replace('\n', ' ').replace('\t', ' ')
@@ -174,87 +372,187 @@ class MTSignalsModel(QAbstractItemModel):
             if ',' in value:
                 # replaces "" with '' if value has , in it.
                 value = value.replace('"', "'")
+        return value
+
+    def setData(self, index: QModelIndex, value: typing.Any, role: int = ..., is_downsampled: bool = False) -> bool:
+        if not index.isValid():
+            return False
+        row = index.row()
+        column = index.column()
+        col_name = self._store.columns[column]
+
+        if role != Qt.ItemDataRole.EditRole and role != Qt.ItemDataRole.DisplayRole:
+            return False
 
-        if row + 1 >= self._table.index.size:
+        value = self._normalize(col_name, value, filtered=not self._fast_mode)
+
+        if row + 1 >= len(self._store):
             self.insertRows(row + 1, 1, QModelIndex())
 
         # Indicate if the signal is downsampled or not
         if is_downsampled:
-            self._table.iloc[row, column] = value + '|Downsampled'
-        else:
-            self._table.iloc[row, column] = value
+            value = value + '|Downsampled'
+        storage_row = self._to_storage(row)
+        old_value = self._store.get(storage_row, column)
+        self._store.set(storage_row, column, value)
+        self._cell_changed(storage_row, column, value)
 
-        if not self._fast_mode:
-            self.dataChanged.emit(self.createIndex(row, column), self.createIndex(row, column))
+        with self.transaction() as transaction:
+            transaction.touch(row, column)
+            transaction.record(self._store.row_id(storage_row), column, old_value, value)
 
         return True
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlag:
         if index.isValid():
-            if self._table.columns[index.column()] != 'Status':
+            if self._store.columns[index.column()] != 'Status':
                 return Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
             else:
                 return Qt.ItemFlag.ItemIsEnabled
 
-    def insertRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
-        self.beginInsertRows(parent, row, row + count)
-
-        for new_row in range(row, row + count):
-            # Create empty row
-            data = [["" for _ in range(self._table.columns.size)]]
-            data_fails = [[0 for _ in range(self._table.columns.size)]]
-            empty_row = pd.DataFrame(data=data, columns=self._table.columns)
-            col_data_source = mtBP.get_column_name(self.blueprint, 'DataSource')
-            col_plot_type = mtBP.get_column_name(self.blueprint, 'PlotType')
-            empty_row_fails = pd.DataFrame(data=data_fails, columns=self._table.columns)
+    def _empty_row_values(self, count: int) -> dict:
+        return {
             # Set default Datasource
-            empty_row.loc[0, col_data_source] = self.blueprint.get('DataSource').get('default')
+            self._compiled.column_name('DataSource'): self._compiled.default('DataSource'),
             # Set default PlotType
-            empty_row.loc[0, col_plot_type] = self.blueprint.get('PlotType').get('default')
+            self._compiled.column_name('PlotType'): self._compiled.default('PlotType'),
             # Generate uid
-            empty_row.loc[0, self.ROWUID_COLNAME] = str(uuid.uuid4())
-            self._table = pd.concat([self._table.iloc[:new_row], empty_row, self._table.iloc[new_row:]]).reset_index(
-                drop=True)
-            self._table_fails = pd.concat(
-                [self._table_fails.iloc[:new_row], empty_row_fails, self._table_fails.iloc[new_row:]]).reset_index(
-                drop=True)
-        self.layoutChanged.emit()
-
-        self.endInsertRows()
+            self.ROWUID_COLNAME: [str(uuid.uuid4()) for _ in range(count)]
+        }
 
-        return super().insertRows(row, count, parent=parent)
+    def insertRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
+        return self.insert_row_ranges([(row, count)], parent)
 
     def removeRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
-        self.beginRemoveRows(parent, row, row + count)
+        return self.remove_row_ranges([(row, count)], parent)
+
+    @staticmethod
+    def ranges_from_rows(rows: typing.Iterable[int]) -> typing.List[typing.Tuple[int, int]]:
+        """Group row numbers into sorted (row, count) ranges of consecutive rows."""
+        ranges = []
+        for row in sorted(set(rows)):
+            if ranges and ranges[-1][0] + ranges[-1][1] == row:
+                ranges[-1] = (ranges[-1][0], ranges[-1][1] + 1)
+            else:
+                ranges.append((row, 1))
+        return ranges
 
-        try:
-            self._table = self._table.drop(list(range(row, row + count)), axis=0).reset_index(drop=True)
-            self._table_fails = self._table_fails.drop(list(range(row, row + count)), axis=0).reset_index(drop=True)
-            self.layoutChanged.emit()
-            success = True
-        except KeyError:
-            success = False
+    def insert_row_ranges(self, ranges: typing.Iterable[typing.Tuple[int, int]],
+                          parent: QModelIndex = QModelIndex()) -> bool:
+        """
+        Insert empty rows for every (row, count) in `ranges` in a single pass.
+        Rows refer to the table before the insertion. One begin/end notification pair is emitted per block.
+        """
+        blocks = defaultdict(int)
+        for row, count in ranges:
+            if count <= 0 or row < 0 or row > len(self._store):
+                return False
+            blocks[row] += count
+        if not blocks:
+            return False
+        blocks = sorted(blocks.items())
+
+        begin, end = self._block_callbacks(parent, insert=True)
+        if self._order is None:
+            self._store.insert_blocks(blocks, [self._empty_row_values(count) for _, count in blocks], begin, end)
+            positions = np.repeat([row for row, _ in blocks], [count for _, count in blocks])
+            for col, keys in self._sort_keys.items():
+                self._sort_keys[col] = np.insert(keys, positions, '')
+            self._index_rows(positions + np.arange(positions.size))
+            return True
+
+        # Sorted view: new rows go at the end of the storage and are placed in the permutation only.
+        total = sum(count for _, count in blocks)
+        first = len(self._store)
+        self._store.insert_rows(first, total, self._empty_row_values(total))
+        for col, keys in self._sort_keys.items():
+            self._sort_keys[col] = np.concatenate((keys, np.full(total, '', dtype=object)))
+        new_rows = np.arange(first, first + total)
+        self._index_rows(new_rows)
+        shift = 0
+        for row, count in blocks:
+            begin(row + shift, count)
+            self._order = np.insert(self._order, row + shift, new_rows[shift:shift + count])
+            self._rank = None
+            end()
+            shift += count
+        return True
 
-        self.endRemoveRows()
+    def remove_row_ranges(self, ranges: typing.Iterable[typing.Tuple[int, int]],
+                          parent: QModelIndex = QModelIndex()) -> bool:
+        """
+        Remove every (row, count) in `ranges` in a single pass. Overlapping ranges are merged.
+        Rows refer to the table before the removal. One begin/end notification pair is emitted per block.
+        """
+        keep = np.ones(len(self._store), dtype=bool)
+        for row, count in ranges:
+            if count <= 0 or row < 0 or row + count > len(self._store):
+                return False
+            keep[row:row + count] = False
+        blocks = self.ranges_from_rows(np.flatnonzero(~keep))
+        if not blocks:
+            return False
 
-        return success
+        begin, end = self._block_callbacks(parent, insert=False)
+        removed_ids = self._store.row_ids()[np.flatnonzero(~keep) if self._order is None else self._order[~keep]]
+        if self._text_index is not None:
+            self._text_index.discard_rows(removed_ids.tolist())
+        if self._alias_registry is not None:
+            self._alias_registry.discard_rows(removed_ids.tolist())
+        if self._order is None:
+            removed = np.flatnonzero(~keep)
+            self._store.remove_blocks(blocks, begin, end)
+        else:
+            # Sorted view: drop the rows from the permutation, then from the storage in one silent pass.
+            removed = np.sort(self._order[~keep])
+            shift = 0
+            for row, count in blocks:
+                begin(row - shift, count)
+                self._order = np.delete(self._order, np.s_[row - shift:row - shift + count])
+                self._rank = None
+                end()
+                shift += count
+            self._store.remove_blocks(self.ranges_from_rows(removed))
+            self._order -= np.searchsorted(removed, self._order)
+        for col, keys in self._sort_keys.items():
+            self._sort_keys[col] = np.delete(keys, removed)
+        self._uid_rows, self._id_rows = None, None
+        return True
+
+    def _last_filled_row(self) -> int:
+        # Status, uid and Comment do not make a row worth keeping, neither does the data source alone.
+        mask = self._store.non_empty_rows(range(1, self.columnCount() - 4))
+        filled = np.flatnonzero(mask)
+        return filled[-1] if filled.size else -1
 
     def get_dataframe(self):
-        filtered_rows = self._table[self._table.iloc[:, 1:-4].any(axis=1)]
-        if not filtered_rows.empty:
-            max_idx = filtered_rows.index[-1]
-            return self._table[:max_idx + 1]
-        else:
-            return pd.DataFrame(columns=self._table.columns)
+        """The filled rows in the order of the views, as they are exported."""
+        if self._order is None:
+            return self.get_storage_dataframe()
+        mask = self._store.non_empty_rows(range(1, self.columnCount() - 4))[self._order]
+        filled = np.flatnonzero(mask)
+        rows = self._order[:filled[-1] + 1 if filled.size else 0]
+        return self._store.to_dataframe().iloc[rows].reset_index(drop=True)
+
+    def get_storage_dataframe(self):
+        """The filled rows in storage order, i.e, row `i` of the frame is the row of `storage_index(i, ...)`."""
+        return self._store.to_dataframe(stop=self._last_filled_row() + 1)
+
+    def snapshot(self) -> MTTableSnapshot:
+        """An immutable copy-on-write view of the filled rows, see `get_storage_dataframe`."""
+        return self._store.snapshot(stop=self._last_filled_row() + 1)
 
     def remove_empty_rows(self):
         columns = ['Variable', 'Stack', 'Row span', 'Col span', 'Envelope', 'Alias', 'PulseId', 'StartTime', 'EndTime',
                    'x', 'y', 'z', 'Plot type', 'Status']
-        self._table = self._table[(self._table[columns].isnull().sum(1) + (self._table[columns] == "").sum(1)) < 14]
+        mask = self._store.non_empty_rows([self._store.loc(c) for c in columns])
+        if self._order is not None:
+            mask = mask[self._order]
+        self.remove_row_ranges(self.ranges_from_rows(np.flatnonzero(~mask)))
 
     def accommodate(self, df: pd.DataFrame):
         # Accommodate for missing columns in df.
-        columns = list(mtBP.get_column_names(self._blueprint))
+        columns = self._compiled.column_names
         for df_column_name in df.columns:
             if df_column_name not in columns:
                 if df_column_name == self.ROWUID_COLNAME:
@@ -262,8 +560,8 @@ class MTSignalsModel(QAbstractItemModel):
                     df.insert(df.columns.size, self.ROWUID_COLNAME, [str(uuid.uuid4()) for _ in range(df.index.size)])
                 else:
                     logger.warning(f"{df_column_name} is not a valid column name.")
-                    if df_column_name in self._blueprint.keys():
-                        df.rename({df_column_name: mtBP.get_column_name(self._blueprint, df_column_name)}, axis=1,
+                    if df_column_name in self._compiled:
+                        df.rename({df_column_name: self._compiled.column_name(df_column_name)}, axis=1,
                                   inplace=True)
                     elif df_column_name.lower() in columns:
                         df.rename({df_column_name: df_column_name.lower()}, axis=1, inplace=True)
@@ -277,11 +575,8 @@ class MTSignalsModel(QAbstractItemModel):
         return df
 
     def set_dataframe(self, df: pd.DataFrame):
-        old_size = self.rowCount()
-        self.removeRows(0, old_size)
+        self._journal.clear()
         new_size = df.index.size
-        self.insertRows(0, new_size)
-
         df = self.accommodate(df)
 
         # Force blueprint to have uid column
@@ -293,36 +588,56 @@ class MTSignalsModel(QAbstractItemModel):
                 "type_name": "str",
                 "type": str
             }
-        columns = list(mtBP.get_column_names(self._blueprint))
-
-        for c, col_name in enumerate(columns):
-            if col_name in df.columns:
-                self._table.iloc[:df.index.size, c] = df.loc[:, col_name]
+            self._compiled = mtBP.CompiledBlueprint(self._blueprint)
+            self._validator = MTTableValidator(self._store, self._validation, self._compiled)
+        columns = self._compiled.column_names
+
+        self.beginResetModel()
+        self._store.clear()
+        self._validation.reset()
+        self._order, self._rank = None, None
+        self._sort_keys.clear()
+        self._text_index = None
+        self._uid_rows, self._id_rows = None, None
+        self._derived_uids.clear()
+        self._alias_registry = None
+        self._store.insert_rows(0, new_size, self._empty_row_values(new_size))
+        for col_name in columns:
+            if col_name in df.columns and col_name in self._store.columns:
+                values = df.loc[:, col_name].to_numpy(dtype=object)
+                if col_name == self.ROWUID_COLNAME:
+                    # Rows without uid keep the one generated for them
+                    values = np.where(pd.isna(values) | (values == ''), self._store.column(col_name), values)
+                self._store.assign(col_name, values)
             else:
                 logger.debug(f"{col_name} is not present in given dataframe.")
                 continue
+        # Very large tables are shown progressively.
+        self._fetched = min(new_size, self.FETCH_BATCH) if new_size > self.VIRTUAL_THRESHOLD else None
+        self.endResetModel()
 
     def append_dataframe(self, df: pd.DataFrame):
         if df.empty:
             return
         df = self.accommodate(df)
         df['uid'] = [str(uuid.uuid4()) for _ in range(len(df.index))]
+        # Appended rows go below the current rows in storage order, show that order again.
+        self._clear_sort()
 
-        # Create False for fails table
-        df_fails = pd.DataFrame(data=0, index=range(df.shape[0]), columns=self._table_fails.columns)
+        # Keep an empty row at the bottom of the table
+        last_row_empty = not self._store.empty and self._last_filled_row() < len(self._store) - 1
+        row = len(self._store) - 1 if last_row_empty else len(self._store)
+        count = df.index.size
+        values = {name: df[name].fillna('').to_numpy(dtype=object) for name in df.columns
+                  if name in self._store.columns}
 
-        # Check if last row is empty
-        if self._table.empty or self._table.iloc[-1:, 1:-4].any(axis=1).bool():
-            self._table = pd.concat([self._table, df], ignore_index=True).fillna('')
-            self.insertRows(len(self._table), 1, QModelIndex())
-            self._table_fails = pd.concat([self._table_fails, df_fails], ignore_index=True)
-            self.insertRows(len(self._table_fails), 1, QModelIndex())
-        else:
-            self._table = pd.concat([self._table[:-1], df, self._table[-1:]], ignore_index=True).fillna('')
-            self._table_fails = pd.concat([self._table_fails[:-1], df_fails, self._table_fails[-1:]],
-                                          ignore_index=True)
+        begin, end = self._block_callbacks(QModelIndex(), insert=True)
+        self._store.insert_blocks([(row, count)], [values], begin, end)
+        self._sort_keys.clear()
+        self._index_rows(np.arange(row, row + count))
 
-        self.layoutChanged.emit()
+        if not last_row_empty:
+            self.insertRows(len(self._store), 1, QModelIndex())
 
     def export_dict(self) -> dict:
         # 1. blueprint defines columns..
@@ -335,14 +650,15 @@ class MTSignalsModel(QAbstractItemModel):
     def import_dict(self, input_dict: dict):
         # 1. blueprint defines columns..
         try:
-            temp_blueprint = mtBP.parse_raw_blueprint(input_dict['blueprint'])
+            temp_blueprint = dict(input_dict['blueprint'])
             if not temp_blueprint.get("PulseNumber").get("label"):
                 temp_blueprint.get("PulseNumber").update({"label": "PulseId"})
+            temp_blueprint = mtBP.CompiledBlueprint(temp_blueprint)
         except KeyError:
-            temp_blueprint = self.blueprint
+            temp_blueprint = self._compiled
         # 2. table
-        column_names = list(mtBP.get_column_names(temp_blueprint))
-        self._entity_attribs = list(mtBP.get_code_names(temp_blueprint))
+        column_names = list(temp_blueprint.column_names)
+        self._entity_attribs = list(temp_blueprint.code_names)
         if 'table' in input_dict:
             raw = input_dict['table']
         elif 'variables_table' in input_dict:
@@ -363,34 +679,58 @@ class MTSignalsModel(QAbstractItemModel):
     def import_json(self, input_file):
         self.import_dict(json.loads(input_file))
 
+    @staticmethod
+    def holds_data(signal: IplotSignalAdapter) -> bool:
+        """
+        True when the signal already accessed the data of its current range, e.g. a signal reused from the previous
+        build or fetched by the fetch engine, and did not fail.
+        """
+        md5sum = getattr(signal, '_access_md5sum', None)
+        return md5sum is not None and md5sum == signal.calculate_data_hash() and \
+            signal.status_info.result != Result.FAIL
+
+    def row_queries_data(self, row_idx: int) -> bool:
+        """Rows with neither an alias nor a stack are not plotted nor used by other rows, their data is not needed."""
+        alias = self._store.get(row_idx, self._store.loc(self._compiled.column_name('Alias')))
+        stack_val = self._store.get(row_idx, self._store.loc(self._compiled.column_name('Stack')))
+        return bool(alias or stack_val)
+
     def update_signal_data(self, row_idx: int, signal: IplotSignalAdapter, fetch_data=False):
+        """
+        Update the status of the row of the signal. The table stays editable while the data is retrieved, the row is
+        looked up again from the uid of the signal created at `row_idx` and the rows removed since are skipped.
+        """
+        if signal.uid:
+            row_idx = self.row_of_uid(signal.uid)
+            if row_idx is None:
+                return
         with self.activate_fast_mode():
-            model_idx = self.createIndex(row_idx, self._table.columns.get_loc('Status'))
-            signal.status_info.reset()
+            model_idx = self.storage_index(row_idx, self._store.loc('Status'))
+            current = fetch_data and self.holds_data(signal)
+            if not current:
+                signal.status_info.reset()
             self.setData(model_idx, str(signal.status_info), Qt.ItemDataRole.DisplayRole)
 
             if fetch_data:
-                # Read alias and stack from the table row
-                alias_col = mtBP.get_column_name(self._blueprint, 'Alias')
-                stack_col = mtBP.get_column_name(self._blueprint, 'Stack')
-                alias = self._table.at[row_idx, alias_col]
-                stack_val = self._table.at[row_idx, stack_col]
-
                 # Skip query if alias or stack is missing
-                if not alias and not stack_val:
+                if not self.row_queries_data(row_idx):
                     logger.debug(f"Row {row_idx}: skip query (missing alias and stack)")
                     return
 
-                self.setData(model_idx, Result.BUSY, Qt.ItemDataRole.DisplayRole)
-                signal.get_data()
+                if not current:
+                    self.setData(model_idx, Result.BUSY, Qt.ItemDataRole.DisplayRole)
+                    signal.get_data()
 
                 # Check Signal status
                 if signal.status_info.result == 'Fail':
                     # If variable is not valid we have two cases:
                     #   1) Incorrect name
                     #   2) No data in that interval
-                    index = self._table.index[self._table['uid'] == signal.uid].tolist()
-                    self._table_fails.loc[index, 'Variable'] = 1
+                    column = self._store.loc('Variable')
+                    self._validation.set(row_idx, column, MTValidationState.ERROR,
+                                         f"Data access failed: {signal.status_info.msg or signal.status_info}")
+                    # Repaint the cell, its background and tool tip show the error
+                    self._transaction.touch(self._to_view(row_idx), column)
 
             self.setData(model_idx, str(signal.status_info), Qt.ItemDataRole.DisplayRole, signal.isDownsampled)
 
@@ -398,26 +738,121 @@ class MTSignalsModel(QAbstractItemModel):
     def init_create_signals(self):
         try:
             self._signal_stack_ids.clear()
+            self._built_seen.clear()
             yield None
+            # Forget the rows that are gone
+            for uid in [uid for uid in self._built if uid not in self._built_seen]:
+                del self._built[uid]
         finally:
             self._signal_stack_ids.clear()
+            self._table_validated = False
 
-    def create_signals(self, row_idx: int, stack) -> typing.Iterator[Waypoint]:
+    def validate_table(self, stack=(), rows: typing.Sequence[int] = None) -> int:
+        """
+        Check the cells that do not depend on the data sources for the given rows (all rows by default) at once.
+        `create_signals` then only checks the pulses, time ranges and dependencies of each row.
+        Returns the number of invalid cells.
+        """
+        self._table_validated = True
+        return self._validator.validate(rows, self.data_sources, stack, self._to_view_rows)
+
+    @property
+    def pulse_resolver(self) -> MTPulseResolver:
+        return self._pulses
+
+    def resolve_pulses(self, rows: typing.Sequence[int] = None) -> int:
+        """
+        Look up the pulses of the PulseId column of the given rows (all rows by default) in their data sources,
+        with one pass per data source. `create_signals` then finds them in the cache of the pulse resolver.
+        Returns the number of pulses that could not be found.
+        """
+        if 'PulseNumber' not in self._compiled or 'DataSource' not in self._compiled:
+            return 0
+        rows = range(len(self._store)) if rows is None else rows
+        pulse_type = self._compiled.field('PulseNumber').type
+        pulse_col = self._store.column(self._compiled.column_name('PulseNumber'))
+        ds_col = self._store.column(self._compiled.column_name('DataSource'))
+        pulses = set()
+        for row in rows:
+            ds_name = ds_col[row]
+            if ds_name not in self.data_sources:
+                continue
+            value = pulse_col[row]
+            for element in (pulse_type(value) if isinstance(value, str) else None) or ():
+                pulses.add((ds_name, split_pulse(element)[0]))
+        return sum(not found for found in self._pulses.resolve(pulses).values())
+
+    def clear_built_rows(self, uids: typing.Iterable[str] = None):
+        """
+        Forget the waypoints of the previous builds for the rows of the given uids (all rows by default), the next
+        build creates their signals again.
+        """
+        if uids is None:
+            self._built.clear()
+            return
+        for uid in uids:
+            self._built.pop(uid, None)
+
+    def _row_key(self, row_idx: int, stack, dependencies: typing.Iterable[str]) -> int:
+        status = self._store.loc(self._compiled.column_name('Status'))
+        values = tuple(str(value) for col, value in enumerate(self._store.row(row_idx).values()) if col != status)
+        stack_value = self._store.get(row_idx, self._store.loc(self._compiled.column_name('Stack')))
+        return hash((values,
+                     tuple(repr(self._compiled.default(key)) for key in self._compiled.override_keys),
+                     stack_value in stack,
+                     tuple(self.data_sources),
+                     tuple(self._built[uid][0] if uid in self._built else None for uid in dependencies)))
+
+    def create_signals(self, row_idx: int, stack, dependencies: typing.Iterable[int] = ()) -> \
+            typing.Iterator[Waypoint]:
+        """
+        Create the waypoints of a row. The waypoints of the previous build, and their signals, are reused when
+        neither the row, the build parameters nor the rows it depends on (storage rows) changed since.
+        """
+        uid_col = self._store.loc(self.ROWUID_COLNAME)
+        uid = self._store.get(row_idx, uid_col)
+        key = self._row_key(row_idx, stack, [self._store.get(row, uid_col) for row in dependencies])
+        self._built_seen.add(uid)
+
+        built = self._built.get(uid)
+        if built is not None and built[0] == key:
+            for waypoint in built[1]:
+                waypoint.idx = row_idx
+                stack_ids = self._signal_stack_ids[waypoint.col_num][waypoint.row_num]
+                waypoint.signal_stack_id = stack_ids[waypoint.stack_num]
+                stack_ids[waypoint.stack_num] += 1
+                yield waypoint
+            return
+
+        self._built.pop(uid, None)
+        waypoints = []
+        for waypoint in self._create_signals(row_idx, stack):
+            waypoints.append(waypoint)
+            yield waypoint
+        self._built[uid] = (key, waypoints)
+
+    def _create_signals(self, row_idx: int, stack) -> typing.Iterator[Waypoint]:
         signal_params = dict()
         # Initialize attributes for Waypoint
         col_num = row_num = col_span = row_span = stack_num = ts_start = ts_end = -1
 
+        if not self._table_validated:
+            self._validator.validate([row_idx], self.data_sources, stack, self._to_view_rows)
+        checked = set(self._validator.columns())
+        self._validation.reset(row_idx, [col for col in range(len(self._store.columns)) if col not in checked])
         for i, parsed_row in enumerate(
-                self._parse_series(self._table.loc[row_idx], self._table_fails.loc[row_idx], row_idx + 1, stack)):
+                self._parse_series(pd.Series(self._store.row(row_idx)), self._validation.row(row_idx),
+                                   self._to_view(row_idx) + 1, stack)):
 
-            signal_params.update(mtBP.construct_params_from_series(self.blueprint, parsed_row[0]))
-            errors = any(parsed_row[1] > 0)
+            signal_params.update(self._compiled.construct_params_from_series(parsed_row[0]))
+            errors = parsed_row[1].any()
             # Update Status to "Ready" if any cell is invalid.
-            status_col = mtBP.get_column_name(self.blueprint, 'Status')
-            sc = self._table.columns.get_loc(status_col)
+            status_col = self._compiled.column_name('Status')
+            sc = self._store.loc(status_col)
             if errors:
-                self._table.iat[row_idx, sc] = "Ready"
-                status_idx = self.createIndex(row_idx, sc)
+                self._store.set(row_idx, sc, "Ready")
+                self._cell_changed(row_idx, sc, "Ready")
+                status_idx = self.storage_index(row_idx, sc)
                 self.dataChanged.emit(status_idx, status_idx)
 
             if i == 0:  # grab these from the first row we encounter
@@ -470,23 +905,20 @@ class MTSignalsModel(QAbstractItemModel):
                                 ts_start,
                                 ts_end,
                                 func=mtBP.construct_signal,
-                                args=[self.blueprint],
+                                args=[self._compiled],
                                 kwargs={'signal_class': signal_class, **signal_params}
                                 )
 
             self._signal_stack_ids[col_num][row_num][stack_num] += 1
             yield waypoint
 
-    def _parse_series(self, inp: pd.Series, fls: pd.Series, table_row, stack) -> typing.Iterator[pd.Series]:
+    def _parse_series(self, inp: pd.Series, fls: MTRowValidation, table_row, stack) -> typing.Iterator[pd.Series]:
         with self.activate_fast_mode():
             out = dict()
 
-            for k, v in self._blueprint.items():
-                if k.startswith('$'):
-                    continue
-
-                column_name = mtBP.get_column_name(self._blueprint, k)
-                default_value = v.get('default')
+            for field in self._compiled.fields:
+                column_name = field.column_name
+                default_value = field.default
                 if not default_value:
                     if column_name == 'uid':
                         default_value = str(uuid.uuid4())
@@ -494,51 +926,30 @@ class MTSignalsModel(QAbstractItemModel):
                         default_value = ""
                 out.update({column_name: default_value})
 
-                type_func = v.get('type')
+                type_func = field.type
                 if not callable(type_func):
                     continue
 
                 # Override global values with locals for fields with 'override' attribute
-                if v.get('override'):
+                if field.override:
                     if column_name == 'PulseId':
                         value = get_value(inp, column_name, type_func)
                         override_global = value is not None
                         if override_global:
-                            plus_pattern = re.compile(r"\+\((.*)\)")
-                            minus_pattern = re.compile(r"-\((.*)\)")
-
                             # Lists to store the elements corresponding to every pattern
                             elements = [[], [], []]
 
                             # Iterate over the list and classify the elements
                             for element in value:
-                                match_plus = plus_pattern.match(element)
-                                match_minus = minus_pattern.match(element)
-                                if match_plus:
-                                    pulse = match_plus.group(1)
-                                    idx = 0
-                                elif match_minus:
-                                    pulse = match_minus.group(1)
-                                    idx = 1
-                                else:
-                                    pulse = element
-                                    idx = 2
-
-                                # Check each pulse
-                                if inp['DS'] in self.data_sources:
-                                    if not AppDataAccess.da.get_data_source(inp['DS']).get_pulses_df(
-                                            pattern=pulse).empty:
-                                        elements[idx].append(pulse)
-                                        fls[column_name] = 0
-                                    else:
-                                        fls[column_name] = 1
-                                        logger.warning(
-                                            f"The pulse '{pulse}' could not be found in the data source '{inp['DS']}' "
-                                            f"in the table row [{table_row}]")
-                                        break
+                                pulse, idx = split_pulse(element)
+
+                                # Check each pulse, usually resolved beforehand by `resolve_pulses`
+                                if inp['DS'] in self.data_sources and self._pulses.exists(inp['DS'], pulse):
+                                    elements[idx].append(pulse)
+                                    fls[column_name] = 0
                                 else:
                                     fls[column_name] = 1
-                                    logger.warning(
+                                    fls.warn(
                                         f"The pulse '{pulse}' could not be found in the data source '{inp['DS']}' "
                                         f"in the table row [{table_row}]")
                                     break
@@ -574,8 +985,8 @@ class MTSignalsModel(QAbstractItemModel):
                                 fls[column_name] = 0
                             else:
                                 fls[column_name] = 1
-                                logger.warning(f"Invalid date format: expected an absolute timestamp in nanoseconds in "
-                                               f"the table row [{table_row}]")
+                                fls.warn(f"Invalid date format: expected an absolute timestamp in nanoseconds in "
+                                         f"the table row [{table_row}]")
                             value = default_value
 
                         # None value but there are pulses
@@ -584,8 +995,8 @@ class MTSignalsModel(QAbstractItemModel):
                                 fls[column_name] = 0
                             else:
                                 fls[column_name] = 1
-                                logger.warning(f"Invalid date format: expected a relative timestamp when using pulses "
-                                               f"in the table row [{table_row}]")
+                                fls.warn(f"Invalid date format: expected a relative timestamp when using pulses "
+                                         f"in the table row [{table_row}]")
 
                             if default_value == '':
                                 if column_name == 'StartTime':
@@ -612,8 +1023,8 @@ class MTSignalsModel(QAbstractItemModel):
                             else:
                                 value = default_value
                                 fls[column_name] = 1
-                                logger.warning(f"Invalid date format: expected an absolute timestamp when using a time "
-                                               f"range without pulses in the table row [{table_row}]")
+                                fls.warn(f"Invalid date format: expected an absolute timestamp when using a time "
+                                         f"range without pulses in the table row [{table_row}]")
 
                         # There is a value and pulses
                         elif value is not None and out['PulseId']:
@@ -624,8 +1035,8 @@ class MTSignalsModel(QAbstractItemModel):
                                 else:
                                     value = None
                                 fls[column_name] = 1
-                                logger.warning(f"Invalid date format: expected a relative timestamp when using pulses "
-                                               f"in the table row [{table_row}]")
+                                fls.warn(f"Invalid date format: expected a relative timestamp when using pulses "
+                                         f"in the table row [{table_row}]")
                             else:
                                 # keep value
                                 fls[column_name] = 0
@@ -636,144 +1047,29 @@ class MTSignalsModel(QAbstractItemModel):
                             if value <= out['StartTime'] or fls['StartTime'] == 1 or fls[column_name] == 1:
                                 fls[column_name] = 1
                                 fls['StartTime'] = 1
-                                logger.warning(f"Chronology error: EndTime must be later than the StartTime in the "
-                                               f"table row [{table_row}]")
+                                fls.warn(f"Chronology error: EndTime must be later than the StartTime in the "
+                                         f"table row [{table_row}]")
                             else:
                                 fls[column_name] = 0
                                 fls['StartTime'] = 0
                 else:
-                    if k == 'DataSource':  # Do not read default value when parsing an already filled in table
-                        value = get_value(inp, column_name, type_func)
-                        if value == '':
-                            fls[column_name] = 1
-                            logger.warning(f"Invalid datasource: the 'Datasource' field cannot be empty in the table "
-                                           f"row [{table_row}]")
-                        else:
-                            if value in self.data_sources:
-                                fls[column_name] = 0
-                            else:
-                                fls[column_name] = 1
-                                logger.warning(f"Invalid datasource: the value '{value}' is not found in the list of "
-                                               f"available datasources in the table row [{table_row}]")
-                    else:
-                        value = get_value(inp, column_name, type_func) or default_value
-
-                        # Checks of the different cases
-                        p = Parser()
-
-                        # Variable
-                        if column_name == 'Variable':
-                            fls[column_name] = 0
-
-                        # Stack
-                        elif column_name == 'Stack':
-                            if value == '':
-                                fls[column_name] = 0
-                            elif value in stack:
-                                fls[column_name] = 1
-                                logger.warning(
-                                    f"Invalid stack in table row [{table_row}]: "
-                                    f"Plot of type PlotContour or PlotXYWithSlider cannot be stacked, just PlotXY.\n"
-                                    f"Mixing different plot types in the same stack is not allowed.")
-                            else:
-                                if exp_stack.match(value):
-                                    fls[column_name] = 0
-                                else:
-                                    fls[column_name] = 1
-                                    logger.warning(f"Invalid stack: The stack identifier must be a numeric value in the"
-                                                   f" table row [{table_row}]")
-
-                        # Row Span - Col Span
-                        elif column_name == 'Row span' or column_name == 'Col span':
-                            if value <= 0:
-                                fls[column_name] = 1
-                                value = 1
-                                logger.warning(f"Invalid value for '{column_name}': the value must be greater than 0 in"
-                                               f" the table row [{table_row}]")
-                            elif value == 1:
-                                if inp[column_name] == '1' or inp[column_name] == '':
-                                    fls[column_name] = 0
-                                else:
-                                    fls[column_name] = 1
-                                    logger.warning(f"Invalid value for '{column_name}': the value must be numeric in "
-                                                   f"the table row [{table_row}]")
-                            elif value > 10:
-                                fls[column_name] = 1
-                                value = 1
-                                logger.warning(f"Invalid value for '{column_name}': the value exceeds the maximum limit"
-                                               f" of 10 in the table row [{table_row}]")
-                            else:
-                                # Keep value
-                                fls[column_name] = 0
-
-                        # Envelope
-                        elif column_name == 'Envelope':
-                            if value and inp[column_name] == '1':
-                                fls[column_name] = 0
-                            else:
-                                # In case of no envelope, just 0 or '' is considered valid
-                                if inp[column_name] == '0' or inp[column_name] == '':
-                                    fls[column_name] = 0
-                                else:
-                                    fls[column_name] = 1
-                                    logger.warning(f"Invalid envelope value: expected '0' or an empty string to disable"
-                                                   f" the envelope, or '1' to enable it in the table row [{table_row}]")
-
-                        # Alias
-                        elif column_name == 'Alias':
-                            if value != '':
-                                if value not in self.aliases:
-                                    self.aliases.append(value)
-                                    fls[column_name] = 0
-                                else:
-                                    # Repeated alias
-                                    fls[column_name] = 1
-                                    logger.warning(f"Invalid alias: the alias '{value}' is already present in the list "
-                                                   f"of aliases in the table row [{table_row}]")
-                            else:
-                                # Check if there is variable name
-                                if inp['Variable'] == "" and any(inp[exp] != "" for exp in ["x", "y", "z"]):
-                                    fls[column_name] = 1
-                                    logger.warning(
-                                        f"An alias must be specified when no variable is provided in order to"
-                                        f" perform the query correctly. Check the table row [{table_row}]")
-                                else:
-                                    fls[column_name] = 0
-
-                        # X - Y - Z
-                        elif column_name == 'x' or column_name == 'y' or column_name == 'z':
-                            try:
-                                p.set_expression(value)
-                                if p.is_valid:
-                                    fls[column_name] = 0
-                                else:
-                                    fls[column_name] = 1
-                                    logger.warning(f"Invalid '{column_name}' expression: the provided expression cannot"
-                                                   f" be evaluated correctly")
-                            except InvalidExpression:
-                                fls[column_name] = 1
-                                logger.warning(f"Invalid '{column_name}' expression: the provided expression cannot be "
-                                               f"evaluated correctly")
-
-                        # Plot Type
-                        elif column_name == 'Plot type':
-                            if value not in ['PlotXY', 'PlotContour', 'PlotXYWithSlider']:
-                                fls[column_name] = 1
-                                logger.warning(f"Invalid plot type: '{value}' is not a valid plot type. Expected"
-                                               f" 'PlotXY' or 'PlotContour' or 'PlotXYWithSlider'")
-                            else:
-                                fls[column_name] = 0
+                    # These cells are checked for the whole table at once by MTTableValidator
+                    value = get_value(inp, column_name, type_func)
+                    if field.key != 'DataSource':  # Do not read default value when parsing an already filled in table
+                        value = value or default_value
+                    if field.key in ('RowSpan', 'ColSpan') and not 0 < value <= MAX_SPAN:
+                        value = 1
 
                 out.update({column_name: value})
 
             # Check dependencies
-            dependencies = ParserHelper.get_dependencies([inp['x'], inp['y'], inp['z']])
-            s = self._table['Alias']
+            dependencies = expression_cache.dependencies([inp['x'], inp['y'], inp['z']])
             for val in dependencies:
-                if val != out['Alias'] and val in s.values:  # Only variables that are defined with an alias
-                    index = s[s == val].index[0]
+                rows = self.alias_rows(val)
+                if val != out['Alias'] and rows:  # Only variables that are defined with an alias
+                    index = rows[0]
                     # Search if there is an error in the corresponding row of the fails table
-                    if any(self._table_fails.loc[index].values > 0):
+                    if self._validation.has_errors(index):
                         for expr in ['x', 'y', 'z']:
                             marker_in_pos = out[expr].find(Parser.marker_in)
                             marker_out_pos = out[expr].find(Parser.marker_out)
@@ -789,7 +1085,8 @@ class MTSignalsModel(QAbstractItemModel):
                         # Checks if there is more than one pulseId to change de uid of the signal
                         if "uid" in out and len(v) > 1:
                             # append pulse nb to uid to make it unique
-                            serie['uid'] = str(uuid.uuid5(uuid.UUID(serie['uid']), member))
+                            serie['uid'] = str(uuid.uuid5(uuid.UUID(out['uid']), member))
+                            self._derived_uids[serie['uid']] = out['uid']
                         yield pd.Series(serie), fls
                     break
             else:
@@ -799,42 +1096,196 @@ class MTSignalsModel(QAbstractItemModel):
         """
         Sort the model by the given column index and order.
         Empty values always pushed to the bottom, rest by column as string.
+        Only the view order changes, rows keep their place in the storage, see `storage_index`.
         """
-        # Determine the column name from the DataFrame
-        col_name = self._table.columns[column]
         ascending = (order == Qt.SortOrder.AscendingOrder)
-
-        # Notify views that layout is about to change
+        current = np.arange(len(self._store)) if self._order is None else self._order
+
+        keys = self._sort_key(column)[current]
+        empty_flag = (keys == '').astype(int)
+        _, ranks = np.unique(keys, return_inverse=True)
+        if not ascending:
+            ranks = -ranks
+
+        # np.lexsort is stable and sorts by the last key first
+        self._set_order(current[np.lexsort((ranks, empty_flag))])
+
+    def _sort_key(self, column: int) -> np.ndarray:
+        """Column values as strings in storage order, computed once and kept up to date by the edits."""
+        keys = self._sort_keys.get(column)
+        if keys is None or keys.size != len(self._store):
+            keys = np.array([str(v) for v in self._store.column(column)], dtype=object)
+            self._sort_keys[column] = keys
+        return keys
+
+    def _cell_changed(self, row: int, column: int, value):
+        """Keep the sort keys and the text index in sync with a cell written to the storage."""
+        keys = self._sort_keys.get(column)
+        if keys is not None:
+            keys[row] = str(value)
+        if self._text_index is not None:
+            self._text_index.update(self._store.row_id(row), column, value)
+        if self._uid_rows is not None and self._store.columns[column] == self.ROWUID_COLNAME:
+            self._uid_rows = None
+        if self._alias_registry is not None and column in self._alias_columns():
+            self._register_aliases([row])
+
+    def _set_order(self, order: typing.Optional[np.ndarray]):
+        """Re-order the views, persistent indexes (selection, current cell) follow their rows."""
         self.layoutAboutToBeChanged.emit()
+        old_order = self._order
+        self._order, self._rank = order, None
+        persistent = self.persistentIndexList()
+        if persistent:
+            storage_rows = [idx.row() if old_order is None else int(old_order[idx.row()]) for idx in persistent]
+            self.changePersistentIndexList(persistent, [self.storage_index(row, idx.column())
+                                                        for row, idx in zip(storage_rows, persistent)])
+        self.layoutChanged.emit()
 
-        # Convert everything to string before flag (homogenize)
-        col_as_str = self._table[col_name].astype(str)
-        self._table['_empty_flag'] = (col_as_str.isna() | (col_as_str == '')).astype(int)
+    def _clear_sort(self):
+        if self._order is not None:
+            self._set_order(None)
+
+    def _get_text_index(self) -> MTTextIndex:
+        if self._text_index is None:
+            self._text_index = MTTextIndex()
+            row_ids = self._store.row_ids().tolist()
+            for col in range(len(self._store.columns)):
+                self._text_index.update_column(col, row_ids, self._store.column(col))
+        return self._text_index
+
+    def _index_rows(self, rows: np.ndarray):
+        """Add rows that were just written in bulk to the uid and text indexes, if they were built already."""
+        if not len(rows):
+            return
+        if rows.min() >= len(self._store) - len(rows):
+            # Appended, no row moved
+            if self._uid_rows is not None:
+                uids = self._store.column(self.ROWUID_COLNAME)[rows].tolist()
+                self._uid_rows.update(zip(uids, rows.tolist()))
+            if self._id_rows is not None:
+                self._id_rows.update(zip(self._store.row_ids()[rows].tolist(), rows.tolist()))
+        else:
+            self._uid_rows, self._id_rows = None, None
+        if self._alias_registry is not None:
+            self._register_aliases(rows)
+        if self._text_index is None:
+            return
+        row_ids = self._store.row_ids()[rows].tolist()
+        for col in range(len(self._store.columns)):
+            column = self._store.column(col)
+            self._text_index.update_column(col, row_ids, column[rows])
 
-        self._table.sort_values(
-            by=['_empty_flag', col_name],
-            ascending=[True, ascending],
-            inplace=True,
-            ignore_index=True
-        )
+    def row_of_uid(self, uid: str) -> typing.Optional[int]:
+        """
+        Storage row of the row with the given uid, or None. Also resolves the uids of the signals that
+        are created for every pulse of a row. See `storage_index` for the matching model index.
+        """
+        if self._uid_rows is None:
+            uids = self._store.column(self.ROWUID_COLNAME).tolist()
+            # The first row wins on duplicates, as a column scan would.
+            self._uid_rows = {uid: row for row, uid in reversed(list(enumerate(uids))) if uid}
+        row = self._uid_rows.get(uid)
+        if row is None and uid in self._derived_uids:
+            row = self._uid_rows.get(self._derived_uids[uid])
+        return row
+
+    def _rows_by_id(self) -> typing.Dict[int, int]:
+        if self._id_rows is None:
+            self._id_rows = {row_id: row for row, row_id in enumerate(self._store.row_ids().tolist())}
+        return self._id_rows
+
+    def row_id(self, row: int) -> int:
+        """Stable id of a storage row, it does not change when rows are inserted, removed or sorted."""
+        return self._store.row_id(row)
+
+    def row_of_id(self, row_id: int) -> typing.Optional[int]:
+        """Storage row of a row id, or None when the row was removed."""
+        return self._rows_by_id().get(row_id)
 
-        self._table.drop(columns=['_empty_flag'], inplace=True)
-        self.layoutChanged.emit()
+    @property
+    def alias_registry(self) -> MTAliasRegistry:
+        """Aliases of the table and references between rows. Rows are identified by row id, see `row_of_id`."""
+        if self._alias_registry is None:
+            self._alias_registry = MTAliasRegistry()
+            self._register_aliases(range(len(self._store)))
+        return self._alias_registry
+
+    def _alias_columns(self) -> typing.List[int]:
+        return [self._store.loc(self._compiled.column_name(key)) for key in self.ALIAS_KEYS]
+
+    def _register_aliases(self, rows: typing.Iterable[int]):
+        columns = self._alias_columns()
+        for row in rows:
+            alias, variable, x, y, z = (self._store.get(row, col) for col in columns)
+            self._alias_registry.update(self._store.row_id(row), alias, variable, (x, y, z))
+
+    def alias_rows(self, alias: str) -> typing.List[int]:
+        """Storage rows that define `alias`, in storage order."""
+        rows = self._rows_by_id()
+        return sorted(rows[row_id] for row_id in self.alias_registry.rows(alias) if row_id in rows)
+
+    def find(self, pattern: str, regex: bool = False,
+             columns: typing.Optional[typing.Container[int]] = None) -> typing.List[QModelIndex]:
+        """
+        Indexes of the cells that contain `pattern`, or a match of the regular expression `pattern`.
+        Cells are ordered column by column, then by view row. Raises re.error for an invalid regular expression.
+        In virtual mode, the remaining rows are fetched when a match lies beyond them.
+        """
+        matches = self._get_text_index().search(pattern, regex, columns)
+        if not matches:
+            return []
+        rows = self._rows_by_id()
+        cells = sorted((col, self._to_view(rows[row_id])) for row_id, col in matches if row_id in rows)
+        if self._fetched is not None and max(row for _, row in cells) >= self._fetched:
+            self.fetch_all()
+        return [self.createIndex(row, col) for col, row in cells]
+
+    def replace(self, indexes: typing.Iterable[QModelIndex], pattern: str, replacement: str,
+                regex: bool = False) -> int:
+        """
+        Replace `pattern` by `replacement` in the given cells, column by column in a single transaction.
+        Non-editable cells are left untouched. Returns the number of cells that changed.
+        """
+        if not pattern:
+            return 0
+        rows_per_col = defaultdict(set)
+        for index in indexes:
+            if index.isValid() and self.flags(index) & Qt.ItemFlag.ItemIsEditable:
+                rows_per_col[index.column()].add(self._to_storage(index.row()))
+
+        changed = 0
+        with self.transaction() as transaction:
+            for col, rows in rows_per_col.items():
+                rows = np.fromiter(sorted(rows), dtype=np.int64, count=len(rows))
+                old_values = pd.Series(self._store.column(col)[rows], dtype=object)
+                is_text = old_values.map(lambda v: isinstance(v, str))
+                new_values = old_values.copy()
+                new_values[is_text] = old_values[is_text].astype(str).str.replace(pattern, replacement, regex=regex)
+                # The replaced cells are stored as if they were set, without filtering
+                replaced = new_values != old_values
+                col_name = self._store.columns[col]
+                new_values[replaced] = new_values[replaced].map(lambda v: self._normalize(col_name, v, filtered=False))
+                mask = (new_values != old_values).to_numpy()
+                for row, old_value, new_value in zip(rows[mask].tolist(), old_values[mask], new_values[mask]):
+                    self._store.set(row, col, new_value)
+                    self._cell_changed(row, col, new_value)
+                    transaction.touch(self._to_view(row), col)
+                    transaction.record(self._store.row_id(row), col, old_value, new_value)
+                    changed += 1
+        return changed
 
     def export_information(self):
         # Discard if the stack is empty or processing columns are used
-        table = self._table[
-            (self._table['Stack'] != "") &
-            (self._table[['x', 'y', 'z']] == "").all(axis=1) &
-            (self._table[['StartTime', 'EndTime']] == "").all(axis=1)
+        df = self._store.to_dataframe()
+        table = df[
+            (df['Stack'] != "") &
+            (df[['x', 'y', 'z']] == "").all(axis=1) &
+            (df[['StartTime', 'EndTime']] == "").all(axis=1)
             ]
 
         # Filter column variable for processing due to for the moment is discarded
-        p = Parser()
-        mask = []
-        for val in table['Variable']:
-            p.set_expression(val)
-            mask.append(not p.is_valid)
+        mask = [not expression_cache.is_valid(val) for val in table['Variable']]
 
         filter_table = table[mask]
 
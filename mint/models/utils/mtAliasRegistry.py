@@ -0,0 +1,129 @@
+# Description: Registry of the aliases defined in the signals table and of the references between rows.
+#              Rows are keyed by row id, so that the registry survives row insertions, removals and sorting.
+#              It is updated one row at a time when an alias, a variable or an expression changes, which keeps
+#              duplicate detection and the dependency edges of the build graph free of table scans.
+
+from collections import defaultdict
+import functools
+import re
+import typing
+
+from iplotProcessing.tools import Parser
+
+_NAME_PATTERN = re.compile(re.escape(Parser.marker_in) + r'(.*?)' + re.escape(Parser.marker_out))
+
+
+@functools.lru_cache(maxsize=4096)
+def _referenced_names(expression: str) -> typing.FrozenSet[str]:
+    return frozenset(_NAME_PATTERN.findall(expression))
+
+
+def referenced_names(expression: str) -> typing.FrozenSet[str]:
+    """Names referenced with ${name} in an expression."""
+    if not expression or not isinstance(expression, str):
+        return frozenset()
+    return _referenced_names(expression)
+
+
+class MTAliasRegistry:
+    """
+    alias -> rows map with duplicate detection, and forward/reverse edges between rows and the names they use.
+    """
+
+    def __init__(self):
+        self._alias = dict()  # type: typing.Dict[int, str]
+        self._rows = defaultdict(set)  # type: typing.Dict[str, typing.Set[int]]
+        self._duplicates = set()  # type: typing.Set[str]
+        # Names used by the x, y and z expressions, other than the row's own alias and 'self'.
+        self._expr_names = dict()  # type: typing.Dict[int, typing.FrozenSet[str]]
+        # Names used by the variable.
+        self._var_names = dict()  # type: typing.Dict[int, typing.FrozenSet[str]]
+        self._dependents = defaultdict(set)  # type: typing.Dict[str, typing.Set[int]]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, alias: str) -> bool:
+        return alias in self._rows
+
+    def clear(self):
+        self._alias.clear()
+        self._rows.clear()
+        self._duplicates.clear()
+        self._expr_names.clear()
+        self._var_names.clear()
+        self._dependents.clear()
+
+    def update(self, row_id: int, alias: str, variable: str, expressions: typing.Iterable[str]):
+        """Register the alias, variable and x, y, z expressions of a row, replacing the previous ones."""
+        self.discard_rows([row_id])
+        alias = alias if isinstance(alias, str) else ''
+        if alias:
+            self._alias[row_id] = alias
+            rows = self._rows[alias]
+            rows.add(row_id)
+            if len(rows) > 1:
+                self._duplicates.add(alias)
+
+        expr_names = set()
+        for expression in expressions:
+            expr_names |= referenced_names(expression)
+        expr_names.discard(alias)
+        expr_names.discard('self')
+        var_names = referenced_names(variable)
+        if expr_names:
+            self._expr_names[row_id] = frozenset(expr_names)
+        if var_names:
+            self._var_names[row_id] = frozenset(var_names)
+        for name in expr_names | var_names:
+            self._dependents[name].add(row_id)
+
+    def discard_rows(self, row_ids: typing.Iterable[int]):
+        for row_id in row_ids:
+            alias = self._alias.pop(row_id, None)
+            if alias is not None:
+                rows = self._rows[alias]
+                rows.discard(row_id)
+                if len(rows) < 2:
+                    self._duplicates.discard(alias)
+                if not rows:
+                    del self._rows[alias]
+            for name in self._expr_names.pop(row_id, frozenset()) | self._var_names.pop(row_id, frozenset()):
+                dependents = self._dependents[name]
+                dependents.discard(row_id)
+                if not dependents:
+                    del self._dependents[name]
+
+    def alias(self, row_id: int) -> str:
+        return self._alias.get(row_id, '')
+
+    def rows(self, alias: str) -> typing.Set[int]:
+        """Ids of the rows that define `alias`."""
+        return set(self._rows.get(alias, ()))
+
+    def is_duplicate(self, alias: str) -> bool:
+        return alias in self._duplicates
+
+    def duplicates(self) -> typing.Set[str]:
+        return set(self._duplicates)
+
+    def is_simple(self, row_id: int) -> bool:
+        """True when the row uses no other row: its expressions only refer to itself and its variable to no alias."""
+        if row_id in self._expr_names:
+            return False
+        return not any(name in self._rows for name in self._var_names.get(row_id, ()))
+
+    def references(self, row_id: int) -> typing.Set[str]:
+        """Names a row depends on. The names of the variable count only when the row is not simple."""
+        names = set(self._expr_names.get(row_id, ()))
+        if not self.is_simple(row_id):
+            names |= self._var_names.get(row_id, frozenset())
+        return names
+
+    def dependencies(self, row_id: int) -> typing.Set[str]:
+        """Aliases defined in the table that a row depends on."""
+        return {name for name in self.references(row_id) if name in self._rows}
+
+    def dependents(self, alias: str) -> typing.Set[int]:
+        """Ids of the rows whose expressions or variable use `alias`."""
+        return set(self._dependents.get(alias, ()))
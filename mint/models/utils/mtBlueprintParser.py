@@ -19,6 +19,8 @@ def parse_raw_blueprint(blueprint: dict) -> dict:
     for k, v in blueprint_out.items():
         if k.startswith('$'):
             continue
+        if callable(v.get('type')):
+            continue  # Parsed already
         if v.get('type_name'):
             type_name = v.get('type_name')
             parts = type_name.split('.')
@@ -53,6 +55,8 @@ def get_column_names(blueprint: dict) -> typing.Iterator[str]:
 def get_column_name(blueprint: dict, key: str) -> str:
     if key.startswith('$'):
         return key
+    if isinstance(blueprint, CompiledBlueprint):
+        return blueprint.column_name(key)
     return blueprint.get(key).get('label') or key
 
 
@@ -88,6 +92,8 @@ def get_code_names(blueprint: dict, predicate_keys=None):
 
 
 def construct_signal(blueprint: dict, signal_class: type, **signal_params) -> Signal:
+    if isinstance(blueprint, CompiledBlueprint):
+        return blueprint.construct_signal(signal_class, **signal_params)
     for k, v in blueprint.items():
         if k.startswith('$'):
             continue
@@ -117,6 +123,8 @@ def construct_params_from_signal(blueprint: dict, sig: Signal) -> dict:
 
 
 def construct_params_from_series(blueprint: dict, row: pd.Series) -> dict:
+    if isinstance(blueprint, CompiledBlueprint):
+        return blueprint.construct_params_from_series(row)
     params = {}
     for k, v in blueprint.items():
         if k.startswith('$'):
@@ -135,3 +143,100 @@ def adjust_dataframe(blueprint: dict, df: pd.DataFrame):
     for col_name in get_column_names(blueprint):
         if col_name not in df.columns:
             df[col_name] = [''] * df.count(1).index.size
+
+
+class BlueprintField:
+    """
+    One column of a compiled blueprint.
+    """
+    __slots__ = ('key', 'column_name', 'code_name', 'position', 'type', 'default', 'override', 'export', 'no_export',
+                 'no_construct')
+
+    def __init__(self, key: str, spec: dict, position: int):
+        self.key = key
+        self.column_name = spec.get('label') or key
+        self.code_name = spec.get('code_name')
+        # Position among the exported columns, -1 for the columns that are not exported
+        self.position = position
+        self.type = spec.get('type') if callable(spec.get('type')) else None
+        self.default = spec.get('default')
+        self.override = bool(spec.get('override'))
+        self.export = bool(spec.get('export'))
+        self.no_export = bool(spec.get('no_export'))
+        self.no_construct = bool(spec.get('no_construct'))
+
+
+class CompiledBlueprint:
+    """
+    A parsed blueprint with its lookups computed once: key <-> column name <-> code name, column positions,
+    type callables, defaults and the override/no_construct sets.
+    The raw blueprint stays the reference for export, `set_default` updates both.
+    The module functions above accept a CompiledBlueprint in place of the raw dictionary.
+    """
+    __slots__ = ('raw', 'fields', 'column_names', 'code_names', 'override_keys', 'export_keys', 'no_construct',
+                 '_by_key', '_by_column', '_by_code_name', '_series_params')
+
+    def __init__(self, blueprint: dict):
+        # Types are resolved in place, the raw blueprint is shared with its owner
+        parse_raw_blueprint(blueprint)
+        self.raw = blueprint
+        fields = []
+        position = 0
+        for k, v in self.raw.items():
+            if k.startswith('$'):
+                continue
+            fields.append(BlueprintField(k, v, -1 if v.get('no_export') else position))
+            position += not v.get('no_export')
+        self.fields = tuple(fields)  # type: typing.Tuple[BlueprintField, ...]
+        self.column_names = tuple(f.column_name for f in fields if not f.no_export)
+        self.code_names = tuple(f.code_name for f in fields)
+        self.override_keys = tuple(f.key for f in fields if f.override)
+        self.export_keys = tuple(f.key for f in fields if f.export)
+        self.no_construct = frozenset(f.code_name for f in fields if f.no_construct)
+        self._by_key = {f.key: f for f in fields}
+        self._by_column = {f.column_name: f for f in fields}
+        self._by_code_name = {f.code_name: f for f in fields}
+        self._series_params = tuple((f.column_name, f.code_name) for f in fields)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_key
+
+    def field(self, key: str) -> BlueprintField:
+        return self._by_key[key]
+
+    def field_of_column(self, column_name: str) -> typing.Optional[BlueprintField]:
+        return self._by_column.get(column_name)
+
+    def field_of_code_name(self, code_name: str) -> typing.Optional[BlueprintField]:
+        return self._by_code_name.get(code_name)
+
+    def column_name(self, key: str) -> str:
+        if key.startswith('$'):
+            return key
+        return self._by_key[key].column_name
+
+    def position(self, key: str) -> int:
+        return self._by_key[key].position
+
+    def default(self, key: str):
+        return self._by_key[key].default
+
+    def set_default(self, key: str, value):
+        self._by_key[key].default = value
+        self.raw[key]['default'] = value
+
+    def construct_params_from_series(self, row: pd.Series) -> dict:
+        params = {}
+        for column_name, code_name in self._series_params:
+            try:
+                params[code_name] = row[column_name]
+            except KeyError:
+                continue
+        return params
+
+    def construct_signal(self, signal_class: type, **signal_params) -> Signal:
+        for code_name in self.no_construct:
+            signal_params.pop(code_name, None)
+        # Remove any extra keys not expected by the signal class, like 'comment'
+        signal_params.pop('comment', None)
+        return signal_class(**signal_params)
@@ -0,0 +1,139 @@
+# Description: Dependency graph between the rows of the signals table.
+#              A row that uses the alias of another row is built after it. The graph gives the order in which the
+#              rows are built, the levels of rows that do not depend on each other, and every cycle with its rows.
+#              All the walks are iterative and linear in the number of rows and edges, long alias chains do not
+#              run into the recursion limit.
+
+import typing
+
+
+class MTBuildScheduler:
+    """
+    row -> rows it depends on, in insertion order.
+    """
+
+    def __init__(self):
+        self._dependencies = dict()  # type: typing.Dict[int, typing.List[int]]
+
+    def __len__(self) -> int:
+        return len(self._dependencies)
+
+    def __contains__(self, row: int) -> bool:
+        return row in self._dependencies
+
+    @property
+    def rows(self) -> typing.List[int]:
+        return list(self._dependencies)
+
+    def add_row(self, row: int):
+        self._dependencies.setdefault(row, [])
+
+    def add_edge(self, row: int, dependency: int):
+        """`row` uses `dependency`, the dependency is registered first."""
+        self.add_row(dependency)
+        dependencies = self._dependencies.setdefault(row, [])
+        if dependency not in dependencies:
+            dependencies.append(dependency)
+
+    def dependencies(self, row: int) -> typing.List[int]:
+        return list(self._dependencies.get(row, ()))
+
+    def _edges(self, row: int) -> typing.List[int]:
+        return self._dependencies.get(row, [])
+
+    def cycles(self) -> typing.List[typing.List[int]]:
+        """
+        Sorted rows of every strongly connected component with more than one row or with a self reference.
+        """
+        index = dict()
+        low = dict()
+        on_stack = set()
+        stack = []
+        cycles = []
+        counter = 0
+
+        for root in self._dependencies:
+            if root in index:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._edges(root)))]
+            while work:
+                row, edges = work[-1]
+                for dependency in edges:
+                    if dependency not in index:
+                        index[dependency] = low[dependency] = counter
+                        counter += 1
+                        stack.append(dependency)
+                        on_stack.add(dependency)
+                        work.append((dependency, iter(self._edges(dependency))))
+                        break
+                    elif dependency in on_stack:
+                        low[row] = min(low[row], index[dependency])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[row])
+                    if low[row] == index[row]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == row:
+                                break
+                        if len(component) > 1 or row in self._edges(row):
+                            cycles.append(sorted(component))
+        return sorted(cycles)
+
+    def levels(self) -> typing.List[typing.List[int]]:
+        """
+        Kahn's ordering grouped by level: the rows of a level only depend on rows of the previous levels, so the rows
+        of a level can be built side by side. Rows in a cycle, and the rows using them, are left out.
+        """
+        remaining = {row: len(edges) for row, edges in self._dependencies.items()}
+        dependents = {row: [] for row in self._dependencies}
+        for row, edges in self._dependencies.items():
+            for dependency in edges:
+                dependents[dependency].append(row)
+
+        position = {row: i for i, row in enumerate(self._dependencies)}
+        levels = []
+        current = [row for row, count in remaining.items() if count == 0]
+        while current:
+            levels.append(current)
+            following = []
+            for row in current:
+                for dependent in dependents[row]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        following.append(dependent)
+            current = sorted(following, key=position.get)
+        return levels
+
+    def order(self) -> typing.List[int]:
+        """
+        Every row after the rows it depends on, otherwise in the order the rows were registered.
+        Rows in a cycle are placed once their other dependencies are.
+        """
+        done = set()
+        order = []
+        for root in self._dependencies:
+            if root in done:
+                continue
+            done.add(root)
+            work = [(root, iter(self._edges(root)))]
+            while work:
+                row, edges = work[-1]
+                for dependency in edges:
+                    if dependency not in done:
+                        done.add(dependency)
+                        work.append((dependency, iter(self._edges(dependency))))
+                        break
+                else:
+                    work.pop()
+                    order.append(row)
+        return order
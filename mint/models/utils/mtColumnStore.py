@@ -0,0 +1,375 @@
+# Description: A compact, array backed columnar store for the signals table.
+#              Every column is kept in its own numpy array. Low-cardinality columns are interned, i.e, the array holds
+#              small integer codes into a pool of distinct values. Cell access is O(1).
+#              Bulk insertion/removal of row blocks uses a transient gap buffer, such that any number of blocks
+#              costs a single pass over the table.
+#              Snapshots share the column arrays with the store until the next mutation (copy-on-write).
+
+import typing
+
+import numpy as np
+import pandas as pd
+
+
+class _Column:
+    __slots__ = ('name', 'data', 'pool', 'codes')
+
+    def __init__(self, name: str, capacity: int, interned: bool):
+        self.name = name
+        if interned:
+            # code 0 is always the empty string.
+            self.pool = ['']
+            self.codes = {'': 0}
+            self.data = np.zeros(capacity, dtype=np.int32)
+        else:
+            self.pool = None
+            self.codes = None
+            self.data = np.full(capacity, '', dtype=object)
+
+    def encode(self, value):
+        if self.pool is None:
+            return value
+        try:
+            return self.codes[value]
+        except KeyError:
+            code = len(self.pool)
+            self.pool.append(value)
+            self.codes[value] = code
+            return code
+        except TypeError:
+            # un-hashable values are not expected in the table, store their string representation.
+            return self.encode(str(value))
+
+    def encode_many(self, values: typing.Iterable) -> np.ndarray:
+        if self.pool is None:
+            return np.asarray(values, dtype=object)
+        return np.fromiter((self.encode(v) for v in values), dtype=np.int32)
+
+    def decode_many(self, raw: np.ndarray) -> np.ndarray:
+        if self.pool is None:
+            return raw
+        return np.asarray(self.pool, dtype=object)[raw]
+
+
+class MTColumnStore:
+    """
+    Stores a table as one array per column.
+    Rows are addressed by their position in [0, len(store)).
+
+    During a bulk insertion/removal the storage holds a gap of `_gap_len` unused rows at `_gap_at`.
+    Only `get`, `set`, `row` and `__len__` are meant to be used while a gap is open, i.e, from the callbacks.
+    """
+
+    def __init__(self, columns: typing.Sequence[str], interned: typing.Iterable[str] = (), capacity: int = 16):
+        interned = set(interned)
+        self._capacity = max(capacity, 1)
+        self._size = 0
+        self._gap_at = 0
+        self._gap_len = 0
+        # True while a snapshot or a data frame refers to the current column arrays.
+        self._shared = False
+        self._columns = [_Column(name, self._capacity, name in interned) for name in columns]
+        self._names = tuple(columns)
+        self._locs = {name: i for i, name in enumerate(self._names)}
+        # Row-aligned 2D arrays that follow the rows when these are inserted, removed or re-ordered.
+        self._matrices = dict()
+        # Every row receives a unique id on insertion. It is kept when rows move around.
+        self._next_id = 0
+        self.attach_matrix('_id', 1, np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def columns(self) -> typing.Tuple[str]:
+        return self._names
+
+    @property
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def loc(self, name: str) -> int:
+        return self._locs[name]
+
+    def is_interned(self, col: int) -> bool:
+        return self._columns[col].pool is not None
+
+    def get(self, row: int, col: int):
+        if row >= self._size:
+            raise IndexError(f"Row {row} is out of bounds for a table with {self._size} rows")
+        if row >= self._gap_at:
+            row += self._gap_len
+        column = self._columns[col]
+        value = column.data[row]
+        return value if column.pool is None else column.pool[value]
+
+    def set(self, row: int, col: int, value):
+        if row >= self._size:
+            raise IndexError(f"Row {row} is out of bounds for a table with {self._size} rows")
+        if row >= self._gap_at:
+            row += self._gap_len
+        if self._shared:
+            self._detach()
+        column = self._columns[col]
+        column.data[row] = column.encode(value)
+
+    def row(self, row: int) -> dict:
+        return {column.name: self.get(row, c) for c, column in enumerate(self._columns)}
+
+    def column(self, col: typing.Union[int, str], start: int = 0, stop: int = None) -> np.ndarray:
+        """Values of a column as an object array. Plain columns return a view on the storage, do not modify it."""
+        if isinstance(col, str):
+            col = self._locs[col]
+        stop = self._size if stop is None else min(stop, self._size)
+        column = self._columns[col]
+        return column.decode_many(column.data[start:stop])
+
+    def assign(self, col: typing.Union[int, str], values: typing.Sequence, start: int = 0):
+        """Bulk assignment of consecutive cells in a column starting at row `start`."""
+        if isinstance(col, str):
+            col = self._locs[col]
+        column = self._columns[col]
+        encoded = column.encode_many(values)
+        if start + encoded.size > self._size:
+            raise IndexError(f"Cannot assign {encoded.size} values from row {start} in a table "
+                             f"with {self._size} rows")
+        if self._shared:
+            self._detach()
+        column.data[start:start + encoded.size] = encoded
+
+    def attach_matrix(self, name: str, width: int, dtype=np.int8):
+        """Attach a zero initialized matrix with `width` columns per row."""
+        matrix = np.zeros((self._capacity, width), dtype=dtype)
+        self._matrices[name] = matrix
+        return matrix
+
+    def row_id(self, row: int) -> int:
+        return int(self.matrix_row('_id', row)[0])
+
+    def row_ids(self, start: int = 0, stop: int = None) -> np.ndarray:
+        return self._matrices['_id'][start:self._size if stop is None else min(stop, self._size), 0]
+
+    def matrix(self, name: str) -> np.ndarray:
+        """A view on the rows of an attached matrix. Do not keep it across insertions/removals."""
+        return self._matrices[name][:self._size]
+
+    def matrix_row(self, name: str, row: int) -> np.ndarray:
+        if row >= self._size:
+            raise IndexError(f"Row {row} is out of bounds for a table with {self._size} rows")
+        if row >= self._gap_at:
+            row += self._gap_len
+        return self._matrices[name][row]
+
+    def non_empty_rows(self, columns: typing.Iterable[int]) -> np.ndarray:
+        """A boolean mask of rows where at least one of the given columns holds a truthy value."""
+        mask = np.zeros(self._size, dtype=bool)
+        for col in columns:
+            column = self._columns[col]
+            raw = column.data[:self._size]
+            if column.pool is None:
+                mask |= raw.astype(bool)
+            else:
+                mask |= np.fromiter((bool(v) for v in column.pool), dtype=bool, count=len(column.pool))[raw]
+        return mask
+
+    def _reserve(self, size: int):
+        if size <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+        for column in self._columns:
+            grown = np.zeros(capacity, dtype=column.data.dtype) if column.pool is not None else \
+                np.full(capacity, '', dtype=object)
+            grown[:self._size] = column.data[:self._size]
+            column.data = grown
+        for name, matrix in self._matrices.items():
+            grown = np.zeros((capacity, matrix.shape[1]), dtype=matrix.dtype)
+            grown[:self._size] = matrix[:self._size]
+            self._matrices[name] = grown
+        self._capacity = capacity
+
+    def _move(self, src: int, dst: int, count: int):
+        """Move `count` physical rows from `src` to `dst`. The ranges may overlap."""
+        if count <= 0 or src == dst:
+            return
+        for column in self._columns:
+            column.data[dst:dst + count] = column.data[src:src + count]
+        for matrix in self._matrices.values():
+            matrix[dst:dst + count] = matrix[src:src + count]
+
+    def _fill(self, start: int, count: int, values: typing.Dict[str, typing.Any] = None):
+        values = values or dict()
+        for column in self._columns:
+            value = values.get(column.name, '')
+            if isinstance(value, (list, tuple, np.ndarray, pd.Series)):
+                column.data[start:start + count] = column.encode_many(value)
+            else:
+                column.data[start:start + count] = column.encode(value)
+        for matrix in self._matrices.values():
+            matrix[start:start + count] = 0
+        self._matrices['_id'][start:start + count, 0] = np.arange(self._next_id, self._next_id + count)
+        self._next_id += count
+
+    def insert_rows(self, row: int, count: int, values: typing.Dict[str, typing.Any] = None):
+        """
+        Insert `count` rows before `row`. New cells are empty strings unless `values` maps a column name
+        to a scalar or to a sequence of `count` values.
+        """
+        row = min(max(row, 0), self._size)
+        self.insert_blocks([(row, count)], [values])
+
+    def insert_blocks(self, blocks: typing.Sequence[typing.Tuple[int, int]],
+                      values: typing.Sequence[typing.Dict[str, typing.Any]] = None,
+                      begin: typing.Callable[[int, int], None] = None, end: typing.Callable[[], None] = None):
+        """
+        Insert several blocks of rows in one pass.
+        `blocks` is a sequence of (row, count) sorted by row, where `row` refers to the table before the insertion.
+        `values` holds an optional mapping per block, see `insert_rows`.
+        `begin(row, count)` and `end()` are invoked around the insertion of every block. At that time,
+        `row` is the position of the block in the table as it is seen from the callbacks.
+        """
+        values = values or [None] * len(blocks)
+        blocks = [(row, count, vals) for (row, count), vals in zip(blocks, values) if count > 0]
+        if not blocks:
+            return
+        if blocks[0][0] < 0 or blocks[-1][0] > self._size:
+            raise IndexError(f"Cannot insert rows beyond [0, {self._size}]")
+        total = sum(count for _, count, _ in blocks)
+        first = blocks[0][0]
+        if self._shared:
+            self._detach()
+        self._reserve(self._size + total)
+
+        # Open a gap big enough for all the blocks in front of the first one.
+        self._move(first, first + total, self._size - first)
+        self._gap_at, self._gap_len = first, total
+        consumed = first
+        try:
+            for row, count, vals in blocks:
+                # Bring the untouched rows in front of the gap.
+                self._move(self._gap_at + self._gap_len, self._gap_at, row - consumed)
+                self._gap_at += row - consumed
+                consumed = row
+                if begin is not None:
+                    begin(self._gap_at, count)
+                self._fill(self._gap_at, count, vals)
+                self._gap_at += count
+                self._gap_len -= count
+                self._size += count
+                if end is not None:
+                    end()
+        finally:
+            self._close_gap()
+
+    def remove_rows(self, row: int, count: int):
+        self.remove_blocks([(row, count)])
+
+    def remove_blocks(self, blocks: typing.Sequence[typing.Tuple[int, int]],
+                      begin: typing.Callable[[int, int], None] = None, end: typing.Callable[[], None] = None):
+        """
+        Remove several blocks of rows in one pass.
+        `blocks` is a sequence of disjoint (row, count) sorted by row, where `row` refers to the table
+        before the removal. The callbacks behave as described in `insert_blocks`.
+        """
+        blocks = [(row, count) for row, count in blocks if count > 0]
+        if not blocks:
+            return
+        for row, count in blocks:
+            if row < 0 or row + count > self._size:
+                raise IndexError(f"Cannot remove rows [{row}, {row + count}) from a table with {self._size} rows")
+        if self._shared:
+            self._detach()
+
+        self._gap_at, self._gap_len = blocks[0][0], 0
+        consumed = blocks[0][0]
+        try:
+            for row, count in blocks:
+                # Bring the kept rows in front of the gap.
+                self._move(self._gap_at + self._gap_len, self._gap_at, row - consumed)
+                self._gap_at += row - consumed
+                consumed = row + count
+                if begin is not None:
+                    begin(self._gap_at, count)
+                self._gap_len += count
+                self._size -= count
+                if end is not None:
+                    end()
+        finally:
+            self._close_gap()
+
+    def _close_gap(self):
+        if self._gap_len:
+            self._move(self._gap_at + self._gap_len, self._gap_at, self._size - self._gap_at)
+            # Release the references held by the vacated rows.
+            for column in self._columns:
+                column.data[self._size:self._size + self._gap_len] = 0 if column.pool is not None else ''
+            for matrix in self._matrices.values():
+                matrix[self._size:self._size + self._gap_len] = 0
+        self._gap_at, self._gap_len = 0, 0
+
+    def take(self, order: np.ndarray):
+        """Re-order the rows in place such that new row `i` is the old row `order[i]`."""
+        if self._shared:
+            self._detach()
+        for column in self._columns:
+            column.data[:self._size] = column.data[:self._size][order]
+        for matrix in self._matrices.values():
+            matrix[:self._size] = matrix[:self._size][order]
+
+    def _detach(self):
+        """Stop sharing the column arrays with the snapshots and the data frames."""
+        for column in self._columns:
+            column.data = column.data.copy()
+        self._shared = False
+
+    def snapshot(self, stop: int = None) -> 'MTTableSnapshot':
+        """An immutable view of the rows [0, stop). It costs nothing until the store is modified."""
+        stop = self._size if stop is None else max(min(stop, self._size), 0)
+        self._shared = True
+        return MTTableSnapshot(self._names, [(column.data[:stop], None if column.pool is None else tuple(column.pool))
+                                             for column in self._columns])
+
+    def clear(self):
+        self.remove_rows(0, self._size)
+
+    def to_dataframe(self, start: int = 0, stop: int = None) -> pd.DataFrame:
+        """
+        The rows [start, stop) as a data frame. Plain columns are read-only views on the storage, only the interned
+        ones are decoded. Like a snapshot, the frame costs nothing until the store is modified.
+        """
+        stop = self._size if stop is None else min(stop, self._size)
+        index = pd.RangeIndex(start, max(start, stop))
+        self._shared = True
+        columns = dict()
+        for c, name in enumerate(self._names):
+            values = self.column(c, start, stop).view()
+            values.flags.writeable = False
+            columns[name] = pd.Series(values, index=index, dtype=object, copy=False)
+        return pd.DataFrame(columns, columns=list(self._names), copy=False)
+
+
+class MTTableSnapshot:
+    """
+    Immutable rows of a column store at a given time. Safe to read from another thread.
+    """
+
+    def __init__(self, names: typing.Tuple[str], columns: typing.List[typing.Tuple[np.ndarray, tuple]]):
+        self._names = names
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return self._columns[0][0].size if self._columns else 0
+
+    @property
+    def columns(self) -> typing.Tuple[str]:
+        return self._names
+
+    def column(self, col: typing.Union[int, str]) -> np.ndarray:
+        if isinstance(col, str):
+            col = self._names.index(col)
+        data, pool = self._columns[col]
+        return data if pool is None else np.asarray(pool, dtype=object)[data]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame({name: self.column(c) for c, name in enumerate(self._names)}, columns=list(self._names))
@@ -0,0 +1,95 @@
+# Description: Edit transactions and the undo/redo journal of the signals table.
+#              A transaction collects the touched cells of a group of edits, such that the model reports them with
+#              a handful of rectangles at commit. The journal keeps only the (row id, column, old, new) diffs.
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+import typing
+
+# (top, left, bottom, right)
+Rectangle = typing.Tuple[int, int, int, int]
+# (row id, column, old value, new value)
+CellChange = typing.Tuple[int, int, typing.Any, typing.Any]
+
+
+@dataclass
+class MTEditTransaction:
+    journal: bool = True
+    cells: typing.Set[typing.Tuple[int, int]] = field(default_factory=set)
+    changes: typing.List[CellChange] = field(default_factory=list)
+
+    def touch(self, row: int, col: int):
+        self.cells.add((row, col))
+
+    def record(self, row_id: int, col: int, old, new):
+        if self.journal and old != new:
+            self.changes.append((row_id, col, old, new))
+
+
+def coalesce_cells(cells: typing.Iterable[typing.Tuple[int, int]]) -> typing.List[Rectangle]:
+    """
+    Cover the given cells with few rectangles. Consecutive rows of a column are merged into runs, then
+    neighbouring columns that share the very same run are merged together.
+    """
+    rows_per_col = defaultdict(list)
+    for row, col in cells:
+        rows_per_col[col].append(row)
+
+    cols_per_run = defaultdict(list)
+    for col, rows in rows_per_col.items():
+        rows.sort()
+        start = prev = rows[0]
+        for row in rows[1:]:
+            if row != prev + 1:
+                cols_per_run[(start, prev)].append(col)
+                start = row
+            prev = row
+        cols_per_run[(start, prev)].append(col)
+
+    rectangles = []
+    for (top, bottom), cols in cols_per_run.items():
+        cols.sort()
+        left = prev = cols[0]
+        for col in cols[1:]:
+            if col != prev + 1:
+                rectangles.append((top, left, bottom, prev))
+                left = col
+            prev = col
+        rectangles.append((top, left, bottom, prev))
+    return sorted(rectangles)
+
+
+class MTEditJournal:
+    """
+    Bounded undo/redo stacks of committed transactions.
+    """
+
+    def __init__(self, depth: int = 100):
+        self._undo = deque(maxlen=depth)  # type: typing.Deque[typing.List[CellChange]]
+        self._redo = deque(maxlen=depth)  # type: typing.Deque[typing.List[CellChange]]
+
+    def push(self, changes: typing.List[CellChange]):
+        if changes:
+            self._undo.append(changes)
+            self._redo.clear()
+
+    def can_undo(self) -> bool:
+        return len(self._undo) > 0
+
+    def can_redo(self) -> bool:
+        return len(self._redo) > 0
+
+    def undo(self) -> typing.List[CellChange]:
+        """Pop the last transaction. Returns the changes to apply, in order."""
+        changes = self._undo.pop()
+        self._redo.append(changes)
+        return [(row_id, col, new, old) for row_id, col, old, new in reversed(changes)]
+
+    def redo(self) -> typing.List[CellChange]:
+        changes = self._redo.pop()
+        self._undo.append(changes)
+        return list(changes)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
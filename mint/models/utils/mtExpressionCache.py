@@ -0,0 +1,92 @@
+# Description: Process wide memo of the parsed x, y, z and Variable expressions.
+#              The same expressions show up on many rows and are checked by the validator, the build and the export,
+#              so each distinct text goes through iplotProcessing.Parser only once. Entries are dropped in least
+#              recently used order, and all of them when modules are loaded into the parser since the set of
+#              supported names decides the validity of an expression.
+
+from collections import OrderedDict
+import typing
+
+from iplotProcessing.common import InvalidExpression
+from iplotProcessing.tools import Parser
+
+from mint.models.utils.mtAliasRegistry import referenced_names
+
+
+class ParsedExpression(typing.NamedTuple):
+    valid: bool
+    # Keys of the parser's var_map, in order of appearance. Empty for invalid expressions.
+    variables: typing.Tuple[str, ...]
+    # Every name referenced with ${name}, also for invalid expressions.
+    dependencies: typing.FrozenSet[str]
+    error: str = ''
+
+
+EMPTY_EXPRESSION = ParsedExpression(False, (), frozenset())
+
+
+class MTExpressionCache:
+    """
+    LRU bounded map (expression, is_expression) -> ParsedExpression.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # type: typing.OrderedDict[typing.Tuple[str, bool], ParsedExpression]
+        self._generation = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def parse(self, expression: str, is_expression: bool = False) -> ParsedExpression:
+        if not expression or not isinstance(expression, str):
+            return EMPTY_EXPRESSION
+
+        parser = Parser()
+        # Loading modules injects new members into the parser
+        generation = len(parser.supported_members)
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+        key = (expression, is_expression)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        dependencies = referenced_names(expression)
+        try:
+            parser.set_expression(expression, is_expression)
+            entry = ParsedExpression(parser.is_valid, tuple(parser.var_map.keys()) if parser.is_valid else (),
+                                     dependencies)
+        except InvalidExpression as e:
+            entry = ParsedExpression(False, (), dependencies, str(e))
+        finally:
+            parser.clear_expr()
+
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def is_valid(self, expression: str, is_expression: bool = False) -> bool:
+        return self.parse(expression, is_expression).valid
+
+    def dependencies(self, expressions: typing.Iterable[str]) -> typing.Set[str]:
+        """Union of the names referenced by the given expressions."""
+        names = set()
+        for expression in expressions:
+            names |= self.parse(expression).dependencies
+        return names
+
+
+expression_cache = MTExpressionCache()
@@ -0,0 +1,94 @@
+# Description: Existence check of the pulses referenced in the PulseId column.
+#              Every build asks the data sources whether the pulses of each row exist. The pulses of the whole
+#              table are collected first and resolved per data source, each distinct pulse once, and the answers are
+#              kept for a while so that consecutive draws and auto-refreshes do not query the data sources again.
+
+from collections import defaultdict
+import re
+import time
+import typing
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+
+import iplotLogging.setupLogger as setupLog
+
+logger = setupLog.get_logger(__name__)
+
+PLUS_PATTERN = re.compile(r"\+\((.*)\)")
+MINUS_PATTERN = re.compile(r"-\((.*)\)")
+
+
+def split_pulse(element: str) -> typing.Tuple[str, int]:
+    """
+    Split a PulseId element into the pulse and its kind:
+    0 for '+(pulse)', added to the global pulses, 1 for '-(pulse)', removed from them, and 2 for a plain pulse.
+    """
+    match_plus = PLUS_PATTERN.match(element)
+    if match_plus:
+        return match_plus.group(1), 0
+    match_minus = MINUS_PATTERN.match(element)
+    if match_minus:
+        return match_minus.group(1), 1
+    return element, 2
+
+
+class MTPulseResolver:
+    """
+    TTL cache of (data source, pulse) -> pulse exists.
+    Missing pulses are kept for a shorter time, they may show up once the pulse is archived.
+    """
+
+    def __init__(self, ttl: float = 300., missing_ttl: float = 30.,
+                 data_source: typing.Callable[[str], typing.Any] = None,
+                 clock: typing.Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.queries = 0
+        self._data_source = data_source or (lambda name: AppDataAccess.da.get_data_source(name))
+        self._clock = clock
+        self._known = dict()  # type: typing.Dict[typing.Tuple[str, str], typing.Tuple[bool, float]]
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def clear(self, data_source: str = None):
+        if data_source is None:
+            self._known.clear()
+        else:
+            for key in [key for key in self._known if key[0] == data_source]:
+                del self._known[key]
+
+    def _cached(self, key: typing.Tuple[str, str], now: float) -> typing.Optional[bool]:
+        entry = self._known.get(key)
+        if entry is None or entry[1] <= now:
+            return None
+        return entry[0]
+
+    def resolve(self, pulses: typing.Iterable[typing.Tuple[str, str]]) -> typing.Dict[typing.Tuple[str, str], bool]:
+        """
+        Resolve the given (data source, pulse) pairs. Only the pairs that are not cached, or expired, are queried,
+        grouped by data source.
+        """
+        now = self._clock()
+        result = dict()
+        pending = defaultdict(set)
+        for key in pulses:
+            found = self._cached(key, now)
+            if found is None:
+                pending[key[0]].add(key[1])
+            else:
+                result[key] = found
+
+        for ds_name, names in pending.items():
+            data_source = self._data_source(ds_name)
+            for pulse in sorted(names):
+                self.queries += 1
+                found = not data_source.get_pulses_df(pattern=pulse).empty
+                self._known[(ds_name, pulse)] = (found, now + (self.ttl if found else self.missing_ttl))
+                result[(ds_name, pulse)] = found
+            logger.debug(f"Resolved {len(names)} pulse(s) in the data source '{ds_name}'")
+        return result
+
+    def exists(self, data_source: str, pulse: str) -> bool:
+        key = (data_source, pulse)
+        return self.resolve([key])[key]
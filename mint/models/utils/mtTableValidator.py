@@ -0,0 +1,158 @@
+# Description: Column-wise validation of the signals table.
+#              Every rule that only depends on the cells of a row is checked for all the rows at once with vectorized
+#              string and numeric operations, and the results go straight into the validation state.
+#              Pulses and time ranges depend on the data sources and on the global time settings, these are still
+#              checked row by row while the signals are created.
+
+import typing
+
+import numpy as np
+import pandas as pd
+
+from mint.models.utils.mtBlueprintParser import CompiledBlueprint
+from mint.models.utils.mtColumnStore import MTColumnStore
+from mint.models.utils.mtExpressionCache import expression_cache
+from mint.models.utils.mtValidationState import MTValidationState
+
+STACK_PATTERN = r'(\d+)(?:[.](\d+))?(?:[.](\d+))?$'
+PLOT_TYPES = ('PlotXY', 'PlotContour', 'PlotXYWithSlider')
+MAX_SPAN = 10
+
+
+class MTTableValidator:
+    """
+    Validates the columns DataSource, Variable, Stack, RowSpan, ColSpan, Envelope, Alias, x, y, z and PlotType.
+    """
+
+    KEYS = ('DataSource', 'Variable', 'Stack', 'RowSpan', 'ColSpan', 'Envelope', 'Alias', 'x', 'y', 'z', 'PlotType')
+
+    def __init__(self, store: MTColumnStore, validation: MTValidationState, blueprint: CompiledBlueprint):
+        self._store = store
+        self._validation = validation
+        self._blueprint = blueprint
+
+    def columns(self) -> typing.List[int]:
+        """Store columns checked by the validator."""
+        return [self._store.loc(self._blueprint.column_name(key)) for key in self.KEYS if key in self._blueprint]
+
+    def _raw(self, key: str, rows: np.ndarray) -> pd.Series:
+        values = self._store.column(self._blueprint.column_name(key))[rows]
+        return pd.Series(values, dtype=object).fillna('').astype(str)
+
+    def _value(self, key: str, rows: np.ndarray) -> pd.Series:
+        """Cell text, or the default of the column for empty cells."""
+        raw = self._raw(key, rows)
+        default = self._blueprint.default(key)
+        return raw.where(raw != '', '' if default is None else str(default))
+
+    def validate(self, rows: typing.Sequence[int] = None, data_sources: typing.Collection[str] = (),
+                 invalid_stacks: typing.Collection[str] = (),
+                 view_rows: typing.Callable[[np.ndarray], np.ndarray] = None) -> int:
+        """
+        Validate the given rows (all rows by default). The codes and messages of the checked columns are replaced.
+        `view_rows` maps the rows to the rows seen in the table, for the messages.
+        Returns the number of invalid cells.
+        """
+        rows = np.arange(len(self._store)) if rows is None else np.asarray(rows, dtype=np.int64)
+        if not rows.size:
+            return 0
+        self._validation.reset(rows, self.columns())
+        table_rows = (rows if view_rows is None else view_rows(rows)) + 1
+        errors = 0
+
+        def report(key: str, mask: np.ndarray, message: typing.Callable[[int, int], str]):
+            nonlocal errors
+            mask = np.asarray(mask, dtype=bool)
+            if mask.any():
+                col = self._store.loc(self._blueprint.column_name(key))
+                positions = np.flatnonzero(mask)
+                errors += positions.size
+                self._validation.report(rows[positions], col,
+                                        [message(i, table_rows[i]) for i in positions.tolist()])
+
+        # DataSource
+        if 'DataSource' in self._blueprint:
+            ds = self._raw('DataSource', rows)
+            empty = (ds == '').to_numpy()
+            report('DataSource', empty, lambda i, r: f"Invalid datasource: the 'Datasource' field cannot be empty in "
+                                                     f"the table row [{r}]")
+            unknown = ~empty & ~ds.isin(list(data_sources)).to_numpy()
+            report('DataSource', unknown, lambda i, r: f"Invalid datasource: the value '{ds.iat[i]}' is not found in "
+                                                       f"the list of available datasources in the table row [{r}]")
+
+        # Stack
+        if 'Stack' in self._blueprint:
+            stack = self._value('Stack', rows)
+            filled = (stack != '').to_numpy()
+            in_invalid = filled & stack.isin(list(invalid_stacks)).to_numpy()
+            report('Stack', in_invalid, lambda i, r: f"Invalid stack in table row [{r}]: Plot of type PlotContour or "
+                                                     f"PlotXYWithSlider cannot be stacked, just PlotXY.\n"
+                                                     f"Mixing different plot types in the same stack is not allowed.")
+            malformed = filled & ~in_invalid & ~stack.str.match(STACK_PATTERN).to_numpy(dtype=bool)
+            report('Stack', malformed, lambda i, r: f"Invalid stack: The stack identifier must be a numeric value in "
+                                                    f"the table row [{r}]")
+
+        # Row Span - Col Span
+        for key in ('RowSpan', 'ColSpan'):
+            if key not in self._blueprint:
+                continue
+            column_name = self._blueprint.column_name(key)
+            raw = self._raw(key, rows)
+            stripped = raw.str.strip()
+            parsed = pd.to_numeric(stripped.where(stripped.str.fullmatch(r'[+-]?\d+'), ''), errors='coerce')
+            parsed = parsed.fillna(0).to_numpy(dtype=np.int64)
+            value = np.where(parsed != 0, parsed, int(self._blueprint.default(key) or 0))
+            report(key, value <= 0, lambda i, r, c=column_name: f"Invalid value for '{c}': the value must be greater "
+                                                                f"than 0 in the table row [{r}]")
+            report(key, (value == 1) & ~raw.isin(['1', '']).to_numpy(),
+                   lambda i, r, c=column_name: f"Invalid value for '{c}': the value must be numeric in the table "
+                                               f"row [{r}]")
+            report(key, value > MAX_SPAN, lambda i, r, c=column_name: f"Invalid value for '{c}': the value exceeds "
+                                                                      f"the maximum limit of {MAX_SPAN} in the table "
+                                                                      f"row [{r}]")
+
+        # Envelope
+        if 'Envelope' in self._blueprint:
+            report('Envelope', ~self._raw('Envelope', rows).isin(['1', '0', '']).to_numpy(),
+                   lambda i, r: f"Invalid envelope value: expected '0' or an empty string to disable the envelope, "
+                                f"or '1' to enable it in the table row [{r}]")
+
+        # Alias
+        if 'Alias' in self._blueprint:
+            alias = self._value('Alias', rows)
+            # The first row of the table that defines an alias owns it
+            names, first = np.unique(self._raw('Alias', np.arange(len(self._store))).to_numpy(dtype=str),
+                                     return_index=True)
+            owner = dict(zip(names.tolist(), first.tolist()))
+            filled = (alias != '').to_numpy()
+            repeated = filled & (alias.map(owner).fillna(-1).to_numpy(dtype=np.int64) != rows)
+            report('Alias', repeated, lambda i, r: f"Invalid alias: the alias '{alias.iat[i]}' is already present in "
+                                                   f"the list of aliases in the table row [{r}]")
+            if 'Variable' in self._blueprint:
+                expressions = np.zeros(rows.size, dtype=bool)
+                for key in ('x', 'y', 'z'):
+                    if key in self._blueprint:
+                        expressions |= (self._raw(key, rows) != '').to_numpy()
+                missing = ~filled & (self._raw('Variable', rows) == '').to_numpy() & expressions
+                report('Alias', missing, lambda i, r: f"An alias must be specified when no variable is provided in "
+                                                      f"order to perform the query correctly. Check the table "
+                                                      f"row [{r}]")
+
+        # X - Y - Z, every distinct expression is parsed once
+        for key in ('x', 'y', 'z'):
+            if key not in self._blueprint:
+                continue
+            expressions = self._value(key, rows)
+            validity = {expression: expression_cache.is_valid(expression) for expression in expressions.unique()}
+            report(key, ~expressions.map(validity).to_numpy(dtype=bool),
+                   lambda i, r, k=key: f"Invalid '{k}' expression: the provided expression cannot be evaluated "
+                                       f"correctly")
+
+        # Plot Type
+        if 'PlotType' in self._blueprint:
+            plot_type = self._value('PlotType', rows)
+            report('PlotType', ~plot_type.isin(PLOT_TYPES).to_numpy(),
+                   lambda i, r: f"Invalid plot type: '{plot_type.iat[i]}' is not a valid plot type. Expected "
+                                f"'PlotXY' or 'PlotContour' or 'PlotXYWithSlider'")
+
+        return errors
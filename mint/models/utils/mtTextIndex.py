@@ -0,0 +1,99 @@
+# Description: Inverted n-gram index over the cells of the signals table, used by Find & Replace.
+#              Cells are keyed by (row id, column) so that the index survives row insertions, removals and sorting.
+#              Substring queries intersect the posting sets of their trigrams and verify the few candidates left,
+#              regular expressions are matched against the indexed texts without going through the model.
+
+from collections import defaultdict
+import re
+import typing
+
+# (row id, column)
+CellKey = typing.Tuple[int, int]
+
+
+class MTTextIndex:
+    """
+    Maps every trigram of the non-empty cells to the cells that contain it.
+    """
+
+    GRAM = 3
+
+    def __init__(self):
+        self._texts = dict()  # type: typing.Dict[CellKey, str]
+        self._grams = defaultdict(set)  # type: typing.Dict[str, typing.Set[CellKey]]
+        self._row_cells = defaultdict(set)  # type: typing.Dict[int, typing.Set[int]]
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @classmethod
+    def grams(cls, text: str) -> typing.Set[str]:
+        return {text[i:i + cls.GRAM] for i in range(len(text) - cls.GRAM + 1)}
+
+    def clear(self):
+        self._texts.clear()
+        self._grams.clear()
+        self._row_cells.clear()
+
+    def update(self, row_id: int, col: int, value):
+        """Index the new value of a cell, empty values are simply dropped."""
+        key = (row_id, col)
+        text = '' if value is None else str(value)
+        old = self._texts.get(key)
+        if old == text:
+            return
+        if old is not None:
+            self._discard(key, old)
+        if text:
+            self._texts[key] = text
+            self._row_cells[row_id].add(col)
+            for gram in self.grams(text):
+                self._grams[gram].add(key)
+
+    def update_column(self, col: int, row_ids: typing.Iterable[int], values: typing.Iterable):
+        for row_id, value in zip(row_ids, values):
+            self.update(row_id, col, value)
+
+    def discard_rows(self, row_ids: typing.Iterable[int]):
+        for row_id in row_ids:
+            for col in self._row_cells.pop(row_id, ()):
+                key = (row_id, col)
+                self._discard(key, self._texts[key], keep_row=True)
+
+    def _discard(self, key: CellKey, text: str, keep_row: bool = False):
+        del self._texts[key]
+        if not keep_row:
+            cols = self._row_cells[key[0]]
+            cols.discard(key[1])
+            if not cols:
+                del self._row_cells[key[0]]
+        for gram in self.grams(text):
+            posting = self._grams.get(gram)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._grams[gram]
+
+    def text(self, row_id: int, col: int) -> str:
+        return self._texts.get((row_id, col), '')
+
+    def search(self, pattern: str, regex: bool = False,
+               columns: typing.Optional[typing.Container[int]] = None) -> typing.Set[CellKey]:
+        """
+        Cells that contain `pattern`, or a match of the regular expression `pattern` when `regex` is set.
+        Raises re.error for an invalid regular expression.
+        """
+        if not pattern:
+            return set()
+        if regex:
+            compiled = re.compile(pattern)
+            matches = {key for key, text in self._texts.items() if compiled.search(text)}
+        elif len(pattern) < self.GRAM:
+            matches = {key for key, text in self._texts.items() if pattern in text}
+        else:
+            postings = sorted((self._grams.get(gram, set()) for gram in self.grams(pattern)), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            matches = {key for key in candidates if pattern in self._texts[key]}
+        if columns is not None:
+            matches = {key for key in matches if key[1] in columns}
+        return matches
@@ -0,0 +1,121 @@
+# Description: Per-cell validation state of the signals table.
+#              Error codes live in an int8 matrix attached to the column store, so they follow the rows on
+#              insertion, removal and sorting. Error messages are sparse and keyed by (row id, column).
+
+import typing
+
+import numpy as np
+
+from mint.models.utils.mtColumnStore import MTColumnStore
+
+import iplotLogging.setupLogger as setupLog
+
+logger = setupLog.get_logger(__name__)
+
+
+class MTValidationState:
+    # Value 0 corresponds to a correct cell.
+    # Value 1 corresponds to a main error.
+    # Value 2 corresponds to a secondary error resulting from a main error.
+    OK = 0
+    ERROR = 1
+    SECONDARY = 2
+
+    MATRIX_NAME = 'validation'
+
+    def __init__(self, store: MTColumnStore):
+        self._store = store
+        self._messages = dict()  # type: typing.Dict[typing.Tuple[int, int], str]
+        store.attach_matrix(self.MATRIX_NAME, len(store.columns), np.int8)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """The error codes of all rows. Do not keep this view across insertions/removals."""
+        return self._store.matrix(self.MATRIX_NAME)
+
+    def code(self, row: int, col: int) -> int:
+        return self._store.matrix_row(self.MATRIX_NAME, row)[col]
+
+    def has_errors(self, row: int) -> bool:
+        return bool(self._store.matrix_row(self.MATRIX_NAME, row).any())
+
+    def message(self, row: int, col: int) -> typing.Optional[str]:
+        if not self._messages:
+            return None
+        return self._messages.get((self._store.row_id(row), col))
+
+    def reset(self, rows: typing.Union[int, typing.Sequence[int], slice] = None, cols: typing.Sequence[int] = None):
+        """
+        Mark cells of the given rows (all rows by default) as correct and forget their messages.
+        When `cols` is given, only these columns are reset.
+        """
+        codes = self.codes
+        if rows is None and cols is None:
+            codes[:] = self.OK
+            self._messages.clear()
+            return
+        if rows is None:
+            rows = slice(None)
+        if cols is None:
+            codes[rows] = self.OK
+        else:
+            codes[np.atleast_1d(np.arange(len(self._store))[rows])[:, np.newaxis], np.asarray(cols)] = self.OK
+        if self._messages:
+            ids = set(np.atleast_1d(self._store.row_ids()[rows]).tolist())
+            cols = None if cols is None else set(cols)
+            self._messages = {k: v for k, v in self._messages.items()
+                              if k[0] not in ids or (cols is not None and k[1] not in cols)}
+
+    def update(self, rows: typing.Sequence[int], cols: typing.Sequence[int], codes: typing.Union[int, np.ndarray]):
+        """Vectorized assignment of error codes to the cells (rows[i], cols[i])."""
+        self.codes[np.asarray(rows), np.asarray(cols)] = codes
+
+    def report(self, rows: typing.Sequence[int], col: int, messages: typing.Sequence[str]):
+        """Flag the cells (rows[i], col) as errors with their messages. The messages are logged."""
+        self.codes[np.asarray(rows), col] = self.ERROR
+        row_ids = self._store.row_ids()[np.asarray(rows)].tolist()
+        for row_id, message in zip(row_ids, messages):
+            logger.warning(message)
+            self._messages[(row_id, col)] = message
+
+    def set(self, row: int, col: int, code: int, message: str = None):
+        self._store.matrix_row(self.MATRIX_NAME, row)[col] = code
+        key = (self._store.row_id(row), col)
+        if code != self.OK and message:
+            self._messages[key] = message
+        else:
+            self._messages.pop(key, None)
+
+    def row(self, row: int) -> 'MTRowValidation':
+        return MTRowValidation(self, row)
+
+
+class MTRowValidation:
+    """
+    The validation state of a single row, indexed by column name.
+    """
+
+    def __init__(self, state: MTValidationState, row: int):
+        self._state = state
+        self._row = row
+        # Cells flagged since the last warning.
+        self._flagged = []
+
+    def __getitem__(self, column_name: str) -> int:
+        return self._state.code(self._row, self._state._store.loc(column_name))
+
+    def __setitem__(self, column_name: str, code: int):
+        col = self._state._store.loc(column_name)
+        self._state.set(self._row, col, code)
+        if code != MTValidationState.OK:
+            self._flagged.append(col)
+
+    def warn(self, message: str):
+        """Log a warning and keep it as the message of the cells flagged since the previous warning."""
+        logger.warning(message)
+        for col in self._flagged:
+            self._state.set(self._row, col, self._state.code(self._row, col), message)
+        self._flagged.clear()
+
+    def any(self) -> bool:
+        return self._state.has_errors(self._row)
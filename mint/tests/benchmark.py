@@ -0,0 +1,12 @@
+# Description: Opt-in benchmarks. They report their timings and only run when MINT_BENCHMARK is set, the unit tests
+#              do not depend on the speed of the machine.
+import os
+import unittest
+
+BENCHMARK_VARIABLE = "MINT_BENCHMARK"
+
+
+def benchmark(test):
+    """Skips the decorated test or test case unless MINT_BENCHMARK is set in the environment."""
+    skip = unittest.skipUnless(os.environ.get(BENCHMARK_VARIABLE), f"Set {BENCHMARK_VARIABLE} to run the benchmarks")
+    return skip(test)
@@ -0,0 +1,95 @@
+# Description: Checks the array backed column store of the signals model.
+import unittest
+
+import numpy as np
+
+from mint.models.utils.mtColumnStore import MTColumnStore
+
+
+class TestMTColumnStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.store = MTColumnStore(['DS', 'Variable', 'Stack'], interned=['DS'], capacity=2)
+        self.store.insert_rows(0, 4, {'DS': 'codacuda', 'Variable': [f"Signal:{i}" for i in range(4)]})
+
+    def variables(self):
+        return self.store.column('Variable').tolist()
+
+    def test_insert_remove_blocks(self) -> None:
+        self.assertEqual(len(self.store), 4)
+        seen = []
+        self.store.insert_blocks([(0, 1), (2, 2), (4, 1)],
+                                 [{'Variable': 'A'}, {'Variable': ['B', 'C']}, {'Variable': 'D'}],
+                                 begin=lambda row, count: seen.append((row, count)))
+        self.assertEqual(seen, [(0, 1), (3, 2), (7, 1)])
+        self.assertEqual(self.variables(),
+                         ['A', 'Signal:0', 'Signal:1', 'B', 'C', 'Signal:2', 'Signal:3', 'D'])
+        # Cells can be read from the callbacks while the gap is open
+        self.store.remove_blocks([(0, 1), (3, 2), (7, 1)],
+                                 begin=lambda row, count: seen.append(self.store.get(row - 1, 1) if row else None))
+        self.assertEqual(seen[3:], [None, 'Signal:1', 'Signal:3'])
+        self.assertEqual(self.variables(), [f"Signal:{i}" for i in range(4)])
+        self.assertEqual(self.store.column('DS').tolist(), ['codacuda'] * 4)
+
+        with self.assertRaises(IndexError):
+            self.store.remove_rows(3, 2)
+        with self.assertRaises(IndexError):
+            self.store.get(4, 0)
+
+    def test_interning(self) -> None:
+        self.store.set(1, 0, 'imas')
+        self.store.assign('DS', ['imas', 'codacuda'], start=2)
+        self.assertTrue(self.store.is_interned(0))
+        self.assertFalse(self.store.is_interned(1))
+        self.assertEqual(self.store.column('DS').tolist(), ['codacuda', 'imas', 'imas', 'codacuda'])
+        self.assertEqual(self.store.row(1), {'DS': 'imas', 'Variable': 'Signal:1', 'Stack': ''})
+        # Distinct values are pooled once, code 0 is the empty string
+        self.assertEqual(self.store._columns[0].pool, ['', 'codacuda', 'imas'])
+        self.assertEqual(self.store.non_empty_rows([0]).tolist(), [True] * 4)
+        self.assertEqual(self.store.non_empty_rows([2]).tolist(), [False] * 4)
+
+    def test_row_ids_and_matrices(self) -> None:
+        flags = self.store.attach_matrix('flags', 2)
+        self.assertEqual(flags.shape[1], 2)
+        self.store.matrix('flags')[2] = [1, 2]
+        ids = self.store.row_ids().tolist()
+        self.assertEqual(ids, [0, 1, 2, 3])
+
+        # Ids and matrix rows follow their rows, new rows get new ids and cleared matrix rows
+        self.store.insert_rows(1, 1)
+        self.store.remove_rows(0, 1)
+        self.assertEqual(self.store.row_ids().tolist(), [4, 1, 2, 3])
+        self.assertEqual(self.store.matrix_row('flags', 2).tolist(), [1, 2])
+        self.assertEqual(self.store.matrix_row('flags', 0).tolist(), [0, 0])
+
+        self.store.take(np.array([3, 2, 1, 0]))
+        self.assertEqual(self.store.row_ids().tolist(), [3, 2, 1, 4])
+        self.assertEqual(self.store.row_id(1), 2)
+        self.assertEqual(self.store.matrix('flags')[1].tolist(), [1, 2])
+
+    def test_snapshot(self) -> None:
+        snapshot = self.store.snapshot(stop=3)
+        self.store.set(0, 1, 'Changed')
+        self.store.set(0, 0, 'imas')
+        self.assertEqual(snapshot.column('Variable').tolist(), [f"Signal:{i}" for i in range(3)])
+        self.assertEqual(snapshot.to_dataframe()['DS'].tolist(), ['codacuda'] * 3)
+
+    def test_dataframe(self) -> None:
+        df = self.store.to_dataframe(1, 3)
+        self.assertEqual(list(df.columns), ['DS', 'Variable', 'Stack'])
+        self.assertEqual(list(df.index), [1, 2])
+        self.assertEqual(df['Variable'].tolist(), ['Signal:1', 'Signal:2'])
+        self.assertEqual(df['DS'].tolist(), ['codacuda'] * 2)
+        # Plain columns are not copied, nor writable
+        variables = df['Variable'].to_numpy()
+        self.assertTrue(np.shares_memory(variables, self.store._columns[1].data))
+        self.assertFalse(variables.flags.writeable)
+        with self.assertRaises(ValueError):
+            variables[0] = 'Changed'
+
+        # The frame is left as it was by the mutations of the store
+        self.store.set(1, 1, 'Changed')
+        self.store.insert_rows(0, 2)
+        self.store.remove_rows(3, 1)
+        self.assertEqual(df['Variable'].tolist(), ['Signal:1', 'Signal:2'])
+        self.assertEqual(self.variables(), ['', '', 'Signal:0', 'Signal:2', 'Signal:3'])
@@ -0,0 +1,82 @@
+# Description: Checks the bulk row insertion/removal of the signals model, and benchmarks it.
+import time
+
+from PySide6.QtCore import Qt
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.models import MTSignalsModel
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+from mint.tests.benchmark import benchmark
+
+N_ROWS = 10000
+
+
+class TestMTBulkRows(QAppOffscreenTestAdapter):
+
+    def setUp(self) -> None:
+        super().setUp()
+        AppDataAccess.initialize()
+        self.model = MTSignalsModel()
+        self.notifications = []
+        self.model.rowsInserted.connect(lambda _, first, last: self.notifications.append(('ins', first, last)))
+        self.model.rowsRemoved.connect(lambda _, first, last: self.notifications.append(('rem', first, last)))
+
+    def fill(self, count: int):
+        self.model.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i + 1}"] + [""] * 14 for i in range(count)]})
+
+    def variables(self):
+        return self.column(1)
+
+    def column(self, col: int):
+        return [self.model.data(self.model.index(r, col), Qt.ItemDataRole.DisplayRole)
+                for r in range(self.model.rowCount())]
+
+    def test_insert_ranges(self) -> None:
+        self.fill(4)
+        self.notifications.clear()
+        self.assertTrue(self.model.insert_row_ranges([(3, 1), (1, 2), (1, 1)]))
+
+        self.assertEqual(self.notifications, [('ins', 1, 3), ('ins', 6, 6)])
+        self.assertEqual(self.variables(), ['Signal:0', '', '', '', 'Signal:1', 'Signal:2', '', 'Signal:3'])
+        self.assertEqual(self.model._validation.codes.shape[0], self.model.rowCount())
+        uids = [uid for variable, uid in zip(self.variables(), self.column(16)) if not variable]
+        self.assertEqual(len(set(uids)), 4)
+        self.assertNotIn('', uids)
+
+    def test_remove_ranges(self) -> None:
+        self.fill(8)
+        self.notifications.clear()
+        self.assertTrue(self.model.remove_row_ranges([(6, 1), (1, 2), (2, 2)]))
+
+        self.assertEqual(self.notifications, [('rem', 1, 3), ('rem', 3, 3)])
+        self.assertEqual(self.variables(), ['Signal:0', 'Signal:4', 'Signal:5', 'Signal:7'])
+        self.assertEqual(self.model._validation.codes.shape[0], self.model.rowCount())
+        self.assertFalse(self.model.remove_row_ranges([(4, 2)]))
+
+    def bulk_10k_rows(self):
+        """Inserts and removes 10k rows in blocks, returns the time taken by each."""
+        self.fill(N_ROWS)
+        # Notify the views of every row
+        self.model.fetch_all()
+
+        start = time.perf_counter()
+        self.model.insert_row_ranges([(row, 1) for row in range(0, N_ROWS, 2)] + [(N_ROWS, N_ROWS // 2)])
+        insert_time = time.perf_counter() - start
+        self.assertEqual(self.model.rowCount(), 2 * N_ROWS)
+
+        start = time.perf_counter()
+        # The rows inserted in front of every other row are now at every third row, followed by the last block.
+        self.model.remove_row_ranges([(row, 1) for row in range(0, 3 * N_ROWS // 2, 3)] +
+                                     [(3 * N_ROWS // 2, N_ROWS // 2)])
+        remove_time = time.perf_counter() - start
+        self.assertEqual(self.model.rowCount(), N_ROWS)
+        self.assertEqual(self.variables()[:3], ['Signal:0', 'Signal:1', 'Signal:2'])
+        return insert_time, remove_time
+
+    def test_10k_rows(self) -> None:
+        self.bulk_10k_rows()
+
+    @benchmark
+    def test_benchmark_10k_rows(self) -> None:
+        insert_time, remove_time = self.bulk_10k_rows()
+        print(f"Inserted {N_ROWS} rows in {insert_time:.3f}s, removed {N_ROWS} rows in {remove_time:.3f}s")
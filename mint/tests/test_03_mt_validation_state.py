@@ -0,0 +1,56 @@
+# Description: Checks that cell validation results are shown by the model and follow the rows.
+from unittest.mock import patch
+
+from PySide6.QtCore import Qt
+
+from iplotDataAccess.dataSource import DataSource
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.gui.mtSignalConfigurator import MTSignalConfigurator
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+
+test_table = {
+    "table": [
+        ["codacuda", "Signal:A", "1.1", "", "", "", "", "", "", "", "", "", "", "", "PlotXY", "", ""],
+        ["codacuda", "Signal:B", "1.2", "", "", "", "", "", "", "", "", "", "", "", "PlotBar", "", ""],
+        ["codacuda", "Signal:C", "2.1", "", "", "", "", "", "", "", "", "", "", "", "PlotXY", "", ""]]
+}
+
+
+class TestMTValidationState(QAppOffscreenTestAdapter):
+
+    @patch.object(DataSource, "connected", new=True, create=True)
+    @patch("iplotDataAccess.dataAccess.DataSource.get_cbs_dict")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_var_fields")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_pulses_df")
+    @patch("iplotDataAccess.dataAccess.DataSource.connect")
+    @patch.object(DataSource, 'get_var_dict')
+    def test_invalid_cells(self, mock_get_var_dict, pulse_list, var_fields, cbs_dict, source_connected) -> None:
+        source_connected.return_value = True
+        var_fields.return_value = {}
+        pulse_list.return_value = []
+        cbs_dict.return_value = {}
+
+        if not AppDataAccess.initialize():
+            return
+        sig_cfg_widget = MTSignalConfigurator()
+        sig_cfg_widget.import_dict(test_table)
+        mock_get_var_dict.return_value = {"correct_values": ""}
+        path = list(sig_cfg_widget.build())
+        self.assertEqual(len(path), 2)
+
+        model = sig_cfg_widget.model
+        plot_type_col = model.blueprint['PlotType']['label']
+        col = [model.headerData(c, Qt.Orientation.Horizontal) for c in range(model.columnCount())].index(plot_type_col)
+
+        invalid = model.index(1, col)
+        self.assertEqual(model.data(invalid, Qt.ItemDataRole.BackgroundRole), model._red_brush)
+        self.assertIn("Invalid plot type", model.data(invalid, Qt.ItemDataRole.ToolTipRole))
+        self.assertEqual(model.data(model.index(0, col), Qt.ItemDataRole.BackgroundRole), model._white_brush)
+        self.assertIsNone(model.data(model.index(0, col), Qt.ItemDataRole.ToolTipRole))
+
+        # The state moves along with its row.
+        model.removeRows(0, 1)
+        invalid = model.index(0, col)
+        self.assertEqual(model.data(invalid, Qt.ItemDataRole.BackgroundRole), model._red_brush)
+        self.assertIn("Invalid plot type", model.data(invalid, Qt.ItemDataRole.ToolTipRole))
+        self.assertEqual(model.data(model.index(1, col), Qt.ItemDataRole.BackgroundRole), model._white_brush)
@@ -0,0 +1,111 @@
+# Description: Checks the edit transactions and the undo/redo journal of the signals model.
+from unittest.mock import patch
+
+from PySide6.QtCore import Qt
+
+from iplotDataAccess.dataSource import DataSource
+from iplotDataAccess.appDataAccess import AppDataAccess
+from iplotlib.core import SignalXY
+from mint.gui.mtSignalConfigurator import MTSignalConfigurator
+from mint.models import MTSignalsModel
+from mint.models.utils.mtEditJournal import coalesce_cells
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+
+
+class TestMTEditTransactions(QAppOffscreenTestAdapter):
+
+    def setUp(self) -> None:
+        super().setUp()
+        AppDataAccess.initialize()
+        self.model = MTSignalsModel()
+        self.model.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i + 1}"] + [""] * 14 for i in range(6)]})
+        self.changes = []
+        self.model.dataChanged.connect(
+            lambda top_left, bottom_right: self.changes.append((top_left.row(), top_left.column(),
+                                                                bottom_right.row(), bottom_right.column())))
+
+    def cell(self, row: int, col: int):
+        return self.model.data(self.model.index(row, col), Qt.ItemDataRole.DisplayRole)
+
+    def test_coalesce_cells(self) -> None:
+        cells = [(r, c) for r in range(2, 5) for c in (1, 2)] + [(7, 1), (9, 4)]
+        self.assertEqual(coalesce_cells(cells), [(2, 1, 4, 2), (7, 1, 7, 1), (9, 4, 9, 4)])
+
+    def test_transaction(self) -> None:
+        with self.model.transaction():
+            for row in range(3):
+                for col in (1, 2):
+                    self.model.setData(self.model.index(row, col), f"x{row}{col}", Qt.ItemDataRole.EditRole)
+            self.model.setData(self.model.index(5, 6), "alias", Qt.ItemDataRole.EditRole)
+            self.assertEqual(self.changes, [])
+
+        self.assertEqual(self.changes, [(0, 1, 2, 2), (5, 6, 5, 6)])
+        self.assertEqual(self.cell(2, 2), "x22")
+
+    def test_undo_redo(self) -> None:
+        self.model.setData(self.model.index(0, 1), "A", Qt.ItemDataRole.EditRole)
+        with self.model.transaction():
+            self.model.setData(self.model.index(1, 1), "B", Qt.ItemDataRole.EditRole)
+            self.model.setData(self.model.index(2, 1), "C", Qt.ItemDataRole.EditRole)
+        with self.model.activate_fast_mode():
+            self.model.setData(self.model.index(3, 15), "Ready", Qt.ItemDataRole.EditRole)
+
+        # Undo follows the rows even when these were re-ordered.
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual([self.cell(r, 1) for r in range(6)], ["Signal:5", "Signal:4", "Signal:3", "C", "B", "A"])
+
+        self.assertTrue(self.model.undo())
+        self.assertEqual([self.cell(r, 1) for r in range(6)],
+                         ["Signal:5", "Signal:4", "Signal:3", "Signal:2", "Signal:1", "A"])
+        self.assertTrue(self.model.undo())
+        self.assertEqual(self.cell(5, 1), "Signal:0")
+        self.assertFalse(self.model.undo())
+        self.assertEqual(self.cell(2, 15), "Ready")
+
+        self.assertTrue(self.model.redo())
+        self.assertEqual(self.cell(5, 1), "A")
+        self.assertTrue(self.model.can_redo())
+
+        self.model.setData(self.model.index(0, 2), "9.9", Qt.ItemDataRole.EditRole)
+        self.assertFalse(self.model.can_redo())
+
+    def test_failed_access_repaints_variable(self) -> None:
+        with self.model.activate_fast_mode():
+            self.model.setData(self.model.index(4, self.model.get_dataframe().columns.get_loc('uid')), "row4",
+                               Qt.ItemDataRole.EditRole)
+        self.changes.clear()
+        signal = SignalXY(uid="row4", name="Signal:4", data_source="codacuda")
+        signal.get_data = lambda: signal.set_da_fail(msg="Variable not found")
+        self.model.update_signal_data(4, signal, True)
+
+        self.assertIn((4, 1, 4, 1), self.changes)
+        self.assertIn("Variable not found", self.model.data(self.model.index(4, 1), Qt.ItemDataRole.ToolTipRole))
+
+    @patch.object(DataSource, "connected", new=True, create=True)
+    @patch("iplotDataAccess.dataAccess.DataSource.get_cbs_dict")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_var_fields")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_pulses_df")
+    @patch("iplotDataAccess.dataAccess.DataSource.connect")
+    def test_bulk_contents_verbatim(self, source_connected, pulse_list, var_fields, cbs_dict) -> None:
+        source_connected.return_value = True
+        var_fields.return_value = {}
+        pulse_list.return_value = []
+        cbs_dict.return_value = {}
+
+        if not AppDataAccess.initialize():
+            return
+        widget = MTSignalConfigurator()
+        widget.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i + 1}"] + [""] * 14 for i in range(3)]})
+        model = widget.model
+
+        # Pasted and bulk set values are stored as they are, unlike the interactive edits, and can be undone
+        widget.set_bulk_contents("a\tb  c", [model.index(0, 1), model.index(1, 1)])
+        self.assertEqual([model.data(model.index(r, 1), Qt.ItemDataRole.DisplayRole) for r in range(3)],
+                         ["a\tb  c", "a\tb  c", "Signal:2"])
+        model.setData(model.index(2, 1), "a\tb  c", Qt.ItemDataRole.EditRole)
+        self.assertEqual(model.data(model.index(2, 1), Qt.ItemDataRole.DisplayRole), "a b c")
+
+        self.assertTrue(model.undo())
+        self.assertTrue(model.undo())
+        self.assertEqual([model.data(model.index(r, 1), Qt.ItemDataRole.DisplayRole) for r in range(3)],
+                         ["Signal:0", "Signal:1", "Signal:2"])
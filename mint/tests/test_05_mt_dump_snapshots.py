@@ -0,0 +1,58 @@
+# Description: Checks the copy-on-write table snapshots and the background dump writer.
+import os
+import tempfile
+
+from PySide6.QtCore import Qt
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.models import MTSignalsModel
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+from mint.tools.dump_writer import DumpWriter, latest_dump, read_index
+
+
+class TestMTDumpSnapshots(QAppOffscreenTestAdapter):
+
+    def setUp(self) -> None:
+        super().setUp()
+        AppDataAccess.initialize()
+        self.model = MTSignalsModel()
+        self.model.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i + 1}"] + [""] * 14 for i in range(3)]})
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def test_snapshot_is_immutable(self) -> None:
+        snapshot = self.model.snapshot()
+        self.model.setData(self.model.index(0, 1), "Changed", Qt.ItemDataRole.EditRole)
+        self.model.removeRows(1, 1)
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(list(snapshot.column('Variable')), ["Signal:0", "Signal:1", "Signal:2"])
+        self.assertEqual(self.model.data(self.model.index(0, 1), Qt.ItemDataRole.DisplayRole), "Signal:2")
+
+    def test_dump_writer(self) -> None:
+        writer = DumpWriter(self.tmp_dir.name, max_dumps=2)
+        writer.submit(self.model.snapshot(), "dump_1.scsv")
+        # Same content, skipped
+        writer.submit(self.model.snapshot(), "dump_2.scsv")
+        writer.flush()
+        self.assertEqual([entry['file'] for entry in read_index(self.tmp_dir.name)], ["dump_1.scsv"])
+
+        for i in range(3, 6):
+            self.model.setData(self.model.index(0, 1), f"Signal:{i}", Qt.ItemDataRole.EditRole)
+            writer.submit(self.model.snapshot(), f"dump_{i}.scsv")
+        writer.flush()
+
+        self.assertEqual([entry['file'] for entry in read_index(self.tmp_dir.name)], ["dump_4.scsv", "dump_5.scsv"])
+        self.assertEqual(sorted(f for f in os.listdir(self.tmp_dir.name) if f.endswith('.scsv')),
+                         ["dump_4.scsv", "dump_5.scsv"])
+        file_path = latest_dump(self.tmp_dir.name)
+        self.assertEqual(os.path.basename(file_path), "dump_5.scsv")
+        with open(file_path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertNotIn("uid", lines[0])
+        self.assertTrue(lines[1].startswith("codacuda;Signal:5;1"))
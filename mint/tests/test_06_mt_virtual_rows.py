@@ -0,0 +1,58 @@
+# Description: Checks that very large tables are shown to the views in batches.
+from PySide6.QtCore import QModelIndex, Qt
+from PySide6.QtWidgets import QTableView
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.models import MTSignalsModel
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+
+
+class TestMTVirtualRows(QAppOffscreenTestAdapter):
+
+    def setUp(self) -> None:
+        super().setUp()
+        AppDataAccess.initialize()
+        self.model = MTSignalsModel()
+
+    def fill(self, count: int):
+        self.model.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i + 1}"] + [""] * 14 for i in range(count)]})
+
+    def test_small_table(self) -> None:
+        self.fill(10)
+        self.assertFalse(self.model.is_virtual)
+        self.assertEqual(self.model.rowCount(), 10)
+        self.assertFalse(self.model.canFetchMore(QModelIndex()))
+
+    def test_fetch_more(self) -> None:
+        n_rows = 3 * MTSignalsModel.FETCH_BATCH + MTSignalsModel.VIRTUAL_THRESHOLD
+        self.fill(n_rows)
+        self.assertTrue(self.model.is_virtual)
+        self.assertEqual(self.model.rowCount(), MTSignalsModel.FETCH_BATCH)
+        self.assertEqual(len(self.model.get_dataframe().index), n_rows)
+
+        self.model.fetchMore(QModelIndex())
+        self.assertEqual(self.model.rowCount(), 2 * MTSignalsModel.FETCH_BATCH)
+
+        # Rows beyond what the views know of are changed silently.
+        removed = []
+        self.model.rowsRemoved.connect(lambda _, first, last: removed.append((first, last)))
+        self.model.remove_row_ranges([(0, 2), (n_rows - 10, 5)])
+        self.assertEqual(removed, [(0, 1)])
+        self.assertEqual(self.model.rowCount(), 2 * MTSignalsModel.FETCH_BATCH - 2)
+        self.assertEqual(self.model.data(self.model.index(0, 1), Qt.ItemDataRole.DisplayRole), "Signal:2")
+
+        self.model.fetch_all()
+        self.assertFalse(self.model.is_virtual)
+        self.assertEqual(self.model.rowCount(), n_rows - 7)
+
+    def test_view_fetches_on_demand(self) -> None:
+        self.fill(MTSignalsModel.VIRTUAL_THRESHOLD + 1)
+        view = QTableView()
+        view.setModel(self.model)
+        view.resize(400, 300)
+        view.show()
+        self.assertLessEqual(self.model.rowCount(), 2 * MTSignalsModel.FETCH_BATCH)
+        view.scrollToBottom()
+        self.app.processEvents()
+        self.assertGreater(self.model.rowCount(), MTSignalsModel.FETCH_BATCH)
+        view.close()
@@ -0,0 +1,88 @@
+# Description: Checks that sorting the signals model re-orders the views only and leaves the storage untouched.
+import time
+
+from PySide6.QtCore import QPersistentModelIndex, Qt
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.models import MTSignalsModel
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+from mint.tests.benchmark import benchmark
+
+
+class TestMTSortPermutation(QAppOffscreenTestAdapter):
+
+    def setUp(self) -> None:
+        super().setUp()
+        AppDataAccess.initialize()
+        self.model = MTSignalsModel()
+        self.model.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i + 1}"] + [""] * 14 for i in range(5)]})
+
+    def view_column(self, col: int):
+        return [self.model.data(self.model.index(r, col), Qt.ItemDataRole.DisplayRole)
+                for r in range(self.model.rowCount())]
+
+    def test_storage_order_untouched(self) -> None:
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.view_column(1), [f"Signal:{i}" for i in reversed(range(5))])
+        self.assertEqual(self.model.get_storage_dataframe()['Variable'].tolist(), [f"Signal:{i}" for i in range(5)])
+        self.assertEqual(self.model.storage_index(0, 1).row(), 4)
+
+    def test_export_in_view_order(self) -> None:
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.model.get_dataframe()['Variable'].tolist(), [f"Signal:{i}" for i in reversed(range(5))])
+        self.assertEqual(list(self.model.get_dataframe().index), list(range(5)))
+        self.assertEqual([row[1] for row in self.model.export_dict()['table']],
+                         [f"Signal:{i}" for i in reversed(range(5))])
+
+        # Messages give the rows as they are seen
+        self.model.setData(self.model.index(4, 0), "", Qt.ItemDataRole.EditRole)
+        self.model.validate_table()
+        self.assertIn("table row [5]", self.model.data(self.model.index(4, 0), Qt.ItemDataRole.ToolTipRole))
+
+    def test_edit_after_sort(self) -> None:
+        persistent = QPersistentModelIndex(self.model.index(1, 1))
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(persistent.row(), 3)
+
+        self.model.setData(self.model.index(0, 1), "Z", Qt.ItemDataRole.EditRole)
+        self.assertEqual(self.model.get_storage_dataframe()['Variable'].tolist()[4], "Z")
+
+        # The cached keys follow the edit.
+        self.model.sort(1, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(self.view_column(1)[-1], "Z")
+
+    def test_insert_remove_after_sort(self) -> None:
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+        self.model.remove_row_ranges([(0, 1), (2, 1)])
+        self.assertEqual(self.view_column(1), ["Signal:3", "Signal:1", "Signal:0"])
+        self.assertEqual(self.model.get_storage_dataframe()['Variable'].tolist(), ["Signal:0", "Signal:1", "Signal:3"])
+
+        self.model.insertRows(1, 1)
+        self.model.setData(self.model.index(1, 1), "New", Qt.ItemDataRole.EditRole)
+        self.assertEqual(self.view_column(1)[:3], ["Signal:3", "New", "Signal:1"])
+        self.assertEqual(self.model.get_storage_dataframe()['Variable'].tolist(),
+                         ["Signal:0", "Signal:1", "Signal:3", "New"])
+
+        self.model.remove_empty_rows()
+        self.assertEqual(self.view_column(1), ["Signal:3", "New", "Signal:1", "Signal:0"])
+
+    def sort_10k(self) -> float:
+        """Sorts 10k rows by one column then another, returns the time taken."""
+        n_rows = 10000
+        self.model.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i % 7}"] + [""] * 14 for i in range(n_rows)]})
+        self.model.fetch_all()
+        self.model.sort(2)
+        start = time.perf_counter()
+        for col in (1, 2, 1, 2):
+            self.model.sort(col, Qt.SortOrder.DescendingOrder)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(self.model.data(self.model.index(0, 2), Qt.ItemDataRole.DisplayRole), "6")
+        self.assertEqual(self.model.get_storage_dataframe()['Variable'].tolist()[:2], ["Signal:0", "Signal:1"])
+        return elapsed
+
+    def test_sort_10k(self) -> None:
+        self.sort_10k()
+
+    @benchmark
+    def test_benchmark_sort_10k(self) -> None:
+        print(f"Sorted 10000 rows 4 times in {self.sort_10k():.3f}s")
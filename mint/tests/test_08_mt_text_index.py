@@ -0,0 +1,99 @@
+# Description: Checks the text index behind Find & Replace and the vectorized replace of the signals model.
+import time
+import typing
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QTableView
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.gui.mtFindReplace import FindReplaceDialog
+from mint.models import MTSignalsModel
+from mint.models.utils.mtTextIndex import MTTextIndex
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+from mint.tests.benchmark import benchmark
+
+
+class TestMTTextIndex(QAppOffscreenTestAdapter):
+
+    def setUp(self) -> None:
+        super().setUp()
+        AppDataAccess.initialize()
+        self.model = MTSignalsModel()
+        self.model.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i + 1}"] + [""] * 14 for i in range(5)]})
+
+    def cells(self, indexes):
+        return [(index.row(), index.column()) for index in indexes]
+
+    def test_index(self) -> None:
+        index = MTTextIndex()
+        index.update(1, 0, "abcdef")
+        index.update(2, 0, "cdefgh")
+        index.update(2, 1, "xyz")
+        self.assertEqual(index.search("cdef"), {(1, 0), (2, 0)})
+        self.assertEqual(index.search("de"), {(1, 0), (2, 0)})
+        self.assertEqual(index.search("^x", regex=True), {(2, 1)})
+        index.update(1, 0, "")
+        index.discard_rows([2])
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.search("cdef"), set())
+
+    def test_find_follows_edits(self) -> None:
+        self.assertEqual(self.cells(self.model.find("Signal:3")), [(3, 1)])
+        self.assertEqual(self.cells(self.model.find(r"^Signal:[34]$", regex=True)), [(3, 1), (4, 1)])
+
+        self.model.setData(self.model.index(0, 6), "Signal:3 alias", Qt.ItemDataRole.EditRole)
+        self.model.removeRows(1, 1)
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.cells(self.model.find("Signal:3")), [(1, 1), (3, 6)])
+
+        self.model.undo()
+        self.assertEqual(self.cells(self.model.find("Signal:3")), [(1, 1)])
+
+    def test_replace(self) -> None:
+        changes = []
+        self.model.dataChanged.connect(lambda top_left, bottom_right: changes.append((top_left.row(),
+                                                                                     bottom_right.row())))
+        indexes = [self.model.index(row, col) for row in range(5) for col in range(3)]
+        self.assertEqual(self.model.replace(indexes, r"Signal:(\d)", r"S\1", regex=True), 5)
+        self.assertEqual(changes, [(0, 4)])
+        self.assertEqual(self.cells(self.model.find("S4")), [(4, 1)])
+        self.assertEqual(self.model.find("Signal"), [])
+
+        self.model.undo()
+        self.assertEqual(len(self.model.find("Signal")), 5)
+
+        # Stored as if they were typed in
+        variables = [self.model.index(row, 1) for row in range(2)]
+        self.assertEqual(self.model.replace(variables[:1], "Signal:0", ' "a", b\t'), 1)
+        self.assertEqual(self.model.replace(variables[1:], "Signal", " X "), 1)
+        self.assertEqual([self.model.data(index, Qt.ItemDataRole.DisplayRole) for index in variables],
+                         ["'a', b", "X :1"])
+        # Nothing is left to normalize
+        self.assertEqual(self.model.replace(variables, "b", "b"), 0)
+
+    def find_dialog_10k(self) -> typing.Tuple[FindReplaceDialog, QTableView, float]:
+        """Finds the cells of 10k rows that contain 'Signal:99', returns the dialog, its view and the time taken."""
+        n_rows = 10000
+        self.model.import_dict({"table": [["codacuda", f"Signal:{i}", f"{i + 1}"] + [""] * 14 for i in range(n_rows)]})
+        view = QTableView()
+        view.setModel(self.model)
+        dialog = FindReplaceDialog(model=view)
+        dialog.find_input.setText("Signal:99")
+        start = time.perf_counter()
+        dialog.find_text(find_one=False)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(view.selectionModel().selectedIndexes()), 111)
+        return dialog, view, elapsed
+
+    def test_find_dialog_10k(self) -> None:
+        dialog, view, _ = self.find_dialog_10k()
+
+        dialog.regex_check.setChecked(True)
+        dialog.find_input.setText(r"^Signal:999\d$")
+        dialog.find_text(find_one=True)
+        dialog.find_text(find_one=True)
+        self.assertEqual(self.cells(view.selectionModel().selectedIndexes()), [(9991, 1)])
+
+    @benchmark
+    def test_benchmark_find_dialog_10k(self) -> None:
+        print(f"Found the matches of 10000 rows in {self.find_dialog_10k()[2]:.3f}s")
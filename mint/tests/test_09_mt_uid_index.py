@@ -0,0 +1,60 @@
+# Description: Checks the uid -> row index of the signals model.
+import uuid
+from unittest.mock import MagicMock
+
+import pandas as pd
+from PySide6.QtCore import Qt
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.models import MTSignalsModel
+from mint.models.utils.mtValidationState import MTValidationState
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+
+
+class TestMTUidIndex(QAppOffscreenTestAdapter):
+
+    def setUp(self) -> None:
+        super().setUp()
+        AppDataAccess.initialize()
+        self.model = MTSignalsModel()
+        self.uids = [str(uuid.uuid4()) for _ in range(4)]
+        self.model.set_dataframe(pd.DataFrame({"Variable": [f"Signal:{i}" for i in range(4)], "uid": self.uids}))
+
+    def test_lookup(self) -> None:
+        self.assertEqual([self.model.row_of_uid(uid) for uid in self.uids], [0, 1, 2, 3])
+        self.assertIsNone(self.model.row_of_uid("unknown"))
+
+        self.model.removeRows(0, 1)
+        self.model.sort(1, Qt.SortOrder.DescendingOrder)
+        self.model.insertRows(0, 1)
+        self.assertEqual([self.model.row_of_uid(uid) for uid in self.uids[1:]], [0, 1, 2])
+
+        self.model.append_dataframe(pd.DataFrame({"Variable": ["Signal:4"]}))
+        # Goes in before the trailing empty row
+        new_uid = self.model.get_dataframe()['uid'].tolist()[-1]
+        self.assertEqual(self.model.row_of_uid(new_uid), 3)
+        self.assertEqual(self.model.row_of_uid(self.uids[3]), 2)
+
+        self.model.setData(self.model.storage_index(0, self.model._store.loc("uid")), "edited",
+                           Qt.ItemDataRole.EditRole)
+        self.assertEqual(self.model.row_of_uid("edited"), 0)
+        self.assertIsNone(self.model.row_of_uid(self.uids[1]))
+
+    def test_failed_signal(self) -> None:
+        self.model.set_dataframe(pd.DataFrame({"Variable": [f"Signal:{i}" for i in range(4)],
+                                               "Stack": ["1.1"] * 4, "uid": self.uids}))
+        signal = MagicMock(uid=self.uids[2], isDownsampled=False)
+        signal.status_info.result = 'Fail'
+        signal.status_info.msg = 'No data'
+        self.model.update_signal_data(2, signal, fetch_data=True)
+        self.assertEqual(self.model._validation.code(2, self.model._store.loc('Variable')), MTValidationState.ERROR)
+        self.assertFalse(self.model._validation.has_errors(1))
+
+    def test_missing_uids(self) -> None:
+        self.model.set_dataframe(pd.DataFrame({"Variable": [f"Signal:{i}" for i in range(4)],
+                                               "uid": ["", self.uids[1], "", self.uids[3]]}))
+        uids = self.model.get_dataframe()['uid'].tolist()
+        self.assertEqual(uids[1::2], self.uids[1::2])
+        self.assertEqual(len(set(uids)), 4)
+        self.assertNotIn('', uids)
+        self.assertEqual([self.model.row_of_uid(uid) for uid in uids], [0, 1, 2, 3])
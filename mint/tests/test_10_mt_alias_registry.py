@@ -0,0 +1,75 @@
+# Description: Checks the alias registry of the signals model and the build graph computed from it.
+from unittest.mock import patch
+
+from PySide6.QtCore import Qt
+
+from iplotDataAccess.dataSource import DataSource
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.gui.mtSignalConfigurator import MTSignalConfigurator
+from mint.models.utils.mtAliasRegistry import MTAliasRegistry
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+
+test_table = {
+    "table": [
+        ["codacuda", "", "1.1", "", "", "", "c", "", "", "", "${a}.time", "${b}.data", "", "", "PlotXY", "", ""],
+        ["codacuda", "Signal:A", "", "", "", "", "a", "", "", "", "", "", "", "", "PlotXY", "", ""],
+        ["codacuda", "Signal:B", "", "", "", "", "b", "", "", "", "", "", "", "", "PlotXY", "", ""]]
+}
+
+
+class TestMTAliasRegistry(QAppOffscreenTestAdapter):
+
+    def test_registry(self) -> None:
+        registry = MTAliasRegistry()
+        registry.update(1, "a", "Signal:A", ["", "", ""])
+        registry.update(2, "b", "", ["${a}.time", "${self}.data", ""])
+        registry.update(3, "", "${b} + 1", ["", "", ""])
+        self.assertTrue(registry.is_simple(1))
+        self.assertEqual(registry.dependencies(2), {"a"})
+        self.assertEqual(registry.dependencies(3), {"b"})
+        self.assertEqual(registry.dependents("a"), {2})
+
+        registry.update(3, "a", "", ["", "", ""])
+        self.assertEqual(registry.duplicates(), {"a"})
+        self.assertEqual(registry.rows("a"), {1, 3})
+        self.assertEqual(registry.dependents("b"), set())
+
+        registry.discard_rows([1])
+        self.assertEqual(registry.duplicates(), set())
+        self.assertEqual(registry.rows("a"), {3})
+
+    @patch.object(DataSource, "connected", new=True, create=True)
+    @patch("iplotDataAccess.dataAccess.DataSource.get_cbs_dict")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_var_fields")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_pulses_df")
+    @patch("iplotDataAccess.dataAccess.DataSource.connect")
+    @patch.object(DataSource, 'get_var_dict')
+    def test_build_graph(self, mock_get_var_dict, pulse_list, var_fields, cbs_dict, source_connected) -> None:
+        source_connected.return_value = True
+        var_fields.return_value = {}
+        pulse_list.return_value = []
+        cbs_dict.return_value = {}
+
+        if not AppDataAccess.initialize():
+            return
+        sig_cfg_widget = MTSignalConfigurator()
+        sig_cfg_widget.import_dict(test_table)
+        mock_get_var_dict.return_value = {"correct_values": ""}
+        model = sig_cfg_widget.model
+
+        # Dependencies are created first
+        path = list(sig_cfg_widget.build())
+        self.assertEqual([waypoint.idx for waypoint in path], [1, 2, 0])
+
+        # The registry follows the edits
+        aborted = []
+        sig_cfg_widget.buildAborted.connect(aborted.append)
+        model.setData(model.index(2, 6), "a", Qt.ItemDataRole.EditRole)
+        self.assertEqual(model.alias_rows("a"), [1, 2])
+        self.assertEqual(list(sig_cfg_widget.build()), [])
+        self.assertEqual(len(aborted), 1)
+        self.assertIn("'a' is defined in row (s): [2, 3]", aborted[0])
+
+        model.removeRows(2, 1)
+        self.assertEqual(model.alias_registry.duplicates(), set())
+        self.assertEqual(model.alias_rows("a"), [1])
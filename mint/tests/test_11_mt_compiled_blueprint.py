@@ -0,0 +1,44 @@
+# Description: Checks that the compiled blueprint agrees with the functions working on the raw blueprint.
+import copy
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from mint.models.utils import mtBlueprintParser as mtBP
+
+
+class TestMTCompiledBlueprint(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.raw = mtBP.parse_raw_blueprint(copy.deepcopy(mtBP.DEFAULT_BLUEPRINT))
+        self.blueprint = mtBP.CompiledBlueprint(self.raw)
+
+    def test_maps(self) -> None:
+        self.assertEqual(self.blueprint.column_names, tuple(mtBP.get_column_names(self.raw)))
+        self.assertEqual(self.blueprint.code_names, tuple(mtBP.get_code_names(self.raw)))
+        self.assertEqual(self.blueprint.override_keys, tuple(mtBP.get_keys_with_override(self.raw)))
+        for key in self.blueprint.override_keys + ('Variable', 'PulseNumber'):
+            self.assertEqual(self.blueprint.column_name(key), mtBP.get_column_name(self.raw, key))
+            self.assertEqual(mtBP.get_column_name(self.blueprint, key), mtBP.get_column_name(self.raw, key))
+        self.assertEqual(self.blueprint.position('Variable'), self.blueprint.column_names.index('Variable'))
+        self.assertIs(self.blueprint.field('Variable').type, self.raw['Variable']['type'])
+
+    def test_defaults(self) -> None:
+        self.blueprint.set_default('PulseNumber', ['1'])
+        self.assertEqual(self.blueprint.default('PulseNumber'), ['1'])
+        self.assertEqual(self.raw['PulseNumber']['default'], ['1'])
+
+    def test_params(self) -> None:
+        row = pd.Series({name: f"v{i}" for i, name in enumerate(self.blueprint.column_names)})
+        self.assertEqual(self.blueprint.construct_params_from_series(row),
+                         mtBP.construct_params_from_series(self.raw, row))
+
+        params = dict(self.blueprint.construct_params_from_series(row), comment='')
+        self.assertEqual(mtBP.construct_signal(self.blueprint, dict, **params),
+                         mtBP.construct_signal(self.raw, dict, **params))
+
+    def test_types_resolved_once(self) -> None:
+        with patch("importlib.import_module") as import_module:
+            mtBP.CompiledBlueprint(self.raw)
+            import_module.assert_not_called()
@@ -0,0 +1,78 @@
+# Description: Checks the column-wise validation of the signals table.
+import time
+
+from PySide6.QtCore import Qt
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.models import MTSignalsModel
+from mint.models.utils.mtValidationState import MTValidationState
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+from mint.tests.benchmark import benchmark
+
+
+def make_row(ds="codacuda", variable="Signal:A", stack="1.1", row_span="", envelope="", alias="", x="",
+             plot_type="PlotXY"):
+    return [ds, variable, stack, row_span, "", envelope, alias, "", "", "", x, "", "", "", plot_type, "", ""]
+
+
+class TestMTTableValidator(QAppOffscreenTestAdapter):
+
+    def setUp(self) -> None:
+        super().setUp()
+        AppDataAccess.initialize()
+        self.model = MTSignalsModel()
+        self.model.data_sources = ["codacuda"]
+
+    def invalid_cells(self):
+        codes = self.model._validation.codes[:len(self.model._store)]
+        return sorted((int(r), self.model._store.columns[c]) for r, c in zip(*codes.nonzero()))
+
+    def test_rules(self) -> None:
+        self.model.import_dict({"table": [
+            make_row(),
+            make_row(ds="", stack="1.x"),
+            make_row(ds="unknown", row_span="11", envelope="2"),
+            make_row(row_span="0", alias="a", plot_type="PlotBar"),
+            make_row(row_span="-1", alias="a", x="${a}.time +"),
+            make_row(variable="", x="${a}.time", stack="2.1"),
+        ]})
+        self.assertEqual(self.model.validate_table(["2.1"]), 12)
+        self.assertEqual(self.invalid_cells(), [
+            (1, 'DS'), (1, 'Stack'),
+            (2, 'DS'), (2, 'Envelope'), (2, 'Row span'),
+            (3, 'Plot type'), (3, 'Row span'),
+            (4, 'Alias'), (4, 'Row span'), (4, 'x'),
+            (5, 'Alias'), (5, 'Stack')])
+
+        tooltip = self.model.data(self.model.index(2, 3), Qt.ItemDataRole.ToolTipRole)
+        self.assertEqual(tooltip, "Invalid value for 'Row span': the value exceeds the maximum limit of 10 in the "
+                                  "table row [3]")
+        self.assertIn("must be numeric", self.model.data(self.model.index(3, 3), Qt.ItemDataRole.ToolTipRole))
+        self.assertIn("greater than 0", self.model.data(self.model.index(4, 3), Qt.ItemDataRole.ToolTipRole))
+
+        # Validating a subset only touches these rows
+        self.model.setData(self.model.index(1, 0), "codacuda", Qt.ItemDataRole.EditRole)
+        self.model.validate_table(rows=[1])
+        self.assertNotIn((1, 'DS'), self.invalid_cells())
+        self.assertIn((2, 'DS'), self.invalid_cells())
+        self.assertEqual(self.model._validation.code(1, self.model._store.loc('Stack')), MTValidationState.ERROR)
+
+    def import_10k_rows(self) -> int:
+        n_rows = 10000
+        self.model.import_dict({"table": [make_row(variable=f"Signal:{i}", stack=f"{i % 9 + 1}.1",
+                                                   alias=f"a{i}" if i % 2 else "") for i in range(n_rows)]})
+        return n_rows
+
+    def test_10k_rows(self) -> None:
+        self.import_10k_rows()
+        self.assertEqual(self.model.validate_table(), 0)
+        self.assertEqual(self.invalid_cells(), [])
+
+    @benchmark
+    def test_benchmark_10k_rows(self) -> None:
+        n_rows = self.import_10k_rows()
+        # The first expression parse imports the processing modules
+        self.model.validate_table(rows=[0])
+        start = time.perf_counter()
+        self.model.validate_table()
+        print(f"Validated {n_rows} rows in {time.perf_counter() - start:.3f}s")
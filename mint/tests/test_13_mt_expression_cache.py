@@ -0,0 +1,46 @@
+# Description: Checks the memo of parsed expressions shared by the validation, the build and the export.
+import unittest
+
+from iplotProcessing.tools import Parser
+
+from mint.models.utils.mtExpressionCache import MTExpressionCache
+
+
+class TestMTExpressionCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache = MTExpressionCache(maxsize=2)
+
+    def test_parse(self) -> None:
+        entry = self.cache.parse("${a}.time + ${b}.data")
+        self.assertTrue(entry.valid)
+        self.assertEqual(entry.variables, ("a", "b"))
+        self.assertEqual(entry.dependencies, {"a", "b"})
+
+        entry = self.cache.parse("${a}.time +")
+        self.assertFalse(entry.valid)
+        self.assertEqual(entry.dependencies, {"a"})
+        self.assertTrue(entry.error)
+
+        self.assertFalse(self.cache.is_valid("Signal:A"))
+        self.assertFalse(self.cache.is_valid(""))
+        self.assertEqual(self.cache.dependencies(["${a}.time", "${c}.data", ""]), {"a", "c"})
+
+    def test_lru(self) -> None:
+        self.cache.parse("${a}.time")
+        self.cache.parse("${b}.time")
+        self.cache.parse("${a}.time")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+        # The least recently used entry goes first
+        self.cache.parse("${c}.time")
+        self.assertEqual(len(self.cache), 2)
+        self.cache.parse("${a}.time")
+        self.assertEqual(self.cache.hits, 2)
+        self.cache.parse("${b}.time")
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_new_members(self) -> None:
+        self.assertFalse(self.cache.is_valid("${a}.time + mt_test_offset"))
+        Parser().inject({"mt_test_offset": 1})
+        self.assertTrue(self.cache.is_valid("${a}.time + mt_test_offset"))
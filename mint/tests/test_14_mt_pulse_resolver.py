@@ -0,0 +1,87 @@
+# Description: Checks that the pulses of a table are resolved once per data source and kept for a while.
+import unittest
+
+import pandas as pd
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.models import MTSignalsModel
+from mint.models.utils.mtPulseResolver import MTPulseResolver, split_pulse
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+
+
+class LocalDataSource:
+    """Stand-in for a data source with a fixed list of pulses."""
+
+    def __init__(self, pulses):
+        self.pulses = pulses
+        self.patterns = []
+
+    def get_pulses_df(self, pattern):
+        self.patterns.append(pattern)
+        return pd.DataFrame({'Pulse': [pulse for pulse in self.pulses if pulse == pattern]})
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+class TestMTPulseResolver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sources = {"ds1": LocalDataSource(["p1", "p2"]), "ds2": LocalDataSource(["p3"])}
+        self.clock = FakeClock()
+        self.resolver = MTPulseResolver(ttl=10., missing_ttl=1., data_source=self.sources.get, clock=self.clock)
+
+    def test_split_pulse(self) -> None:
+        self.assertEqual(split_pulse("+(p1)"), ("p1", 0))
+        self.assertEqual(split_pulse("-(p1)"), ("p1", 1))
+        self.assertEqual(split_pulse("p1"), ("p1", 2))
+
+    def test_resolve(self) -> None:
+        found = self.resolver.resolve([("ds1", "p1"), ("ds1", "p1"), ("ds1", "p9"), ("ds2", "p3")])
+        self.assertEqual(found, {("ds1", "p1"): True, ("ds1", "p9"): False, ("ds2", "p3"): True})
+        self.assertEqual(self.sources["ds1"].patterns, ["p1", "p9"])
+        self.assertEqual(self.resolver.queries, 3)
+
+        # Cached answers do not reach the data sources
+        self.assertTrue(self.resolver.exists("ds1", "p1"))
+        self.assertFalse(self.resolver.exists("ds1", "p9"))
+        self.assertEqual(self.resolver.queries, 3)
+
+        # Missing pulses expire first
+        self.clock.now = 2.
+        self.sources["ds1"].pulses.append("p9")
+        self.assertTrue(self.resolver.exists("ds1", "p9"))
+        self.assertTrue(self.resolver.exists("ds1", "p1"))
+        self.assertEqual(self.resolver.queries, 4)
+
+        self.clock.now = 11.
+        self.assertTrue(self.resolver.exists("ds1", "p1"))
+        self.assertEqual(self.resolver.queries, 5)
+
+        self.resolver.clear("ds2")
+        self.assertEqual(len(self.resolver), 2)
+
+
+class TestMTResolvePulses(QAppOffscreenTestAdapter):
+
+    def test_table(self) -> None:
+        AppDataAccess.initialize()
+        model = MTSignalsModel()
+        model.data_sources = ["ds1"]
+        source = LocalDataSource(["p1", "p2"])
+        model._pulses = MTPulseResolver(data_source={"ds1": source}.get)
+        model.import_dict({"table": [
+            ["ds1", "Signal:A", "1.1", "", "", "", "", "p1, p2", "", "", "", "", "", "", "PlotXY", "", ""],
+            ["ds1", "Signal:B", "1.2", "", "", "", "", "+(p2), -(p1), p3", "", "", "", "", "", "", "PlotXY", "", ""],
+            ["ds2", "Signal:C", "1.3", "", "", "", "", "p4", "", "", "", "", "", "", "PlotXY", "", ""]]})
+
+        self.assertEqual(model.resolve_pulses(), 1)
+        self.assertEqual(sorted(source.patterns), ["p1", "p2", "p3"])
+        model.resolve_pulses()
+        self.assertEqual(len(source.patterns), 3)
@@ -0,0 +1,78 @@
+# Description: Checks the build order, the levels and the cycles of the dependency graph between rows.
+import unittest
+from unittest.mock import patch
+
+from iplotDataAccess.dataSource import DataSource
+from iplotDataAccess.appDataAccess import AppDataAccess
+from mint.gui.mtSignalConfigurator import MTSignalConfigurator
+from mint.models.utils.mtBuildScheduler import MTBuildScheduler
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+
+
+class TestMTBuildScheduler(unittest.TestCase):
+
+    def test_order_and_levels(self) -> None:
+        scheduler = MTBuildScheduler()
+        scheduler.add_edge(0, 2)
+        scheduler.add_row(1)
+        scheduler.add_edge(3, 0)
+        scheduler.add_edge(3, 1)
+        self.assertEqual(scheduler.rows, [2, 0, 1, 3])
+        self.assertEqual(scheduler.order(), [2, 0, 1, 3])
+        self.assertEqual(scheduler.levels(), [[2, 1], [0], [3]])
+        self.assertEqual(scheduler.cycles(), [])
+
+    def test_long_chain(self) -> None:
+        scheduler = MTBuildScheduler()
+        for row in range(20000):
+            scheduler.add_edge(row, row + 1)
+        self.assertEqual(scheduler.order(), list(range(20000, -1, -1)))
+        self.assertEqual(len(scheduler.levels()), 20001)
+        self.assertEqual(scheduler.cycles(), [])
+
+    def test_cycles(self) -> None:
+        scheduler = MTBuildScheduler()
+        # 0 -> 1 -> 2 -> 0, 3 uses the cycle, 4 -> 5 -> 4, 6 is free
+        for row, dependency in [(0, 1), (1, 2), (2, 0), (3, 0), (4, 5), (5, 4)]:
+            scheduler.add_edge(row, dependency)
+        scheduler.add_row(6)
+        self.assertEqual(scheduler.cycles(), [[0, 1, 2], [4, 5]])
+        self.assertEqual(scheduler.levels(), [[6]])
+        self.assertEqual(sorted(scheduler.order()), list(range(7)))
+
+
+test_table = {
+    "table": [
+        ["codacuda", "", "1.1", "", "", "", "a", "", "", "", "${b}.time", "${b}.data", "", "", "PlotXY", "", ""],
+        ["codacuda", "", "1.2", "", "", "", "b", "", "", "", "${c}.time", "${c}.data", "", "", "PlotXY", "", ""],
+        ["codacuda", "", "1.3", "", "", "", "c", "", "", "", "${a}.time", "${a}.data", "", "", "PlotXY", "", ""],
+        ["codacuda", "Signal:D", "2.1", "", "", "", "d", "", "", "", "", "", "", "", "PlotXY", "", ""]]
+}
+
+
+class TestMTBuildCycles(QAppOffscreenTestAdapter):
+
+    @patch.object(DataSource, "connected", new=True, create=True)
+    @patch("iplotDataAccess.dataAccess.DataSource.get_cbs_dict")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_var_fields")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_pulses_df")
+    @patch("iplotDataAccess.dataAccess.DataSource.connect")
+    def test_build_aborts(self, source_connected, pulse_list, var_fields, cbs_dict) -> None:
+        source_connected.return_value = True
+        var_fields.return_value = {}
+        pulse_list.return_value = []
+        cbs_dict.return_value = {}
+
+        if not AppDataAccess.initialize():
+            return
+        sig_cfg_widget = MTSignalConfigurator()
+        sig_cfg_widget.import_dict(test_table)
+        aborted = []
+        sig_cfg_widget.buildAborted.connect(aborted.append)
+
+        self.assertEqual(list(sig_cfg_widget.build()), [])
+        self.assertEqual(len(aborted), 1)
+        for row, alias in [(1, "b"), (2, "c"), (3, "a")]:
+            self.assertIn(f"Conflicted row: {row} , circular dependency with alias '{alias}' between the rows "
+                          f"[1, 2, 3]", aborted[0])
+        self.assertNotIn("Conflicted row: 4", aborted[0])
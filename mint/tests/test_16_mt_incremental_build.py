@@ -0,0 +1,78 @@
+# Description: Checks that a build reuses the waypoints and signals of the rows that did not change.
+from unittest.mock import patch
+
+from PySide6.QtCore import Qt
+
+from iplotDataAccess.dataSource import DataSource
+from iplotDataAccess.appDataAccess import AppDataAccess
+from iplotlib.interface.iplotSignalAdapter import ParserHelper, Result
+from mint.gui.mtSignalConfigurator import MTSignalConfigurator
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+
+test_table = {
+    "table": [
+        ["codacuda", "", "1.1", "", "", "", "c", "", "", "", "${a}.time", "${a}.data", "", "", "PlotXY", "", ""],
+        ["codacuda", "Signal:A", "1.2", "", "", "", "a", "", "", "", "", "", "", "", "PlotXY", "", ""],
+        ["codacuda", "Signal:B", "2.1", "", "", "", "b", "", "", "", "", "", "", "", "PlotXY", "", ""]]
+}
+
+
+class TestMTIncrementalBuild(QAppOffscreenTestAdapter):
+
+    def signals(self, **kwargs):
+        ParserHelper.env.clear()
+        return {waypoint.idx: waypoint.create() for waypoint in self.sig_cfg_widget.build(**kwargs)}
+
+    @patch.object(DataSource, "connected", new=True, create=True)
+    @patch("iplotDataAccess.dataAccess.DataSource.get_cbs_dict")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_var_fields")
+    @patch("iplotDataAccess.dataAccess.DataSource.get_pulses_df")
+    @patch("iplotDataAccess.dataAccess.DataSource.connect")
+    def test_rebuild(self, source_connected, pulse_list, var_fields, cbs_dict) -> None:
+        source_connected.return_value = True
+        var_fields.return_value = {}
+        pulse_list.return_value = []
+        cbs_dict.return_value = {}
+
+        if not AppDataAccess.initialize():
+            return
+        self.sig_cfg_widget = MTSignalConfigurator()
+        self.sig_cfg_widget.import_dict(test_table)
+        model = self.sig_cfg_widget.model
+
+        first = self.signals(ts_start=0, ts_end=10)
+        self.assertEqual(sorted(first), [0, 1, 2])
+
+        # Nothing changed: the same signals
+        with patch.object(model, "_parse_series") as parse_series:
+            second = self.signals(ts_start=0, ts_end=10)
+            parse_series.assert_not_called()
+        self.assertTrue(all(second[idx] is first[idx] for idx in first))
+        self.assertIs(ParserHelper.env["a"], first[1])
+
+        # The row of alias 'a' and the row using it are rebuilt
+        model.setData(model.index(1, 1), "Signal:A2", Qt.ItemDataRole.EditRole)
+        third = self.signals(ts_start=0, ts_end=10)
+        self.assertIsNot(third[0], first[0])
+        self.assertIsNot(third[1], first[1])
+        self.assertIs(third[2], first[2])
+        self.assertEqual(third[1].name, "Signal:A2")
+
+        # A zoom changes the range of the signal, it is created again
+        third[2].ts_end = 5
+        fourth = self.signals(ts_start=0, ts_end=10)
+        self.assertIsNot(fourth[2], third[2])
+        self.assertIs(fourth[1], third[1])
+
+        # A failed signal is tried again
+        fourth[2].status_info.result = Result.FAIL
+        self.assertIsNot(self.signals(ts_start=0, ts_end=10)[2], fourth[2])
+
+        # The global range applies to every row
+        fifth = self.signals(ts_start=0, ts_end=20)
+        self.assertTrue(all(fifth[idx] is not fourth[idx] for idx in fourth))
+
+        # Removed rows are forgotten
+        model.removeRows(2, 1)
+        self.signals(ts_start=0, ts_end=20)
+        self.assertEqual(len(model._built), 2)
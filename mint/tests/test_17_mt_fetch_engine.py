@@ -0,0 +1,116 @@
+# Description: Checks and benchmarks the parallel data access of a build against a data source with injected latency.
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from iplotlib.core import SignalXY
+from iplotlib.interface.iplotSignalAdapter import Result
+from mint.tests.benchmark import benchmark
+from mint.tools.fetch_engine import FetchEngine
+
+
+class LatencyDataSource:
+    """Stand-in for the data access layer, every request takes `latency` seconds."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.active = dict()
+        self.max_active = dict()
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def request(self, **params) -> dict:
+        name = params['data_s_name']
+        with self._lock:
+            self.active[name] = self.active.get(name, 0) + 1
+            self.max_active[name] = max(self.max_active.get(name, 0), self.active[name])
+            self.requests.append(params['varname'])
+        try:
+            time.sleep(self.latency)
+            if params['varname'] == 'Signal:missing':
+                raise RuntimeError("Variable not found")
+            return dict(alias_map={'time': {'idx': 0, 'independent': True}, 'data': {'idx': 1}},
+                        d0=np.arange(10), d1=np.arange(10) * 2., d2=np.zeros(0), d3=np.zeros(0), isds=False)
+        finally:
+            with self._lock:
+                self.active[name] -= 1
+
+
+def make_signals(count: int):
+    return [SignalXY(name=f"Signal:{i}", data_source=f"ds{i % 2}", ts_start=0, ts_end=10) for i in range(count)]
+
+
+class TestFetchEngine(unittest.TestCase):
+
+    def test_results(self) -> None:
+        source = LatencyDataSource(0.01)
+        engine = FetchEngine(max_workers=4, max_per_source=2, request=source.request)
+        first = make_signals(3)
+        failing = SignalXY(name="Signal:missing", data_source="ds0", ts_start=0, ts_end=10)
+        done = []
+        self.assertEqual(engine.fetch([first, [failing]], on_done=done.append), 4)
+        engine.shutdown()
+
+        self.assertEqual(done[-1], failing)
+        self.assertEqual(set(map(id, done[:3])), set(map(id, first)))
+        self.assertEqual(first[0].status_info.result, Result.SUCCESS)
+        self.assertEqual(list(first[0].y_data), list(np.arange(10) * 2.))
+        self.assertEqual(failing.status_info.result, Result.FAIL)
+        self.assertIn("Variable not found for the signal: Signal:missing", failing.status_info.msg)
+
+        # Data is not fetched again for the same range
+        self.assertEqual(engine.fetch([first]), 0)
+        self.assertEqual(len(source.requests), 4)
+        engine.shutdown()
+
+    def test_cancel(self) -> None:
+        source = LatencyDataSource(0.05)
+        engine = FetchEngine(max_workers=1, request=source.request)
+        first, second = make_signals(2), make_signals(2)
+        notified = threading.Semaphore(0)
+        job = engine.submit([first, second], notify=notified.release)
+        self.assertEqual(job.total, 4)
+        self.assertFalse(job.apply())
+
+        # Wait for the first request, the second one is running
+        notified.acquire()
+        job.cancel()
+        self.assertTrue(job.apply())
+        self.assertTrue(job.cancelled)
+        self.assertEqual(job.applied, 0)
+        engine.shutdown()
+
+        # Dropped results are not applied, the next fetch accesses all the signals again
+        self.assertLess(len(source.requests), 4)
+        self.assertTrue(all(signal.status_info.result != Result.SUCCESS for signal in first + second))
+        self.assertEqual(engine.fetch([first, second]), 4)
+        self.assertTrue(all(signal.status_info.result == Result.SUCCESS for signal in first + second))
+        engine.shutdown()
+
+    def fetch(self, n_signals: int, latency: float, max_workers: int) -> float:
+        """Fetches the signals in two levels, returns the time taken."""
+        source = LatencyDataSource(latency)
+        engine = FetchEngine(max_workers=max_workers, max_per_source=4, request=source.request)
+        signals = make_signals(n_signals)
+        start = time.perf_counter()
+        engine.fetch([signals[:n_signals // 2], signals[n_signals // 2:]])
+        elapsed = time.perf_counter() - start
+        engine.shutdown()
+        self.assertTrue(all(signal.status_info.result == Result.SUCCESS for signal in signals))
+        self.assertEqual(sorted(source.requests), sorted(signal.name for signal in signals))
+        self.assertLessEqual(max(source.max_active.values()), min(max_workers, 4))
+        return elapsed
+
+    def test_concurrency(self) -> None:
+        for max_workers in (1, 8):
+            self.fetch(40, 0.002, max_workers)
+
+    @benchmark
+    def test_benchmark(self) -> None:
+        latency = 0.02
+        n_signals = 40
+        timings = {max_workers: self.fetch(n_signals, latency, max_workers) for max_workers in (1, 8)}
+        print(f"Fetched {n_signals} signals with {latency * 1000:.0f}ms latency: {timings[1]:.3f}s sequential, "
+              f"{timings[8]:.3f}s with 8 workers")
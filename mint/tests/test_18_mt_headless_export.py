@@ -0,0 +1,140 @@
+# Description: Checks that the canvas exported without a window (mint -w ... -e ...) holds the data of the build, which
+#              is retrieved in the background.
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from iplotDataAccess.appDataAccess import AppDataAccess
+from iplotlib.core import Canvas
+from iplotlib.impl.matplotlib.matplotlibCanvas import MatplotlibParser
+from mint.gui.mtMainWindow import MTMainWindow
+from mint.models import MTGenericAccessMode
+from mint.tests.QAppOffscreenTestAdapter import QAppOffscreenTestAdapter
+from mint.tools.fetch_engine import FetchEngine
+
+test_table = {
+    "table": [
+        ["codacuda", "Signal:A", "1.1", "", "", "", "a", "", "", "", "", "", "", "", "PlotXY", "", ""],
+        ["codacuda", "Signal:B", "2.1", "", "", "", "", "", "", "", "", "", "", "", "PlotXY", "", ""],
+        ["codacuda", "", "3.1", "", "", "", "c", "", "", "", "${a}.time", "${a}.data * 2", "", "", "PlotXY", "", ""]]
+}
+
+
+class SlowDataSource:
+    """Stand-in for the data access layer, every request takes `latency` seconds."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def request(self, **params) -> dict:
+        with self._lock:
+            self.requests.append(params['varname'])
+        time.sleep(self.latency)
+        # Ten samples over the requested range
+        stamps = np.linspace(params['tsS'], params['tsE'], 10).astype(np.int64)
+        return dict(alias_map={'time': {'idx': 0, 'independent': True}, 'data': {'idx': 1}},
+                    d0=stamps, d1=np.arange(10) * 1., d2=np.zeros(0), d3=np.zeros(0), isds=False)
+
+
+def plotted_signals(canvas: Canvas):
+    return [signal for column in canvas.plots for plot in column if plot
+            for stack in plot.signals.values() for signal in stack]
+
+
+class MainWindowTestCase(QAppOffscreenTestAdapter):
+    """Main window whose data access requests are answered by SlowDataSource."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        # A local data source, its requests are answered by SlowDataSource
+        config = os.path.join(self.directory.name, "sources.cfg")
+        with open(config, "w") as f:
+            json.dump({"codacuda": {"type": "CSV", "path": self.directory.name, "default": True}}, f)
+        self.assertTrue(AppDataAccess.initialize(config))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def window(self, latency: float = 0.05) -> MTMainWindow:
+        now = datetime.utcnow()
+        time_model = {"range": {"mode": MTGenericAccessMode.TIME_RANGE,
+                                "value": [(now - timedelta(days=1)).isoformat(timespec='seconds'),
+                                          now.isoformat(timespec='seconds')]}}
+        self.source = SlowDataSource(latency)
+        return MTMainWindow(Canvas(), AppDataAccess.get_data_access(), time_model, app_version="test",
+                            data_dir=self.directory.name, data_sources=["codacuda"],
+                            fetch_engine=FetchEngine(request=self.source.request))
+
+    def export(self, canvas: Canvas) -> list:
+        parser = MatplotlibParser()
+        file_path = os.path.join(self.directory.name, "canvas.png")
+        parser.export_image(file_path, canvas=canvas, dpi=100, width=800, height=600)
+        self.assertGreater(os.path.getsize(file_path), 0)
+        return [line.get_ydata() for axes in parser.figure.axes for line in axes.get_lines()]
+
+
+class TestMTHeadlessExport(MainWindowTestCase):
+
+    def test_build_and_export(self) -> None:
+        window = self.window()
+        window.sigCfgWidget.import_dict(test_table)
+
+        # The build returns while the data is retrieved, the export waits for it
+        window.draw_clicked()
+        self.assertTrue(window.is_building())
+        window.finish_build()
+        self.assertFalse(window.is_building())
+
+        signals = plotted_signals(window.canvas)
+        self.assertEqual(len(signals), 3)
+        self.assertTrue(all(len(signal.y_data) == 10 for signal in signals))
+        self.assertEqual(list(signals[-1].y_data), list(np.arange(10) * 2.))
+        lines = self.export(window.canvas)
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(len(line) == 10 for line in lines))
+        self.assertEqual(sorted(self.source.requests), ["Signal:A", "Signal:B"])
+        window.fetchEngine.shutdown()
+
+    def test_edit_during_fetch(self) -> None:
+        window = self.window()
+        window.sigCfgWidget.import_dict(test_table)
+        model = window.sigCfgWidget.model
+
+        # The table stays editable while the data is retrieved, the statuses follow their rows
+        window.draw_clicked()
+        self.assertTrue(window.is_building())
+        model.insertRows(0, 2)
+        model.removeRows(3, 1)
+        window.finish_build()
+
+        statuses = model.get_dataframe()['Status'].tolist()
+        self.assertEqual(len(statuses), 4)
+        self.assertEqual(statuses[:2], ["", ""])
+        self.assertTrue(all(status.startswith("Success") for status in statuses[2:]))
+        self.assertEqual(len(plotted_signals(window.canvas)), 3)
+        window.fetchEngine.shutdown()
+
+    def test_remove_during_fetch(self) -> None:
+        window = self.window()
+        window.sigCfgWidget.import_dict(test_table)
+        model = window.sigCfgWidget.model
+
+        window.draw_clicked()
+        self.assertTrue(window.is_building())
+        model.removeRows(0, model.rowCount())
+        window.finish_build()
+
+        # The canvas of the build is drawn and the window is ready for the next one
+        self.assertFalse(window.is_building())
+        self.assertTrue(window.drawBtn.isEnabled())
+        self.assertEqual(len(plotted_signals(window.canvas)), 3)
+        window.fetchEngine.shutdown()
@@ -0,0 +1,74 @@
+# Description: Checks the x range recorded on the signals when their data is retrieved.
+import time
+import typing
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from iplotlib.core import SignalXY
+from mint.tests.benchmark import benchmark
+from mint.tests.test_17_mt_fetch_engine import LatencyDataSource
+from mint.tools import axis_info
+from mint.tools.axis_info import DATE_THRESHOLD, AxisInfo, x_axis_info
+from mint.tools.fetch_engine import FetchEngine
+
+
+class TestAxisInfo(unittest.TestCase):
+
+    def test_axis_info(self) -> None:
+        now = 1700000000000000000
+        self.assertEqual(axis_info.axis_info(np.array([now + 5, now])), AxisInfo(now, now + 5, True))
+        self.assertEqual(axis_info.axis_info(np.array([3., np.nan, 1.])), AxisInfo(1., 3., False))
+        self.assertEqual(axis_info.axis_info(np.array([DATE_THRESHOLD])).is_date, False)
+        self.assertEqual(axis_info.axis_info(np.zeros(0)), axis_info.EMPTY_AXIS)
+        self.assertIsNone(axis_info.axis_info(np.zeros((2, 2))).is_date)
+
+    def test_recorded_once(self) -> None:
+        signal = SignalXY(name="Signal:A")
+        signal.x_data = np.arange(10.)
+        self.assertEqual(x_axis_info(signal), AxisInfo(0., 9., False))
+        with patch.object(axis_info, "axis_info") as compute:
+            x_axis_info(signal)
+            compute.assert_not_called()
+
+        # New data, new range
+        signal.x_data = np.arange(5., 15.)
+        self.assertEqual(x_axis_info(signal).end, 14.)
+
+    def test_recorded_at_fetch(self) -> None:
+        engine = FetchEngine(request=LatencyDataSource(0.).request)
+        signal = SignalXY(name="Signal:A", data_source="ds0", ts_start=0, ts_end=10)
+        engine.fetch([[signal]])
+        engine.shutdown()
+        with patch.object(axis_info, "axis_info") as compute:
+            self.assertEqual(x_axis_info(signal), AxisInfo(0, 9, False))
+            compute.assert_not_called()
+
+    def date_detection(self, n_samples: int) -> typing.Tuple[float, float]:
+        """Detects the date x axis of 20 signals from their data and from their recorded x range."""
+        signals = []
+        for i in range(20):
+            signal = SignalXY(name=f"Signal:{i}")
+            signal.x_data = np.arange(n_samples, dtype=np.int64) + 1700000000000000000
+            signals.append(signal)
+
+        start = time.perf_counter()
+        legacy = [bool(min(signal.x_data) > (1 << 53)) for signal in signals]
+        elapsed_legacy = time.perf_counter() - start
+
+        for signal in signals:
+            axis_info.record_x_axis(signal)
+        start = time.perf_counter()
+        recorded = [x_axis_info(signal).is_date for signal in signals]
+        elapsed = time.perf_counter() - start
+        self.assertEqual(recorded, legacy)
+        return elapsed_legacy, elapsed
+
+    def test_same_as_min(self) -> None:
+        self.date_detection(1000)
+
+    @benchmark
+    def test_benchmark(self) -> None:
+        elapsed_legacy, elapsed = self.date_detection(200000)
+        print(f"Date detection of 20 signals: {elapsed_legacy:.3f}s with min(), {elapsed:.6f}s recorded")
@@ -0,0 +1,117 @@
+# Description: Checks that a build patches the plots of the previous canvas and keeps the preferences, as Canvas.merge.
+import json
+import os
+import time
+import typing
+import unittest
+
+import numpy as np
+
+from iplotlib.core.axis import LinearAxis
+from iplotlib.core.canvas import Canvas
+from iplotlib.core.plot import PlotContour, PlotXY
+from iplotlib.core.signal import SignalXY
+from mint.tests.benchmark import benchmark
+from mint.tools.canvas_reconciler import CanvasReconciler
+
+
+def make_signal(uid: str, name: str) -> SignalXY:
+    return SignalXY(uid=uid, name=name, label=name)
+
+
+class TestCanvasReconciler(unittest.TestCase):
+
+    def build(self, canvas: Canvas, layout: dict, plot_class=PlotXY) -> CanvasReconciler:
+        """layout: (col, row) -> signals, on one stack"""
+        reconciler = CanvasReconciler(canvas.plots)
+        canvas.cols = max(col for col, _ in layout)
+        canvas.rows = max(row for _, row in layout)
+        canvas.plots = [[] for _ in range(canvas.cols)]
+        for (col, row), signals in sorted(layout.items()):
+            plot = reconciler.plot(plot_class, col, row, LinearAxis(begin=0, end=10), [LinearAxis()], 1, 1,
+                                   {1: signals})
+            canvas.add_plot(plot, col=col - 1)
+        return reconciler
+
+    def test_preferences(self) -> None:
+        canvas = Canvas(rows=2, cols=1)
+        a, b = make_signal("1", "Signal:A"), make_signal("2", "Signal:B")
+        self.build(canvas, {(1, 1): [a], (1, 2): [b]})
+        top, bottom = canvas.plots[0]
+        top.plot_title = "Top"
+        top.axes[1][0].label = "Volts"
+        top.axes[0].limits_changed = True
+        top.axes[0].begin, top.axes[0].end = 2, 5
+        b.color, b.new_color, b.line_size = "#000000", True, 3
+
+        # The signal B is created again, and moves to the top plot
+        b2 = make_signal("2", "Signal:B")
+        reconciler = self.build(canvas, {(1, 1): [a, b2], (1, 2): [make_signal("3", "Signal:C")]})
+        self.assertEqual(reconciler.kept, 2)
+        self.assertIs(canvas.plots[0][0], top)
+        self.assertIs(canvas.plots[0][1], bottom)
+        self.assertEqual(top.plot_title, "Top")
+        self.assertEqual(top.axes[1][0].label, "Volts")
+        self.assertEqual((top.axes[0].begin, top.axes[0].end), (2, 5))
+        self.assertEqual(top.signals[1], [a, b2])
+        self.assertIs(b2.parent(), top)
+        self.assertIs(top.axes[0].parent(), top)
+        self.assertEqual((b2.color, b2.line_size), ("#000000", 3))
+        # Colors are given as in a new plot
+        self.assertEqual(canvas.plots[0][1].signals[1][0].color, PlotXY._color_cycle[0])
+
+        # Another type of plot is not kept
+        reconciler = self.build(canvas, {(1, 1): [a]}, plot_class=PlotContour)
+        self.assertEqual(reconciler.kept, 0)
+        self.assertIsNot(canvas.plots[0][0], top)
+
+    def rebuild_large_canvas(self, n_samples: int) -> typing.Tuple[float, float]:
+        """Rebuilds largeCanvas100.json with Canvas.merge and with the reconciler, returns the time taken by each."""
+        path = os.path.join(os.path.dirname(__file__), "..", "data", "workspaces", "largeCanvas100.json")
+        with open(path) as f:
+            workspace = json.load(f)
+        canvas = Canvas.from_dict(workspace["main_canvas"])
+        specs = dict()
+        for col, column in enumerate(canvas.plots):
+            for row, plot in enumerate(column):
+                plot.plot_title = f"Plot {col}.{row}"
+                plot.axes[1][0].label = "Volts"
+                signals = [signal for stack in plot.signals.values() for signal in stack]
+                for i, signal in enumerate(signals):
+                    signal.uid = f"{col}.{row}.{i}"
+                    signal.line_size = 3
+                    signal.data_store[0] = np.arange(n_samples)
+                    signal.data_store[1] = np.random.random(n_samples)
+                specs[(col + 1, row + 1)] = [(signal.uid, signal.name) for signal in signals]
+
+        def layout():
+            return {place: [make_signal(*spec) for spec in signals] for place, signals in specs.items()}
+
+        start = time.perf_counter()
+        old_canvas = canvas.to_dict()
+        merged = Canvas(rows=canvas.rows, cols=canvas.cols)
+        self.build(merged, layout())
+        merged.merge(old_canvas)
+        elapsed_merge = time.perf_counter() - start
+
+        reconciled = layout()
+        start = time.perf_counter()
+        reconciler = self.build(canvas, reconciled)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(reconciler.kept, 40)
+        for column, merged_column in zip(canvas.plots, merged.plots):
+            for plot, merged_plot in zip(column, merged_column):
+                self.assertEqual(plot.plot_title, merged_plot.plot_title)
+                self.assertEqual(plot.axes[1][0].label, merged_plot.axes[1][0].label)
+                self.assertEqual([signal.line_size for signal in plot.signals[1]],
+                                 [signal.line_size for signal in merged_plot.signals[1]])
+        return elapsed_merge, elapsed
+
+    def test_same_as_merge(self) -> None:
+        self.rebuild_large_canvas(1000)
+
+    @benchmark
+    def test_benchmark(self) -> None:
+        elapsed_merge, elapsed = self.rebuild_large_canvas(100000)
+        print(f"Rebuilt 40 plots: {elapsed_merge:.3f}s with to_dict() and merge(), {elapsed:.3f}s reconciled")
@@ -0,0 +1,123 @@
+# Description: Checks that the refresh of a sliding window only fetches the tail of the data, and benchmarks it.
+import time
+import unittest
+
+import numpy as np
+
+from iplotlib.core import SignalXY
+from iplotlib.interface.iplotSignalAdapter import Result
+from mint.tests.benchmark import benchmark
+from mint.tools.fetch_engine import FetchEngine, data_key, seed_signal
+
+SECOND = 10 ** 9
+NOW = 1700000000 * SECOND
+
+
+class WindowDataSource:
+    """
+    Stand-in for the data access layer, one sample per second within the requested range, bounds included.
+    The samples of the last `lag` nanoseconds of the range have not reached the archive yet.
+    """
+
+    def __init__(self, lag: int = 0):
+        self.lag = lag
+        self.samples = 0
+        self.ranges = []
+
+    def request(self, **params) -> dict:
+        start, end = params['tsS'], params['tsE']
+        self.ranges.append((start, end))
+        time_ = np.arange(-(-start // SECOND), (end - self.lag) // SECOND + 1, dtype=np.int64) * SECOND
+        self.samples += len(time_)
+        return dict(alias_map={'time': {'idx': 0, 'independent': True}, 'data': {'idx': 1}},
+                    d0=time_, d1=(time_ - NOW) / SECOND, d2=np.zeros(0), d3=np.zeros(0), isds=False)
+
+
+def make_signal(ts_start: int, ts_end: int) -> SignalXY:
+    return SignalXY(uid="row", name="Signal:A", data_source="ds", ts_start=ts_start, ts_end=ts_end)
+
+
+class TestDeltaFetch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.source = WindowDataSource()
+        self.engine = FetchEngine(request=self.source.request)
+
+    def tearDown(self) -> None:
+        self.engine.shutdown()
+
+    def test_tail(self) -> None:
+        first = make_signal(NOW, NOW + 100 * SECOND)
+        self.engine.fetch([[first]])
+        self.assertEqual(len(first.data_store[0]), 101)
+
+        # The window slides by 10s, only the last 10s are fetched
+        second = make_signal(NOW + 10 * SECOND, NOW + 110 * SECOND)
+        self.engine.fetch([[second]], previous={data_key(first): first})
+        self.assertEqual(self.source.ranges[-1], (NOW + 100 * SECOND, NOW + 110 * SECOND))
+        self.assertEqual(second.status_info.result, Result.SUCCESS)
+        self.assertEqual(list(second.data_store[0]), list(np.arange(10, 111) * SECOND + NOW))
+        self.assertEqual(list(second.y_data), list(np.arange(10., 111.)))
+        # The previous signal is left as it was
+        self.assertEqual(len(first.data_store[0]), 101)
+
+        # The previous range does not cover the start of the window, all the data is fetched
+        zoomed = make_signal(NOW + 50 * SECOND, NOW + 100 * SECOND)
+        self.engine.fetch([[zoomed]])
+        third = make_signal(NOW + 20 * SECOND, NOW + 120 * SECOND)
+        self.engine.fetch([[third]], previous={data_key(zoomed): zoomed})
+        self.assertEqual(self.source.ranges[-1], (NOW + 20 * SECOND, NOW + 120 * SECOND))
+        self.assertEqual(len(third.data_store[0]), 101)
+
+    def test_archive_lag(self) -> None:
+        self.source.lag = 5 * SECOND
+        first = make_signal(NOW, NOW + 100 * SECOND)
+        self.engine.fetch([[first]])
+        self.assertEqual(first.data_store[0][-1], NOW + 95 * SECOND)
+
+        # The tail starts at the last sample held, the samples that reached the archive since are not missed
+        second = make_signal(NOW + 10 * SECOND, NOW + 110 * SECOND)
+        self.engine.fetch([[second]], previous={data_key(first): first})
+        self.assertEqual(self.source.ranges[-1], (NOW + 95 * SECOND, NOW + 110 * SECOND))
+        self.assertEqual(list(second.data_store[0]), list(np.arange(10, 106) * SECOND + NOW))
+
+        # Nothing to keep when the last sample held is before the window
+        third = make_signal(NOW + 100 * SECOND, NOW + 200 * SECOND)
+        self.assertIsNone(seed_signal(third, first))
+
+    def test_downsampled(self) -> None:
+        first = make_signal(NOW, NOW + 100 * SECOND)
+        self.engine.fetch([[first]])
+        first.isDownsampled = True
+
+        # The samples of a downsampled window depend on its range, all the data is fetched again
+        second = make_signal(NOW + 10 * SECOND, NOW + 110 * SECOND)
+        self.assertIsNone(seed_signal(second, first))
+        self.engine.fetch([[second]], previous={data_key(first): first})
+        self.assertEqual(self.source.ranges[-1], (NOW + 10 * SECOND, NOW + 110 * SECOND))
+        self.assertEqual(len(second.data_store[0]), 101)
+        self.assertFalse(second.isDownsampled)
+
+    @benchmark
+    def test_benchmark(self) -> None:
+        window = 7 * 24 * 3600 * SECOND
+        previous = make_signal(NOW - window, NOW)
+        self.engine.fetch([[previous]])
+
+        refreshed = make_signal(NOW + 60 * SECOND - window, NOW + 60 * SECOND)
+        self.source.samples = 0
+        start = time.perf_counter()
+        self.engine.fetch([[make_signal(refreshed.ts_start, refreshed.ts_end)]])
+        elapsed_full = time.perf_counter() - start
+        full_samples = self.source.samples
+
+        self.source.samples = 0
+        start = time.perf_counter()
+        self.engine.fetch([[refreshed]], previous={data_key(previous): previous})
+        elapsed = time.perf_counter() - start
+
+        print(f"Refresh of a 7 day window by 60s: {elapsed_full:.3f}s and {full_samples} samples fetched in full, "
+              f"{elapsed:.3f}s and {self.source.samples} samples fetched for the tail")
+        self.assertEqual(self.source.samples, 61)
+        self.assertEqual(len(refreshed.data_store[0]), 7 * 24 * 3600 + 1)
+        self.assertEqual(refreshed.data_store[0][-1], refreshed.ts_end)
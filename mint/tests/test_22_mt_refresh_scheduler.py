@@ -0,0 +1,116 @@
+# Description: Checks that the auto refresh never overlaps, backs off when the refreshes are slow and counts late ticks.
+import unittest
+from unittest.mock import patch
+
+from mint.tests.test_18_mt_headless_export import MainWindowTestCase, test_table
+from mint.tools.refresh_scheduler import RefreshScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRefreshScheduler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.scheduler = RefreshScheduler(clock=self.clock)
+        self.scheduler.start(10)
+
+    def refresh(self, latency: float):
+        self.clock.now += self.scheduler.delay()
+        self.assertTrue(self.scheduler.begin())
+        self.clock.now += latency
+        self.scheduler.end()
+
+    def test_keeps_up(self) -> None:
+        for _ in range(5):
+            self.refresh(1.)
+        self.assertEqual(self.scheduler.delay(), 9.)
+        self.assertEqual((self.scheduler.missed, self.scheduler.late), (0, 0))
+        self.assertEqual(self.scheduler.report(), '')
+
+    def test_no_overlap(self) -> None:
+        self.clock.now = 10.
+        self.assertTrue(self.scheduler.begin())
+        self.assertFalse(self.scheduler.begin())
+        self.scheduler.postpone()
+        self.assertEqual(self.scheduler.delay(), 10.)
+
+        # A cancelled refresh does not count in the latency
+        self.clock.now = 12.
+        self.scheduler.end(completed=False)
+        self.assertIsNone(self.scheduler.latency)
+        self.assertFalse(self.scheduler.in_flight)
+
+        # Stopped while in flight, the end of the refresh does not schedule anything
+        self.assertTrue(self.scheduler.begin())
+        self.scheduler.stop()
+        self.scheduler.end()
+        self.assertFalse(self.scheduler.begin())
+
+    def test_failed_refresh(self) -> None:
+        # A refresh that failed is over, it does not count in the latency and the next tick is one interval away
+        self.clock.now = 10.
+        self.assertTrue(self.scheduler.begin())
+        self.clock.now = 11.
+        self.scheduler.end(completed=False)
+        self.assertFalse(self.scheduler.in_flight)
+        self.assertIsNone(self.scheduler.latency)
+        self.assertEqual(self.scheduler.refreshes, 0)
+        self.assertEqual(self.scheduler.delay(), 9.)
+        self.refresh(1.)
+        self.assertEqual(self.scheduler.refreshes, 1)
+
+    def test_backoff(self) -> None:
+        # The data sources take 15s for a 10s interval
+        for _ in range(6):
+            self.refresh(15.)
+        self.assertEqual(self.scheduler.latency, 15.)
+        self.assertEqual(self.scheduler.effective_interval, 30.)
+        self.assertEqual(self.scheduler.delay(), 15.)
+        self.assertEqual(self.scheduler.late, 5)
+        self.assertEqual(self.scheduler.missed, 10)
+        self.assertEqual(self.scheduler.report(),
+                         "Refresh every 30s (set to 10s), takes 15.0s, 10 missed and 5 late tick(s)")
+
+        # Capped to 8 intervals
+        self.refresh(1000.)
+        self.assertEqual(self.scheduler.effective_interval, 80.)
+
+        # The data sources recover
+        for _ in range(10):
+            self.refresh(1.)
+        self.assertEqual(self.scheduler.effective_interval, 10.)
+
+
+class TestMTRefreshFailure(MainWindowTestCase):
+
+    def test_failed_refresh(self) -> None:
+        window = self.window()
+        window.sigCfgWidget.import_dict(test_table)
+        window.refreshScheduler.start(10)
+
+        # The canvas of the refresh can not be built, the auto refresh goes on
+        with patch.object(window, 'build_canvas', side_effect=RuntimeError("Broken canvas")):
+            window.on_timeout()
+            self.assertTrue(window.refreshScheduler.in_flight)
+            with self.assertRaises(RuntimeError):
+                window.finish_build()
+        self.assertFalse(window.is_building())
+        self.assertFalse(window.refreshScheduler.in_flight)
+        self.assertTrue(window.refreshTimer.isActive())
+        self.assertEqual(window.refreshScheduler.refreshes, 0)
+
+        # The next tick refreshes the canvas
+        window.on_timeout()
+        window.finish_build()
+        self.assertFalse(window.refreshScheduler.in_flight)
+        self.assertEqual(window.refreshScheduler.refreshes, 1)
+        window.refreshScheduler.stop()
+        window.refreshTimer.stop()
+        window.fetchEngine.shutdown()
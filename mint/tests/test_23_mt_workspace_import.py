@@ -0,0 +1,71 @@
+# Description: Checks that a workspace with alias and expression rows fetches each signal once when imported, and that
+#              its canvas is painted with their data before being exported.
+import json
+
+import numpy as np
+
+from mint.tests.test_18_mt_headless_export import MainWindowTestCase, plotted_signals, test_table
+from mint.tools.workspace_loader import SCHEMA_VERSION, load_workspace
+
+
+class TestMTWorkspaceImport(MainWindowTestCase):
+
+    def workspace(self) -> str:
+        window = self.window()
+        window.sigCfgWidget.import_dict(test_table)
+        window.draw_clicked()
+        window.finish_build()
+        workspace = {'_metadata': {'schemaVersion': SCHEMA_VERSION},
+                     'data_range': window.dataRangeSelector.export_dict(),
+                     'signal_cfg': window.sigCfgWidget.export_dict(),
+                     'main_canvas': window.canvasStack.currentWidget().export_dict()}
+        window.fetchEngine.shutdown()
+        return json.dumps(workspace)
+
+    def test_import_and_export(self) -> None:
+        payload = self.workspace()
+        # Slower than drawing the canvas of the workspace
+        window = self.window(latency=1.)
+        window.import_dict(load_workspace(payload))
+
+        # The canvas is drawn while the data is retrieved, the export waits for the import to complete
+        self.assertTrue(window.is_building())
+        window.finish_build()
+        self.assertFalse(window.is_building())
+
+        # The alias is fetched once, for its row and for the expression that uses it
+        self.assertEqual(sorted(self.source.requests), ["Signal:A", "Signal:B"])
+        signals = plotted_signals(window.canvas)
+        self.assertEqual(len(signals), 3)
+        self.assertTrue(all(len(signal.y_data) == 10 for signal in signals))
+        self.assertEqual(list(signals[-1].y_data), list(np.arange(10) * 2.))
+
+        # The table is updated by complete_import
+        model = window.sigCfgWidget.model
+        self.assertTrue(all(status.startswith("Success") for status in model.get_dataframe()['Status']))
+
+        # Painted on the canvas of the window and in the exported figure
+        painted = [line.get_ydata() for axes in window.canvasStack.currentWidget()._parser.figure.axes
+                   for line in axes.get_lines()]
+        self.assertEqual(len(painted), 3)
+        self.assertTrue(all(len(line) == 10 for line in painted))
+        lines = self.export(window.canvas)
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(len(line) == 10 for line in lines))
+        window.fetchEngine.shutdown()
+
+    def test_draw_after_import(self) -> None:
+        payload = self.workspace()
+        window = self.window()
+        window.import_dict(load_workspace(payload))
+        window.finish_build()
+        self.source.requests.clear()
+
+        # The imported signals are reused with their data while the table is unchanged
+        window.draw_clicked()
+        window.finish_build()
+        self.assertEqual(self.source.requests, [])
+        signals = plotted_signals(window.canvas)
+        self.assertEqual(len(signals), 3)
+        self.assertTrue(all(len(signal.y_data) == 10 for signal in signals))
+        window.fetchEngine.shutdown()
@@ -0,0 +1,82 @@
+# Description: Checks the workspace loader against the former text replacements and benchmarks both on the bundled
+#              workspaces.
+import json
+import os
+import time
+import unittest
+
+from mint.tests.benchmark import benchmark
+from mint.tools.workspace_loader import SCHEMA_VERSION, load_workspace
+
+WORKSPACES = os.path.join(os.path.dirname(__file__), os.pardir, "data", "workspaces")
+
+
+def replace_and_hook(payload: str) -> dict:
+    """The loader as it was, for comparison."""
+    payload = payload.replace("data_access.dataAccessSignal.DataAccessSignal",
+                              "interface.iplotSignalAdapter.IplotSignalAdapter")
+    for old, new in {'varname': 'name', 'datasource': 'data_source', 'pulsenb': 'pulse_nb',
+                     'time_model': 'data_range'}.items():
+        payload = payload.replace(old, new)
+    return json.loads(payload, object_hook=lambda d: {int(k) if k.lstrip('-').isdigit() else k: v
+                                                      for k, v in d.items()})
+
+
+class TestWorkspaceLoader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.payloads = dict()
+        for name in sorted(os.listdir(WORKSPACES)):
+            if name.endswith(".json"):
+                with open(os.path.join(WORKSPACES, name)) as f:
+                    self.payloads[name] = f.read()
+
+    def test_bundled(self) -> None:
+        for name, payload in self.payloads.items():
+            self.assertEqual(load_workspace(payload), replace_and_hook(payload), name)
+
+    def test_legacy(self) -> None:
+        legacy = {
+            "time_model": {"mode": "TIME_RANGE"},
+            "signal_cfg": {"model": {"blueprint": {"Variable": {"code_name": "varname"}}}},
+            "main_canvas": {"plots": [[{"signals": {"1": [{
+                "_type": "iplotlib.data_access.dataAccessSignal.DataAccessSignal",
+                "varname": "Signal:A", "datasource": "codacuda", "pulsenb": None}]}}]]}}
+        workspace = load_workspace(json.dumps(legacy))
+        self.assertEqual(workspace["data_range"], {"mode": "TIME_RANGE"})
+        self.assertEqual(workspace["signal_cfg"]["model"]["blueprint"]["Variable"]["code_name"], "name")
+        self.assertEqual(workspace["main_canvas"]["plots"][0][0]["signals"][1], [{
+            "_type": "iplotlib.interface.iplotSignalAdapter.IplotSignalAdapter",
+            "name": "Signal:A", "data_source": "codacuda", "pulse_nb": None}])
+
+        # Current workspaces are not migrated, the table keeps its digit keys
+        current = {"_metadata": {"schemaVersion": SCHEMA_VERSION},
+                   "signal_cfg": {"varname": "x", "2": "y"},
+                   "main_canvas": {"plots": [[{"signals": {"-1": []}}, None]]}}
+        workspace = load_workspace(json.dumps(current))
+        self.assertEqual(workspace["signal_cfg"], {"varname": "x", "2": "y"})
+        self.assertEqual(workspace["main_canvas"]["plots"][0][0]["signals"], {-1: []})
+
+        with self.assertRaises(ValueError):
+            load_workspace(json.dumps({"_metadata": {"schemaVersion": SCHEMA_VERSION + 1}}))
+
+    @benchmark
+    def test_benchmark(self) -> None:
+        repeat = 20
+        timings = dict()
+        for loader in (replace_and_hook, load_workspace):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for payload in self.payloads.values():
+                    loader(payload)
+            timings[loader] = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                loader(self.payloads["largeCanvas100.json"])
+            timings[loader, "large"] = (time.perf_counter() - start) / repeat
+
+        print(f"Loaded {len(self.payloads)} bundled workspaces in {timings[replace_and_hook] * 1000:.1f}ms with "
+              f"replacements, {timings[load_workspace] * 1000:.1f}ms versioned; largeCanvas100.json in "
+              f"{timings[replace_and_hook, 'large'] * 1000:.1f}ms, "
+              f"{timings[load_workspace, 'large'] * 1000:.1f}ms versioned")
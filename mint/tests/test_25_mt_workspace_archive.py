@@ -0,0 +1,76 @@
+# Description: Checks that a workspace archive restores the data of its signals without accessing the data sources.
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from iplotlib.core import SignalXY
+from iplotlib.interface.iplotSignalAdapter import Result
+from mint.tools.fetch_engine import FetchEngine
+from mint.tools.workspace_archive import is_archive, read_archive, write_archive
+from mint.tools.workspace_loader import SCHEMA_VERSION
+
+
+class CountingDataSource:
+
+    def __init__(self):
+        self.requests = 0
+
+    def request(self, **params) -> dict:
+        self.requests += 1
+        return dict(alias_map={'time': {'idx': 0, 'independent': True}, 'data': {'idx': 1}},
+                    d0=np.arange(100, 110), d1=np.linspace(0., 1., 10), d2=np.zeros(0), d3=np.zeros(0),
+                    isds=True, d1_unit='A')
+
+
+def make_signals(ts_end: int = 200):
+    return [SignalXY(uid=f"row{i}", name=f"Signal:{i}", data_source="ds", ts_start=100, ts_end=ts_end)
+            for i in range(3)]
+
+
+class TestWorkspaceArchive(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "workspace.mintz")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_snapshot(self) -> None:
+        source = CountingDataSource()
+        engine = FetchEngine(request=source.request)
+        signals = make_signals()
+        engine.fetch([signals[:2]])
+        workspace = {"_metadata": {"schemaVersion": SCHEMA_VERSION},
+                     "main_canvas": {"plots": [[{"signals": {1: []}}]]}}
+
+        # The signal without data is not in the snapshot
+        self.assertEqual(write_archive(self.file_path, workspace, signals), 2)
+        self.assertTrue(is_archive(self.file_path))
+
+        loaded, snapshot = read_archive(self.file_path)
+        self.assertEqual(loaded, workspace)
+        self.assertEqual(len(snapshot), 2)
+
+        # Same signals in a new session, the last one has another range
+        imported = make_signals()
+        imported[1].ts_end = 300
+        self.assertEqual(snapshot.restore(imported), [imported[0]])
+        self.assertEqual(imported[0].status_info.result, Result.SUCCESS)
+        self.assertTrue(imported[0].isDownsampled)
+        self.assertEqual(list(imported[0].y_data), list(np.linspace(0., 1., 10)))
+        self.assertEqual(imported[0].data_store[1].unit, 'A')
+
+        # Only the signals that were not restored access the data source
+        self.assertEqual(source.requests, 2)
+        self.assertEqual(engine.fetch([imported]), 2)
+        self.assertEqual(source.requests, 4)
+        engine.shutdown()
+
+    def test_without_snapshot(self) -> None:
+        write_archive(self.file_path, {"main_canvas": {"plots": [[{"signals": {"2": []}}]]}})
+        workspace, snapshot = read_archive(self.file_path)
+        self.assertIsNone(snapshot)
+        self.assertEqual(workspace["main_canvas"]["plots"][0][0]["signals"], {2: []})
@@ -0,0 +1,53 @@
+# Description: Range of the x data of a signal, recorded once when its data is retrieved so that planning the layout
+#              of the canvas does not go through the data arrays again.
+
+import typing
+import weakref
+
+import numpy as np
+
+from iplotlib.interface.iplotSignalAdapter import IplotSignalAdapter
+
+# Values above are nanosecond timestamps
+DATE_THRESHOLD = 1 << 53
+
+
+class AxisInfo(typing.NamedTuple):
+    begin: typing.Any = None
+    end: typing.Any = None
+    is_date: typing.Optional[bool] = False  # None when the data is not one-dimensional
+
+
+EMPTY_AXIS = AxisInfo()
+UNKNOWN_AXIS = AxisInfo(is_date=None)
+
+
+def axis_info(data) -> AxisInfo:
+    values = np.asarray(data)
+    if values.ndim != 1:
+        return UNKNOWN_AXIS
+    if not values.size:
+        return EMPTY_AXIS
+    try:
+        begin, end = np.nanmin(values), np.nanmax(values)
+    except (TypeError, ValueError):
+        return UNKNOWN_AXIS
+    return AxisInfo(begin.item(), end.item(), bool(begin > DATE_THRESHOLD))
+
+
+def record_x_axis(signal: IplotSignalAdapter) -> AxisInfo:
+    """Computes the range of the x data of the signal and keeps it on the signal until the data is replaced."""
+    info = axis_info(signal.x_data)
+    try:
+        signal._x_axis_info = (weakref.ref(signal.x_data), info)
+    except TypeError:
+        signal._x_axis_info = None
+    return info
+
+
+def x_axis_info(signal: IplotSignalAdapter) -> AxisInfo:
+    """The range of the x data of the signal, as recorded when the data was retrieved."""
+    recorded = getattr(signal, '_x_axis_info', None)
+    if recorded is not None and recorded[0]() is signal.x_data:
+        return recorded[1]
+    return record_x_axis(signal)
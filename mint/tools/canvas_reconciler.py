@@ -0,0 +1,86 @@
+# Description: Patches the plots of a canvas in place when it is built again.
+#              The plots are keyed by (column, row) and the signals by uid and name. A plot of the same type at the
+#              same place is kept with its preferences, a signal takes the preferences of the signal it replaces,
+#              wherever that one was drawn. This does what Canvas.merge does after a build, without serializing the
+#              previous canvas, its signals and their data.
+
+import typing
+import weakref
+
+from iplotlib.core.axis import LinearAxis
+from iplotlib.core.plot import Plot, PlotXY, PlotXYWithSlider
+from iplotlib.core.signal import Signal
+
+from iplotLogging import setupLogger
+
+logger = setupLogger.get_logger(__name__)
+
+
+def signal_key(signal: Signal) -> str:
+    """Same key as Canvas.merge: the uid of the row and the name of the signal."""
+    return f"{signal.uid};{signal.name}"
+
+
+class CanvasReconciler:
+    """
+    The plots and signals of a canvas before it is built again.
+    """
+
+    def __init__(self, plots: typing.List[typing.List[typing.Optional[Plot]]]):
+        self._plots = dict()  # type: typing.Dict[typing.Tuple[int, int], Plot]
+        self._signals = dict()  # type: typing.Dict[str, Signal]
+        for col, column in enumerate(plots or []):
+            for row, plot in enumerate(column):
+                if not plot:
+                    continue
+                self._plots[(col + 1, row + 1)] = plot
+                for signals in plot.signals.values():
+                    for signal in signals:
+                        self._signals[signal_key(signal)] = signal
+        self.kept = 0
+
+    def plot(self, plot_class: typing.Type[Plot], col: int, row: int, x_axis: LinearAxis,
+             y_axes: typing.List[LinearAxis], row_span: int, col_span: int,
+             stacks: typing.Dict[int, typing.List[Signal]]) -> Plot:
+        """
+        The plot at (col, row) with the given axes and signals. The previous plot is kept when it has the same type,
+        the new axes take the preferences of the previous ones.
+        """
+        previous = self._plots.get((col, row))
+        if type(previous) is not plot_class:
+            if previous is not None:
+                logger.warning("Merge with different type of plots")
+            plot = plot_class(axes=[x_axis, y_axes], row_span=row_span, col_span=col_span)
+            self._add_signals(plot, stacks)
+            return plot
+
+        plot = previous
+        self.kept += 1
+        for axis, old_axis in zip([x_axis] + y_axes, [plot.axes[0]] + list(plot.axes[1])):
+            if axis and old_axis:
+                axis.merge(vars(old_axis))
+        plot.axes = [x_axis, y_axes]
+        for axis in [x_axis] + y_axes:
+            axis.parent = weakref.ref(plot)
+        plot.row_span = row_span
+        plot.col_span = col_span
+        plot.signals = {}
+        if isinstance(plot, PlotXYWithSlider):
+            plot.slider_last_val = 0
+
+        # New signals are colored as in a new plot, the color cycle then goes on where it was
+        color_index = getattr(plot, '_color_index', None)
+        if isinstance(plot, PlotXY):
+            plot._color_index = PlotXY._color_index
+        self._add_signals(plot, stacks)
+        if color_index is not None:
+            plot._color_index = color_index
+        return plot
+
+    def _add_signals(self, plot: Plot, stacks: typing.Dict[int, typing.List[Signal]]):
+        for stack, signals in stacks.items():
+            for signal in signals:
+                plot.add_signal(signal, stack=stack)
+                previous = self._signals.get(signal_key(signal))
+                if previous is not None and previous is not signal and type(previous) is type(signal):
+                    signal.merge(vars(previous))
@@ -0,0 +1,128 @@
+# Description: Writes the per-draw dumps of the signals table from a background thread.
+#              Dumps with the same content as the previous one are skipped, old dumps are rotated out and
+#              a small index.json keeps track of them so that the latest dump is found without listing the directory.
+
+from datetime import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+import queue
+import threading
+import typing
+
+from mint.models.utils.mtColumnStore import MTTableSnapshot
+
+from iplotLogging import setupLogger
+
+logger = setupLogger.get_logger(__name__, level="INFO")
+
+INDEX_FILE_NAME = 'index.json'
+
+
+def default_dump_dir() -> str:
+    path = os.environ.get('IPLOT_DUMP_PATH') or f"{Path.home()}/.local/1Dtool"
+    return os.path.join(path, "dumps")
+
+
+def read_index(dump_dir: str) -> typing.List[dict]:
+    try:
+        with open(os.path.join(dump_dir, INDEX_FILE_NAME)) as f:
+            return json.load(f).get('dumps', [])
+    except (OSError, ValueError, AttributeError):
+        return []
+
+
+def latest_dump(dump_dir: str) -> typing.Optional[str]:
+    """Path of the most recent dump, or None."""
+    for entry in reversed(read_index(dump_dir)):
+        file_path = os.path.join(dump_dir, entry.get('file', ''))
+        if os.path.isfile(file_path):
+            return file_path
+
+    # Directories written before the index existed.
+    try:
+        files = [entry for entry in os.scandir(dump_dir) if entry.is_file() and entry.name.endswith('.scsv')]
+    except OSError:
+        return None
+    if not files:
+        return None
+    return max(files, key=lambda entry: entry.stat().st_mtime).path
+
+
+class DumpWriter:
+    """
+    Serializes table snapshots to SCSV files in a background thread.
+    """
+
+    def __init__(self, dump_dir: str = None, max_dumps: int = 50,
+                 drop_columns: typing.Sequence[str] = ('Status', 'uid')):
+        self.dump_dir = dump_dir or default_dump_dir()
+        self.max_dumps = max_dumps
+        self.drop_columns = list(drop_columns)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, snapshot: MTTableSnapshot, file_name: str = None):
+        """Queue a snapshot for writing. Returns immediately."""
+        if file_name is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            file_name = f"signals_table_{os.getpid()}_{timestamp}.scsv"
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='DumpWriter', daemon=True)
+                self._thread.start()
+        self._queue.put((snapshot, file_name))
+
+    def flush(self):
+        """Block until the queued snapshots are written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            snapshot, file_name = self._queue.get()
+            try:
+                self.write(snapshot, file_name)
+            except Exception as e:
+                logger.exception(e)
+            finally:
+                self._queue.task_done()
+
+    def write(self, snapshot: MTTableSnapshot, file_name: str) -> typing.Optional[str]:
+        """Write a snapshot unless the latest dump has the same content. Returns the path of the written file."""
+        df = snapshot.to_dataframe()
+        df = df.drop(labels=[c for c in self.drop_columns if c in df.columns], axis=1)
+        content = df.to_csv(index=False, sep=";")
+        digest = hashlib.sha1(content.encode()).hexdigest()
+
+        Path(self.dump_dir).mkdir(parents=True, exist_ok=True)
+        index = read_index(self.dump_dir)
+        if index and index[-1].get('sha1') == digest and \
+                os.path.isfile(os.path.join(self.dump_dir, index[-1].get('file', ''))):
+            logger.debug(f"Skipped dump, the table did not change since {index[-1]['file']}")
+            return None
+
+        file_path = os.path.join(self.dump_dir, file_name)
+        self._write_atomic(file_path, content)
+        index = [entry for entry in index if entry.get('file') != file_name]
+        index.append({'file': file_name, 'sha1': digest, 'time': datetime.now().isoformat()})
+
+        # Rotate
+        for entry in index[:-self.max_dumps]:
+            try:
+                os.remove(os.path.join(self.dump_dir, entry['file']))
+            except OSError:
+                pass
+        index = index[-self.max_dumps:]
+
+        self._write_atomic(os.path.join(self.dump_dir, INDEX_FILE_NAME), json.dumps({'dumps': index}, indent=1))
+        logger.info(f"Saved signal set: {file_path}")
+        return file_path
+
+    @staticmethod
+    def _write_atomic(file_path: str, content: str):
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
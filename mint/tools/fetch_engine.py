@@ -0,0 +1,280 @@
+# Description: Fetches the data of the signals of a build from a pool of threads.
+#              Only the requests to the data sources run in the pool, at most `max_per_source` at a time for each
+#              data source. The results are applied to the signals, and processed, on the calling thread, one level of
+#              the dependency graph after the other, so that a row finds the data of the aliases it uses.
+#              A fetch is either waited for, or submitted as a job that is applied as its requests complete and that
+#              can be cancelled.
+#              A signal that follows a previous signal of the same data, over a range that slid forward (relative time
+#              refresh), starts from the samples of the previous signal within its range and only fetches the tail.
+
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import threading
+import typing
+
+import numpy as np
+
+from iplotlib.interface.iplotSignalAdapter import AccessHelper, IplotSignalAdapter, Result
+from mint.tools.axis_info import record_x_axis
+from mint.tools.table_parser import is_non_empty_string
+
+from iplotLogging import setupLogger
+
+logger = setupLogger.get_logger(__name__)
+
+
+def leaf_signals(signal: IplotSignalAdapter) -> typing.List[IplotSignalAdapter]:
+    """Signals that access a data source on behalf of `signal`: itself, or the children of an expression."""
+    leaves = []
+    pending = [signal]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if current.children:
+            pending.extend(reversed(current.children))
+        elif is_non_empty_string(current.name):
+            leaves.append(current)
+    return leaves
+
+
+def data_key(signal: IplotSignalAdapter) -> tuple:
+    """Signals with the same key access the same data, possibly over different ranges."""
+    return signal.uid, signal.name, signal.data_source, signal.pulse_nb, signal.calibrated, signal.envelope
+
+
+def holds_range(signal: IplotSignalAdapter) -> bool:
+    return signal._access_md5sum is not None and signal._access_md5sum == signal.calculate_data_hash() and \
+        signal.status_info.result not in (Result.FAIL, Result.INVALID)
+
+
+def seed_signal(signal: IplotSignalAdapter, previous: typing.Optional[IplotSignalAdapter]):
+    """
+    Gives `signal` the samples of `previous` that are within its range, when the range of `signal` starts within the
+    range of `previous` and ends after it. Returns the time of the last sample of `previous`, from where the data is
+    missing, or None when `signal` needs all its data. Not the end of the range of `previous`: samples may reach the
+    archive after they were requested. Downsampled data is not reused, the samples of the window change with its
+    range.
+    """
+    if previous is None or previous is signal or previous.children or previous.isDownsampled or \
+            not holds_range(previous):
+        return None
+    if signal.envelope or signal.pulse_nb is not None or signal.ts_relative:
+        return None
+    ranges = (previous.ts_start, signal.ts_start, previous.ts_end, signal.ts_end)
+    if not all(isinstance(value, (int, np.integer)) for value in ranges) or sorted(ranges) != list(ranges):
+        return None
+    time = previous.data_store[0]
+    if not len(time) or any(np.ndim(buffer) != 1 for buffer in previous.data_store) or time[-1] < signal.ts_start:
+        return None
+
+    # Trim the head of the window
+    first = int(np.searchsorted(time, signal.ts_start, side='left'))
+    signal.alias_map.clear()
+    signal.alias_map.update(previous.alias_map)
+    signal.data_store[:] = [buffer[first:] if len(buffer) == len(time) else buffer for buffer in previous.data_store]
+    return int(time[-1])
+
+
+def tail(signal: IplotSignalAdapter, result: dict) -> dict:
+    """The samples of the result after the last sample of the signal, the bounds of the ranges are inclusive."""
+    if not len(signal.data_store[0]):
+        return result
+    time = np.asarray(result['d0'])
+    first = int(np.searchsorted(time, signal.data_store[0][-1], side='right'))
+    if not first:
+        return result
+    result = dict(result)
+    for key in ('d0', 'd1', 'd2', 'd3'):
+        if len(result[key]) == len(time):
+            result[key] = result[key][first:]
+    return result
+
+
+class FetchEngine:
+    """
+    Thread pool for the data access requests of a build, with a concurrency limit per data source.
+    """
+
+    def __init__(self, max_workers: int = 8, max_per_source: int = 4,
+                 request: typing.Callable[..., dict] = None):
+        self.max_workers = max_workers
+        self.max_per_source = max_per_source
+        self._request = request or AccessHelper._request_data
+        self._executor = None  # type: typing.Optional[ThreadPoolExecutor]
+        self._semaphores = defaultdict(lambda: threading.BoundedSemaphore(self.max_per_source))
+        self._lock = threading.Lock()
+
+    def _semaphore(self, data_source: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            return self._semaphores[data_source]
+
+    def _run(self, data_source: str, params: dict) -> dict:
+        with self._semaphore(data_source):
+            return self._request(**params)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @staticmethod
+    def _apply(signal: IplotSignalAdapter, future: Future, append: bool = False):
+        """
+        Same as the end of AccessHelper._submit_fetch, followed by the processing of the signal and its x range.
+        With `append`, the result is the tail of the data the signal was seeded with.
+        """
+        try:
+            result = future.result()
+        except Exception as e:
+            if signal.pulse_nb:
+                message = f"{e} for the signal: {signal.name} within the pulse: {signal.pulse_nb}"
+            else:
+                message = f"{e} for the signal: {signal.name}"
+            signal.set_da_fail(msg=message)
+            return
+
+        signal.isDownsampled = result['isds'] or (append and signal.isDownsampled)
+        # Update pulse_nb and legend label with the resolved value (for 0/-1 special pulses)
+        if result.get('resolved_pulse') and str(signal.pulse_nb) != result['resolved_pulse']:
+            old_pulse = str(signal.pulse_nb)
+            signal.pulse_nb = result['resolved_pulse']
+            if old_pulse and signal.label and old_pulse in signal.label:
+                signal.label = signal.label.replace(old_pulse, signal.pulse_nb)
+        if append:
+            units = [getattr(buffer, 'unit', None) for buffer in signal.data_store]
+            AccessHelper.on_fetch_done(signal, tail(signal, result), append=True)
+            for buffer, unit in zip(signal.data_store, units):
+                if unit and not getattr(buffer, 'unit', None):
+                    buffer.unit = unit
+        else:
+            AccessHelper.on_fetch_done(signal, result)
+        signal._do_data_processing()
+        record_x_axis(signal)
+
+    def submit(self, levels: typing.Sequence[typing.Sequence[IplotSignalAdapter]],
+               notify: typing.Callable[[], None] = None,
+               previous: typing.Dict[tuple, IplotSignalAdapter] = None) -> 'FetchJob':
+        """
+        Submit the requests of the given signals, grouped by dependency level, and return right away. The requests of
+        every level are submitted in level order. `notify` is called from the pool each time a request completes,
+        the results are applied later by `FetchJob.apply` on the thread that owns the signals.
+        `previous` maps the data keys to the signals of the previous build, a signal whose range slid forward from
+        the range of its previous signal only fetches the missing tail.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='FetchEngine')
+
+        submitted = set()
+        appended = set()
+        queued = []
+        for level in levels:
+            futures = dict()
+            for signal in level:
+                for leaf in leaf_signals(signal):
+                    if id(leaf) in submitted or not leaf.data_access_enabled or \
+                            leaf.status_info.result == Result.INVALID or not leaf._needs_refresh():
+                        continue
+                    submitted.add(id(leaf))
+                    params = AccessHelper.construct_da_params(leaf)
+                    since = seed_signal(leaf, previous.get(data_key(leaf))) if previous else None
+                    if since is not None:
+                        params['tsS'] = AccessHelper.uda_ts(leaf, since)
+                    AccessHelper.query_no += 1
+                    future = self._executor.submit(self._run, leaf.data_source, params)
+                    futures[future] = leaf
+                    if since is not None:
+                        appended.add(future)
+            queued.append(futures)
+        logger.debug(f"Submitted {len(submitted)} data access requests in {len(levels)} level(s), "
+                     f"{len(appended)} of them for the tail of the previous data")
+
+        job = FetchJob(queued, appended)
+        if notify is not None:
+            for futures in queued:
+                for future in futures:
+                    future.add_done_callback(lambda _: notify())
+        return job
+
+    def fetch(self, levels: typing.Sequence[typing.Sequence[IplotSignalAdapter]],
+              on_done: typing.Callable[[IplotSignalAdapter], None] = None,
+              idle: typing.Callable[[], None] = None,
+              previous: typing.Dict[tuple, IplotSignalAdapter] = None) -> int:
+        """
+        Fetch the data of the given signals, grouped by dependency level, and wait for it. The results are applied on
+        the calling thread level by level. `on_done` is called after each result is applied, `idle` regularly while
+        waiting. Returns the number of requests.
+        """
+        job = self.submit(levels, previous=previous)
+        while not job.apply(on_done):
+            job.wait(0.05)
+            if idle is not None:
+                idle()
+        return job.total
+
+
+class FetchJob:
+    """
+    The requests of one fetch, level by level. A level is applied once all its requests completed, a cancelled job
+    does not apply anything anymore.
+    """
+
+    def __init__(self, levels: typing.List[typing.Dict[Future, IplotSignalAdapter]],
+                 appended: typing.Set[Future] = frozenset()):
+        self._levels = levels
+        self._appended = appended
+        self._level = 0
+        self._applied = set()
+        self.total = sum(len(futures) for futures in levels)
+        self.cancelled = False
+
+    @property
+    def applied(self) -> int:
+        return len(self._applied)
+
+    @property
+    def finished(self) -> bool:
+        return self.cancelled or self._level >= len(self._levels)
+
+    def wait(self, timeout: float = None):
+        """Wait until a request of the current level completes."""
+        if not self.finished:
+            pending = [future for future in self._levels[self._level] if future not in self._applied]
+            wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+    def apply(self, on_done: typing.Callable[[IplotSignalAdapter], None] = None) -> bool:
+        """
+        Apply the completed requests of the current level, and move on to the next levels while they are complete.
+        Returns True when the job is finished.
+        """
+        while not self.finished:
+            futures = self._levels[self._level]
+            for future, signal in futures.items():
+                if future in self._applied or not future.done():
+                    continue
+                self._applied.add(future)
+                FetchEngine._apply(signal, future, append=future in self._appended)
+                if on_done is not None:
+                    on_done(signal)
+            if not all(future in self._applied for future in futures):
+                break
+            self._level += 1
+        return self.finished
+
+    def cancel(self):
+        """
+        Cancel the pending requests. Requests already running in the pool can not be interrupted, their results are
+        dropped. The signals that did not receive their data are accessed again by the next fetch.
+        """
+        if self.cancelled:
+            return
+        self.cancelled = True
+        for futures in self._levels:
+            for future, signal in futures.items():
+                if future in self._applied:
+                    continue
+                future.cancel()
+                signal._access_md5sum = None
+        logger.info(f"Cancelled the fetch after {self.applied} of {self.total} request(s)")
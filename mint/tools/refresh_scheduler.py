@@ -0,0 +1,98 @@
+# Description: Schedules the ticks of the canvas auto refresh.
+#              A tick is only scheduled once the previous refresh is over, so refreshes never overlap. The latency of
+#              the refreshes is measured, and the interval backs off when the data sources are slow, so that the
+#              application spends at most 1 / backoff of its time refreshing. The ticks that could not be honoured at
+#              the configured interval are counted as late, and the intervals that passed without a refresh as missed.
+
+import time
+import typing
+
+
+class RefreshScheduler:
+    """
+    Interval, latency and tick counters of the auto refresh, in seconds.
+    """
+
+    def __init__(self, backoff: float = 2., max_factor: float = 8., smoothing: float = 0.5,
+                 clock: typing.Callable[[], float] = time.monotonic):
+        self.backoff = backoff
+        self.max_factor = max_factor
+        self.smoothing = smoothing
+        self._clock = clock
+        self.interval = 0.
+        self.active = False
+        self.in_flight = False
+        self.latency = None  # type: typing.Optional[float]
+        self.refreshes = 0
+        self.missed = 0
+        self.late = 0
+        self._due = 0.
+        self._next = 0.
+        self._started = 0.
+
+    @property
+    def effective_interval(self) -> float:
+        """The configured interval, or longer while the refreshes are slow."""
+        if self.latency is None:
+            return self.interval
+        return min(max(self.interval, self.backoff * self.latency), self.max_factor * self.interval)
+
+    def start(self, interval: float):
+        now = self._clock()
+        self.interval = float(interval)
+        self.active = self.interval > 0
+        self.in_flight = False
+        self.latency = None
+        self.refreshes = self.missed = self.late = 0
+        self._due = self._next = now + self.interval
+
+    def stop(self):
+        self.active = False
+        self.in_flight = False
+
+    def delay(self) -> float:
+        """Seconds until the next tick."""
+        return max(0., self._next - self._clock())
+
+    def begin(self) -> bool:
+        """
+        A tick fired. Returns False when no refresh should start, because the auto refresh is off or a refresh is
+        still in flight.
+        """
+        if not self.active or self.in_flight:
+            return False
+        now = self._clock()
+        lateness = now - self._due
+        if lateness > 0.1 * self.interval:
+            self.late += 1
+            self.missed += int(lateness // self.interval)
+        self.in_flight = True
+        self._started = now
+        return True
+
+    def postpone(self):
+        """The tick could not be honoured now, try again after one interval."""
+        self._next = self._clock() + self.interval
+
+    def end(self, completed: bool = True):
+        """The refresh that began is over. A refresh that did not complete does not count in the latency."""
+        if not self.active or not self.in_flight:
+            return
+        now = self._clock()
+        self.in_flight = False
+        if completed:
+            latency = now - self._started
+            self.latency = latency if self.latency is None else \
+                self.smoothing * latency + (1. - self.smoothing) * self.latency
+            self.refreshes += 1
+        self._due = self._started + self.interval
+        self._next = max(now, self._started + self.effective_interval)
+
+    def report(self) -> str:
+        """Short status of the refresh, empty while it keeps up with the configured interval."""
+        if not self.active or (not self.missed and not self.late and self.effective_interval <= self.interval):
+            return ''
+        message = f"Refresh every {self.effective_interval:.0f}s (set to {self.interval:.0f}s)"
+        if self.latency is not None:
+            message += f", takes {self.latency:.1f}s"
+        return message + f", {self.missed} missed and {self.late} late tick(s)"
@@ -0,0 +1,122 @@
+# Description: Workspace archive, a zip with the workspace and, optionally, a snapshot of the data of its signals.
+#              The workspace is stored as JSON in workspace.json. The snapshot holds the result of the data access of
+#              each signal that accessed a data source, its arrays in .npy files and their description in
+#              snapshot.json. A signal of the imported workspace takes the data of the snapshot entry with the same
+#              data key and range, as if it had been fetched, so the canvas is drawn without accessing the data sources.
+
+import io
+import json
+import typing
+import zipfile
+
+import numpy as np
+
+from iplotlib.interface.iplotSignalAdapter import AccessHelper, IplotSignalAdapter
+from mint.tools.axis_info import record_x_axis
+from mint.tools.fetch_engine import data_key, holds_range
+from mint.tools.workspace_loader import load_workspace
+
+from iplotLogging import setupLogger
+
+logger = setupLogger.get_logger(__name__)
+
+ARCHIVE_SUFFIX = '.mintz'
+WORKSPACE_ENTRY = 'workspace.json'
+SNAPSHOT_ENTRY = 'snapshot.json'
+BUFFER_KEYS = ('d0', 'd1', 'd2', 'd3')
+
+
+def is_archive(file_path: str) -> bool:
+    return zipfile.is_zipfile(file_path)
+
+
+def snapshot_key(signal: IplotSignalAdapter) -> str:
+    return json.dumps(data_key(signal), default=str)
+
+
+def _save_array(archive: zipfile.ZipFile, name: str, buffer) -> str:
+    stream = io.BytesIO()
+    np.save(stream, np.asarray(buffer), allow_pickle=False)
+    archive.writestr(name, stream.getvalue())
+    return name
+
+
+def _load_array(archive: zipfile.ZipFile, name: str) -> np.ndarray:
+    with archive.open(name) as f:
+        return np.load(io.BytesIO(f.read()), allow_pickle=False)
+
+
+def write_archive(file_path: str, workspace: dict, signals: typing.Iterable[IplotSignalAdapter] = ()) -> int:
+    """
+    Writes the workspace and the data of the given signals, those that hold the data of their range.
+    Returns the number of signals in the snapshot.
+    """
+    entries = dict()
+    with zipfile.ZipFile(file_path, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(WORKSPACE_ENTRY, json.dumps(workspace))
+        for signal in signals:
+            key = snapshot_key(signal)
+            if key in entries or not holds_range(signal):
+                continue
+            prefix = f"data/{len(entries)}_"
+            try:
+                arrays = [_save_array(archive, prefix + name + '.npy', buffer)
+                          for name, buffer in zip(BUFFER_KEYS, signal.data_store)]
+            except ValueError as e:
+                logger.warning(f"Data of the signal {signal.name} is not kept in the snapshot: {e}")
+                continue
+            entries[key] = dict(hash=signal.calculate_data_hash(),
+                                alias_map=signal.alias_map,
+                                isds=bool(signal.isDownsampled),
+                                units=[getattr(buffer, 'unit', None) for buffer in signal.data_store],
+                                arrays=arrays)
+        archive.writestr(SNAPSHOT_ENTRY, json.dumps(entries, default=str))
+    return len(entries)
+
+
+class Snapshot:
+    """
+    The data of the signals of a workspace archive, read from the archive when a signal takes it.
+    """
+
+    def __init__(self, file_path: str, entries: typing.Dict[str, dict]):
+        self.file_path = file_path
+        self._entries = entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def restore(self, signals: typing.Iterable[IplotSignalAdapter]) -> typing.List[IplotSignalAdapter]:
+        """
+        Gives each signal the data of its snapshot entry, when the entry has the same range. Returns the signals
+        that took their data from the snapshot, the others are fetched as usual.
+        """
+        restored = []
+        with zipfile.ZipFile(self.file_path) as archive:
+            for signal in signals:
+                entry = self._entries.get(snapshot_key(signal))
+                if entry is None or entry['hash'] != signal.calculate_data_hash():
+                    continue
+                result = dict(alias_map=entry['alias_map'], isds=entry['isds'])
+                for name, array, unit in zip(BUFFER_KEYS, entry['arrays'], entry['units']):
+                    result[name] = _load_array(archive, array)
+                    if unit:
+                        result[name + '_unit'] = unit
+                signal.isDownsampled = result['isds']
+                AccessHelper.on_fetch_done(signal, result)
+                signal._access_md5sum = entry['hash']
+                signal._do_data_processing()
+                record_x_axis(signal)
+                restored.append(signal)
+        logger.info(f"Restored the data of {len(restored)} signal(s) from {self.file_path}")
+        return restored
+
+
+def read_archive(file_path: str) -> typing.Tuple[dict, typing.Optional[Snapshot]]:
+    """The workspace of the archive, migrated to the current schema, and its snapshot if it has one."""
+    with zipfile.ZipFile(file_path) as archive:
+        workspace = load_workspace(archive.read(WORKSPACE_ENTRY).decode())
+        if SNAPSHOT_ENTRY not in archive.namelist():
+            return workspace, None
+        entries = json.loads(archive.read(SNAPSHOT_ENTRY).decode())
+    return workspace, Snapshot(file_path, entries) if entries else None
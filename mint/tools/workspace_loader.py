@@ -0,0 +1,75 @@
+# Description: Loads a workspace from its JSON text.
+#              The schema version is read from the metadata of the workspace. Workspaces written before it was
+#              recorded are version 1 and may hold the names of the legacy data access layer. Those are renamed on the
+#              parsed tree, only when the text mentions one of them. The keys of the signal stacks of the plots are the
+#              only integer keys of the schema, they are converted where they are and nowhere else.
+
+import json
+import typing
+
+SCHEMA_VERSION = 2
+
+LEGACY_SIGNAL_CLASS = ("data_access.dataAccessSignal.DataAccessSignal",
+                       "interface.iplotSignalAdapter.IplotSignalAdapter")
+LEGACY_NAMES = {'varname': 'name',
+                'datasource': 'data_source',
+                'pulsenb': 'pulse_nb',
+                'time_model': 'data_range'
+                }
+
+
+def schema_version(workspace: dict) -> int:
+    metadata = workspace.get('_metadata')
+    if isinstance(metadata, dict):
+        return int(metadata.get('schemaVersion', 1))
+    return 1
+
+
+def needs_legacy_names(payload: str) -> bool:
+    return LEGACY_SIGNAL_CLASS[0] in payload or any(old in payload for old in LEGACY_NAMES)
+
+
+def rename_legacy(node):
+    """Renames the keys and the values of the legacy data access layer, in place."""
+    if isinstance(node, dict):
+        for key in list(node):
+            value = rename_legacy(node[key])
+            if key in LEGACY_NAMES:
+                del node[key]
+                key = LEGACY_NAMES[key]
+            node[key] = value
+        return node
+    if isinstance(node, list):
+        for i, value in enumerate(node):
+            node[i] = rename_legacy(value)
+        return node
+    if isinstance(node, str):
+        return LEGACY_NAMES.get(node) or node.replace(*LEGACY_SIGNAL_CLASS)
+    return node
+
+
+def int_key(key: str) -> typing.Union[int, str]:
+    return int(key) if key.lstrip('-').isdigit() else key
+
+
+def convert_stack_keys(workspace: dict):
+    """The signals of a plot are keyed by their stack number, JSON has string keys only."""
+    canvas = workspace.get('main_canvas')
+    if not isinstance(canvas, dict):
+        return
+    for column in canvas.get('plots') or []:
+        for plot in column or []:
+            if isinstance(plot, dict) and isinstance(plot.get('signals'), dict):
+                plot['signals'] = {int_key(key): signals for key, signals in plot['signals'].items()}
+
+
+def load_workspace(payload: str) -> dict:
+    """Parses the workspace and migrates it to the current schema version."""
+    workspace = json.loads(payload)
+    version = schema_version(workspace)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Workspace schema version {version} is newer than the supported version {SCHEMA_VERSION}")
+    if version < 2 and needs_legacy_names(payload):
+        rename_legacy(workspace)
+    convert_stack_keys(workspace)
+    return workspace